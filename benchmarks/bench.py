@@ -0,0 +1,317 @@
+"""Benchmarks for the library's own hot paths.
+
+Measures the stats engine, the percentile helper, JSON export, the
+streaming result sink, GPU CSV loading and the tracker's per-chunk loop
+on synthetic data with fixed seeds, writes the timings as JSON and
+optionally compares them with a saved baseline.
+
+Usage::
+
+    python benchmarks/bench.py --output benchmarks/baseline.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+
+The second form exits with status 1 if any benchmark got slower than the
+baseline by more than ``--tolerance``, and skips the comparison if the
+baseline file does not exist yet.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from llm_perf_tools.inference import (
+    InferenceTracker,
+    compute_batch_metrics,
+    percentile,
+)
+from llm_perf_tools.sink import ResultSink
+from llm_perf_tools.store import MetricsStore
+from llm_perf_tools.utils import load_gpu_data, save_metrics_to_json
+
+SIZES = (1_000, 100_000, 10_000_000)
+SEED = 0
+RESULTS_VERSION = 1
+
+
+def _columns(count: int) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(SEED)
+    request_start = np.sort(rng.uniform(0, count / 100, count))
+    ttft = rng.lognormal(-2.5, 0.5, count)
+    output_tokens = rng.integers(1, 512, count)
+    decode = output_tokens * rng.lognormal(-4, 0.3, count)
+    failed = rng.random(count) < 0.01
+    request_end = request_start + ttft + decode
+    request_end[failed] = np.nan
+    return {
+        "request_start": request_start,
+        "first_token_time": request_start + ttft,
+        "request_end": request_end,
+        "input_tokens": rng.integers(16, 2048, count),
+        "output_tokens": output_tokens,
+        "queue_wait": rng.exponential(0.01, count),
+    }
+
+
+def _store(count: int) -> MetricsStore:
+    store = MetricsStore(capacity=count)
+    store.extend_columns(_columns(count))
+    return store
+
+
+def bench_compute_batch_metrics(count: int) -> Callable[[], object]:
+    store = _store(count)
+    return lambda: compute_batch_metrics(store, 60.0)
+
+
+def bench_percentile(count: int) -> Callable[[], object]:
+    values = np.random.default_rng(SEED).lognormal(-2, 1, count).tolist()
+    return lambda: [percentile(values, p) for p in (50, 95, 99)]
+
+
+def bench_save_metrics_to_json(count: int) -> Callable[[], object]:
+    tracker = InferenceTracker(MagicMock(), tokenizer=len)
+    tracker.metrics = _store(count)
+    tracker._start_time = time.perf_counter()
+    directory = tempfile.mkdtemp(prefix="llm-perf-bench-")
+    return lambda: save_metrics_to_json(tracker, "bench.json", directory)
+
+
+def bench_result_sink(count: int) -> Callable[[], object]:
+    store = _store(count)
+    rows = [dict(record) for record in store]
+    directory = Path(tempfile.mkdtemp(prefix="llm-perf-bench-"))
+
+    def run() -> None:
+        path = directory / "results.jsonl"
+        path.unlink(missing_ok=True)
+        with ResultSink(path, parquet=False) as sink:
+            for row in rows:
+                sink.write(row)
+
+    return run
+
+
+def bench_load_gpu_data(count: int) -> Callable[[], object]:
+    rng = np.random.default_rng(SEED)
+    path = Path(tempfile.mkdtemp(prefix="llm-perf-bench-")) / "gpu.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "timestamp",
+                "gpu_id",
+                "memory_used_mb",
+                "memory_total_mb",
+                "memory_utilization_percent",
+                "gpu_utilization_percent",
+                "temperature_celsius",
+                "power_draw_watts",
+            ]
+        )
+        for i in range(count):
+            writer.writerow(
+                [
+                    i * 0.1,
+                    i % 8,
+                    int(rng.integers(0, 80_000)),
+                    80_000,
+                    float(rng.uniform(0, 100)),
+                    int(rng.integers(0, 100)),
+                    int(rng.integers(30, 90)),
+                    float(rng.uniform(50, 700)),
+                ]
+            )
+    return lambda: load_gpu_data(path)
+
+
+def _stand_in_client(tokens: int) -> SimpleNamespace:
+    chunk = SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content="tok"))]
+    )
+
+    async def create(**kwargs):
+        async def stream():
+            for _ in range(tokens):
+                yield chunk
+
+        return stream()
+
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+
+def bench_tracker_chunk_loop(count: int) -> Callable[[], object]:
+    """Tracker time for one request streaming ``count`` tokens.
+
+    The stand-in stream does no work of its own, so this is the tracker's
+    per-chunk cost. Only the request is timed, not starting and closing
+    the event loop.
+    """
+    client = _stand_in_client(count)
+    tracker = InferenceTracker(client, tokenizer=len)
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def tracked() -> float:
+        started = time.perf_counter()
+        await tracker.create_chat_completion(messages=messages, model="bench")
+        elapsed = time.perf_counter() - started
+        tracker.reset()
+        return elapsed
+
+    return lambda: asyncio.run(tracked())
+
+
+# name -> (setup, largest size run without --all-sizes)
+BENCHMARKS: dict[str, tuple[Callable[[int], Callable[[], object]], int]] = {
+    "compute_batch_metrics": (bench_compute_batch_metrics, 10_000_000),
+    "percentile": (bench_percentile, 10_000_000),
+    "save_metrics_to_json": (bench_save_metrics_to_json, 100_000),
+    "result_sink": (bench_result_sink, 100_000),
+    "load_gpu_data": (bench_load_gpu_data, 100_000),
+    "tracker_chunk_loop": (bench_tracker_chunk_loop, 1_000_000),
+}
+
+
+def measure(fn: Callable[[], object], repeat: int, min_time: float = 0.2) -> float:
+    """Best of at least ``repeat`` runs, in seconds.
+
+    Fast benchmarks are repeated until ``min_time`` seconds have been spent,
+    so sub-millisecond timings are not dominated by noise. A benchmark may
+    return its own timing as a float, e.g. to leave out setup it cannot
+    avoid; otherwise the wall time of the call is used.
+    """
+    best = float("inf")
+    runs = 0
+    spent = 0.0
+    while runs < repeat or (spent < min_time and runs < 1000):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        spent += elapsed
+        runs += 1
+        best = min(best, result if isinstance(result, float) else elapsed)
+    return best
+
+
+def run(
+    names: list[str], sizes: tuple[int, ...], repeat: int, all_sizes: bool
+) -> dict[str, dict[str, float]]:
+    results = {}
+    for name in names:
+        setup, max_size = BENCHMARKS[name]
+        for size in sizes:
+            if size > max_size and not all_sizes:
+                continue
+            seconds = measure(setup(size), repeat)
+            key = f"{name}[{size}]"
+            results[key] = {
+                "size": size,
+                "seconds": seconds,
+                "ns_per_item": seconds / size * 1e9,
+            }
+            print(f"{key:<36} {seconds:10.4f}s {seconds / size * 1e9:10.1f} ns/item")
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Describe every benchmark slower than its baseline beyond tolerance.
+
+    Raises:
+        ValueError: If a baseline time is not positive, which no ratio can
+            be taken against
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if reference["seconds"] <= 0:
+            raise ValueError(
+                f"Baseline time for {key} is {reference['seconds']}s; "
+                "re-run make bench-baseline"
+            )
+        ratio = result["seconds"] / reference["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{key}: {result['seconds']:.4f}s vs {reference['seconds']:.4f}s "
+                f"({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "names", nargs="*", help=f"Benchmarks to run: {', '.join(BENCHMARKS)}"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=SIZES, help="Request counts"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark")
+    parser.add_argument(
+        "--all-sizes",
+        action="store_true",
+        help="Also run sizes above a benchmark's default cap",
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare against saved results")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown over the baseline (default 0.25 = 25%%)",
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run(
+        args.names or list(BENCHMARKS), tuple(args.sizes), args.repeat, args.all_sizes
+    )
+    if args.output:
+        data = {
+            "version": RESULTS_VERSION,
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "processor": platform.processor(),
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(data, indent=2))
+
+    if args.baseline and not Path(args.baseline).exists():
+        # Baselines are machine specific and not committed; a fresh checkout
+        # has none until `make bench-baseline` is run.
+        print(f"No baseline at {args.baseline}, skipping comparison")
+    elif args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,10 @@
 import asyncio
 
-from openai import AsyncOpenAI
-
-from llm_perf_tools import InferenceTracker, save_metrics_to_json
+from llm_perf_tools import InferenceTracker, create_client, save_metrics_to_json
 
 
 async def main():
-    client = AsyncOpenAI(base_url="http://localhost:11434/v1", api_key="ollama")
+    client = create_client(base_url="http://localhost:11434/v1", api_key="ollama")
     tracker = InferenceTracker(client)
 
     num_requests = 5
@@ -24,23 +22,17 @@ async def main():
     )
     print("=" * 80)
 
-    semaphore = asyncio.Semaphore(concurrency)
-
-    async def bounded_request(request_id: int) -> str:
-        async with semaphore:
-            print(f"Request {request_id}: ", end="", flush=True)
-            response = await tracker.create_chat_completion(
-                model="gpt-oss:20b", messages=messages
-            )
-            print(response)
-            return response
+    def print_response(request_id: int, response: str | BaseException) -> None:
+        print(f"Request {request_id}: {response}")
 
-    tasks = [bounded_request(i) for i in range(num_requests)]
-    _ = await asyncio.gather(*tasks)
+    metrics = await tracker.run_batch(
+        (messages for _ in range(num_requests)),
+        model="gpt-oss:20b",
+        concurrency=concurrency,
+        on_response=print_response,
+    )
 
     print("=" * 80)
-
-    metrics = tracker.compute_metrics()
     print(metrics)
 
     saved_file = save_metrics_to_json(tracker, "ollama_batch_example_complete.json")
@@ -1,12 +1,11 @@
 import asyncio
-from openai import AsyncOpenAI
 from rich.console import Console
-from llm_perf_tools import InferenceTracker, save_metrics_to_json
+from llm_perf_tools import InferenceTracker, create_client, save_metrics_to_json
 
 
 async def main():
     console = Console()
-    client = AsyncOpenAI(base_url="http://localhost:30000/v1", api_key="None")
+    client = create_client(base_url="http://localhost:30000/v1", api_key="None")
     tracker = InferenceTracker(client)
 
     requests = [
@@ -17,14 +16,10 @@ async def main():
 
     console.print(f"[yellow]Sending {len(requests)} requests...[/yellow]")
 
-    tasks = [
-        tracker.create_chat_completion(messages=msg, model="llama") for msg in requests
-    ]
-    _ = await asyncio.gather(*tasks)
+    metrics = await tracker.run_batch(requests, model="llama", concurrency=3)
 
     console.print("[bold green]Responses received[/bold green]")
 
-    metrics = tracker.compute_metrics()
     console.print("\n[bold blue]Metrics:[/bold blue]")
     console.print(metrics)
 
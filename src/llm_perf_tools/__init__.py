@@ -1,4 +1,15 @@
-from .types import RequestMetrics, InferenceStats, BatchInferenceStats, GPUMetrics
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .types import (
+    RequestMetrics,
+    InferenceStats,
+    BatchInferenceStats,
+    GPUMetrics,
+    HostMetrics,
+    SweepPoint,
+    SweepResult,
+)
 from .inference import (
     InferenceTracker,
     time_to_first_token,
@@ -9,21 +20,63 @@ from .inference import (
     compute_stats,
     percentile,
     compute_batch_metrics,
+    chunk_itl_stats,
 )
+from .client import create_client
+from .arrivals import poisson_arrivals, constant_arrivals, trace_arrivals
+from .probe import LoopLagProbe
+from .sketch import QuantileSketch, SketchBatchStats
+from .stats import batch_stats_from_columns
+from .store import MetricsStore
+from .window import RollingWindow
+from .dataset import load_requests
+from .energy import cumulative_energy, energy_stats, request_energy
+from .mock_server import LatencyProfile, MockServer, serve_in_subprocess
+from .monitor import DeviceProvider, monitor_devices
+from .multiproc import run_multiprocess
+from .providers import HostProvider, SimulatedGPUProvider
+from .samples import SampleBuffer, load_samples, read_samples
+from .sink import ResultSink, load_results
+from .shards import load_shard, merge_shard_columns, merge_shards, save_shard
+from .sweep import find_knee, sweep_concurrency, sweep_rate
 from .utils import save_metrics_to_json, load_inference_data, load_gpu_data
-from .visualization import (
-    plot_inference_metrics,
-    plot_gpu_metrics,
-    plot_eval_result,
-)
-from .gpu import monitor_gpu_usage
+
+if TYPE_CHECKING:
+    from .gpu import NvmlProvider, monitor_gpu_usage
+    from .visualization import (
+        plot_eval_result,
+        plot_gpu_metrics,
+        plot_inference_metrics,
+    )
+
+# Subsystems with heavy dependencies (matplotlib/seaborn, pynvml) are only
+# imported when one of their attributes is first accessed.
+_LAZY_ATTRS = {
+    "plot_inference_metrics": ".visualization",
+    "plot_gpu_metrics": ".visualization",
+    "plot_eval_result": ".visualization",
+    "monitor_gpu_usage": ".gpu",
+    "NvmlProvider": ".gpu",
+}
 
 __all__ = [
     "RequestMetrics",
     "InferenceStats",
     "BatchInferenceStats",
     "GPUMetrics",
+    "HostMetrics",
+    "SweepPoint",
+    "SweepResult",
     "InferenceTracker",
+    "create_client",
+    "MetricsStore",
+    "QuantileSketch",
+    "SketchBatchStats",
+    "RollingWindow",
+    "LoopLagProbe",
+    "poisson_arrivals",
+    "constant_arrivals",
+    "trace_arrivals",
     "time_to_first_token",
     "end_to_end_latency",
     "inter_token_latency",
@@ -32,13 +85,53 @@ __all__ = [
     "compute_stats",
     "percentile",
     "compute_batch_metrics",
+    "batch_stats_from_columns",
+    "chunk_itl_stats",
     "save_metrics_to_json",
+    "ResultSink",
+    "load_results",
     "load_inference_data",
     "load_gpu_data",
+    "load_requests",
+    "cumulative_energy",
+    "request_energy",
+    "energy_stats",
+    "run_multiprocess",
+    "SampleBuffer",
+    "read_samples",
+    "load_samples",
+    "DeviceProvider",
+    "monitor_devices",
+    "SimulatedGPUProvider",
+    "HostProvider",
+    "LatencyProfile",
+    "MockServer",
+    "serve_in_subprocess",
+    "save_shard",
+    "load_shard",
+    "merge_shards",
+    "merge_shard_columns",
+    "find_knee",
+    "sweep_concurrency",
+    "sweep_rate",
     "plot_inference_metrics",
     "plot_gpu_metrics",
     "plot_eval_result",
     "monitor_gpu_usage",
+    "NvmlProvider",
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
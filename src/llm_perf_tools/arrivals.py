@@ -0,0 +1,65 @@
+import itertools
+import random
+from collections.abc import Iterable, Iterator
+
+
+def poisson_arrivals(rate: float, seed: int | None = None) -> Iterator[float]:
+    """Yield send offsets in seconds for a Poisson process.
+
+    Inter-arrival gaps are exponentially distributed with mean ``1 / rate``,
+    which models independent users hitting a service.
+
+    Args:
+        rate: Average requests per second
+        seed: Optional seed for a reproducible schedule
+
+    Example:
+        >>> offsets = poisson_arrivals(rate=10.0, seed=0)
+        >>> first = [next(offsets) for _ in range(3)]
+        >>> first == sorted(first)
+        True
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    rng = random.Random(seed)
+    return itertools.accumulate(rng.expovariate(rate) for _ in itertools.count())
+
+
+def constant_arrivals(rate: float) -> Iterator[float]:
+    """Yield evenly spaced send offsets, one every ``1 / rate`` seconds.
+
+    Example:
+        >>> offsets = constant_arrivals(rate=4.0)
+        >>> [next(offsets) for _ in range(3)]
+        [0.0, 0.25, 0.5]
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    return (i / rate for i in itertools.count())
+
+
+def trace_arrivals(
+    timestamps: Iterable[float], speedup: float = 1.0
+) -> Iterator[float]:
+    """Replay recorded request timestamps as send offsets.
+
+    Offsets are relative to the first timestamp, so absolute epoch times
+    from production logs can be passed as-is.
+
+    Args:
+        timestamps: Recorded send times in seconds, in order
+        speedup: Divide gaps by this factor to replay faster
+
+    Example:
+        >>> list(trace_arrivals([100.0, 100.5, 102.0], speedup=2.0))
+        [0.0, 0.25, 1.0]
+    """
+    if speedup <= 0:
+        raise ValueError("speedup must be positive")
+    timestamps = iter(timestamps)
+    origin = next(timestamps, None)
+    if origin is None:
+        return iter(())
+    return itertools.chain(
+        [0.0], ((timestamp - origin) / speedup for timestamp in timestamps)
+    )
@@ -0,0 +1,109 @@
+import time
+from contextvars import ContextVar
+from typing import Any
+
+# Connection setup of the request running in the current task, as
+# ``[connect_seconds, phase_started_at]``. The tracker installs a fresh
+# ``[None, None]`` cell per request and clients built by create_client fill
+# it in; a connect time left at None means the client is not instrumented.
+connect_time_var: ContextVar[list[float | None] | None] = ContextVar(
+    "llm_perf_tools_connect_time", default=None
+)
+
+_PHASES = ("connect_tcp", "start_tls")
+
+
+async def _trace(event: str, info: dict[str, Any]) -> None:
+    cell = connect_time_var.get()
+    if cell is None:
+        return
+    _, _, rest = event.partition(".")
+    phase, _, stage = rest.rpartition(".")
+    if phase not in _PHASES:
+        return
+    # The phase start is kept in the second slot of the cell.
+    now = time.perf_counter()
+    if stage == "started":
+        cell[1] = now
+    elif stage in ("complete", "failed") and cell[1] is not None:
+        cell[0] = (cell[0] or 0.0) + now - cell[1]
+        cell[1] = None
+
+
+async def _attach_trace(request: Any) -> None:
+    cell = connect_time_var.get()
+    if cell is not None and cell[0] is None:
+        cell[0] = 0.0
+    request.extensions["trace"] = _trace
+
+
+def create_client(
+    base_url: str | None = None,
+    api_key: str | None = None,
+    max_connections: int = 1024,
+    max_keepalive_connections: int | None = None,
+    keepalive_expiry: float = 60.0,
+    http2: bool = False,
+    timeout: float = 600.0,
+    **kwargs,
+):
+    """Build an ``AsyncOpenAI`` client tuned for load generation.
+
+    The default client caps its connection pool well below the
+    concurrency of a large benchmark, so requests silently queue inside
+    the client. This helper sizes the pool explicitly, keeps idle
+    connections alive between requests and can negotiate HTTP/2 (requires
+    the ``h2`` package).
+
+    Requests made through the returned client report the time spent
+    opening connections, i.e. the TCP connect plus TLS handshake, to
+    :class:`~llm_perf_tools.InferenceTracker` as ``connect_time``. That
+    time is subtracted from ``prefill_time``, so cold handshakes at high
+    fan-out do not inflate prefill measurements. Requests on a reused
+    connection report a ``connect_time`` of 0.
+
+    Args:
+        base_url: API base URL, defaults to ``OPENAI_BASE_URL``
+        api_key: API key, defaults to ``OPENAI_API_KEY``
+        max_connections: Maximum number of open connections
+        max_keepalive_connections: Idle connections kept open, defaults
+            to ``max_connections``
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Use HTTP/2 where the server supports it
+        timeout: Request timeout in seconds
+        **kwargs: Further ``AsyncOpenAI`` arguments, e.g. ``max_retries``
+
+    Returns:
+        AsyncOpenAI client
+
+    Example:
+        >>> client = create_client("http://localhost:8000/v1", api_key="none")
+        >>> str(client.base_url)
+        'http://localhost:8000/v1/'
+    """
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError as e:
+            raise ImportError("HTTP/2 support requires the 'h2' package") from e
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=(
+                max_connections
+                if max_keepalive_connections is None
+                else max_keepalive_connections
+            ),
+            keepalive_expiry=keepalive_expiry,
+        ),
+        http2=http2,
+        timeout=timeout,
+        event_hooks={"request": [_attach_trace]},
+    )
+    return AsyncOpenAI(
+        base_url=base_url, api_key=api_key, http_client=http_client, **kwargs
+    )
@@ -0,0 +1,202 @@
+import gzip
+import io
+import itertools
+import json
+import random
+from collections.abc import Iterator
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Any
+
+# Request keys the tracker controls itself and must not be replayed.
+_RESERVED_KEYS = ("stream", "stream_options")
+# Chat completion parameters replayed from a record by default; anything
+# else in a trace (ids, timestamps, ...) would be rejected by the client.
+CHAT_PARAMETERS = frozenset(
+    {
+        "audio",
+        "extra_body",
+        "extra_headers",
+        "frequency_penalty",
+        "function_call",
+        "functions",
+        "logit_bias",
+        "logprobs",
+        "max_completion_tokens",
+        "max_tokens",
+        "metadata",
+        "modalities",
+        "n",
+        "parallel_tool_calls",
+        "prediction",
+        "presence_penalty",
+        "prompt_cache_key",
+        "reasoning_effort",
+        "response_format",
+        "safety_identifier",
+        "seed",
+        "service_tier",
+        "stop",
+        "store",
+        "temperature",
+        "tool_choice",
+        "tools",
+        "top_logprobs",
+        "top_p",
+        "user",
+        "verbosity",
+        "web_search_options",
+    }
+)
+
+
+def _open_text(path: Path) -> IO[str]:
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if suffix in (".zst", ".zstd"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "Reading zstd-compressed datasets requires the 'zstandard' package"
+            ) from e
+        with ExitStack() as stack:
+            raw = stack.enter_context(open(path, "rb"))
+            reader = stack.enter_context(
+                zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+            )
+            text = io.TextIOWrapper(reader, encoding="utf-8")
+            stack.pop_all()
+        return text
+    return open(path, "r", encoding="utf-8")
+
+
+def _to_request(
+    record: dict[str, Any], prompt_field: str, passthrough: bool, record_model: bool
+) -> dict[str, Any]:
+    # OpenAI Batch API lines wrap the request body.
+    if isinstance(record.get("body"), dict):
+        record = record["body"]
+    if "messages" in record:
+        request = dict(record)
+    elif isinstance(record.get(prompt_field), str):
+        request = {k: v for k, v in record.items() if k != prompt_field}
+        request["messages"] = [{"role": "user", "content": record[prompt_field]}]
+    else:
+        raise ValueError(f"Record has neither 'messages' nor '{prompt_field}'")
+    for key in _RESERVED_KEYS:
+        request.pop(key, None)
+    if not passthrough:
+        request = {
+            k: v
+            for k, v in request.items()
+            if k in ("messages", "model") or k in CHAT_PARAMETERS
+        }
+    if not record_model:
+        request.pop("model", None)
+    return request
+
+
+def _shuffled(
+    requests: Iterator[dict[str, Any]], buffer_size: int, rng: random.Random
+) -> Iterator[dict[str, Any]]:
+    buffer = list(itertools.islice(requests, buffer_size))
+    for request in requests:
+        index = rng.randrange(buffer_size)
+        yield buffer[index]
+        buffer[index] = request
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def load_requests(
+    path: str | Path,
+    limit: int | None = None,
+    sample_rate: float | None = None,
+    shuffle_buffer: int | None = None,
+    seed: int | None = None,
+    overrides: dict[str, Any] | None = None,
+    prompt_field: str = "prompt",
+    keep_fields: tuple[str, ...] | None = None,
+    passthrough: bool = False,
+    record_model: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Stream chat requests from a JSONL file.
+
+    Reads one record per line, lazily and in constant memory, so
+    multi-GB production traces can be replayed directly. ``.gz`` files are
+    read through gzip, ``.zst``/``.zstd`` through the optional
+    ``zstandard`` package.
+
+    Each line may be an OpenAI chat request (``messages`` plus parameters),
+    an OpenAI Batch API line whose ``body`` holds such a request, or a
+    record with a plain-text prompt in ``prompt_field``. Per-record chat
+    completion parameters such as ``max_tokens`` (see
+    :data:`CHAT_PARAMETERS`) are kept and applied by
+    :meth:`~llm_perf_tools.InferenceTracker.run_batch` as overrides; other
+    fields, e.g. trace ids and timestamps, are dropped. A record's
+    ``model`` is dropped too, so the ``model`` passed to ``run_batch``
+    applies, unless ``record_model`` is set.
+
+    Args:
+        path: JSONL file, optionally gzip or zstd compressed
+        limit: Stop after yielding this many requests
+        sample_rate: Keep each record with this probability (0-1)
+        shuffle_buffer: Shuffle within a sliding buffer of this many
+            records; memory stays bounded by the buffer size
+        seed: Seed for sampling and shuffling
+        overrides: Parameters forced onto every request, e.g.
+            ``{"max_tokens": 256}``
+        prompt_field: Field holding a plain-text prompt
+        keep_fields: If given, drop every other field except ``messages``
+        passthrough: Keep every field of a record, not only chat completion
+            parameters, e.g. for server-specific parameters
+        record_model: Send each request to the ``model`` named in its
+            record instead of the one passed to ``run_batch``
+
+    Returns:
+        Iterator of request dicts with a ``messages`` key
+
+    Example:
+        >>> import json, tempfile
+        >>> with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        ...     _ = f.write(json.dumps({"prompt": "Hello", "max_tokens": 8}) + "\\n")
+        >>> next(load_requests(f.name, overrides={"temperature": 0}))
+        {'max_tokens': 8, 'messages': [{'role': 'user', 'content': 'Hello'}], 'temperature': 0}
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Request dataset not found: {path}")
+    if sample_rate is not None and not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+    rng = random.Random(seed)
+
+    def records() -> Iterator[dict[str, Any]]:
+        with _open_text(path) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                if sample_rate is not None and rng.random() >= sample_rate:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON") from e
+                request = _to_request(record, prompt_field, passthrough, record_model)
+                if keep_fields is not None:
+                    request = {
+                        k: v
+                        for k, v in request.items()
+                        if k == "messages" or k in keep_fields
+                    }
+                if overrides:
+                    request.update(overrides)
+                yield request
+
+    requests = records()
+    if shuffle_buffer:
+        requests = _shuffled(requests, shuffle_buffer, rng)
+    if limit is not None:
+        requests = itertools.islice(requests, limit)
+    return requests
@@ -0,0 +1,173 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from .samples import SampleBuffer
+from .types import GPUMetrics
+
+GPUSamples = SampleBuffer | np.ndarray | Sequence[GPUMetrics]
+
+
+def _sample_columns(samples: GPUSamples) -> dict[str, np.ndarray]:
+    if isinstance(samples, SampleBuffer):
+        samples = samples.array()
+    if isinstance(samples, np.ndarray):
+        return {name: samples[name] for name in samples.dtype.names}
+    return {
+        "timestamp": np.array([s.timestamp for s in samples], dtype=float),
+        "gpu_id": np.array([s.gpu_id for s in samples], dtype=int),
+        "power_draw_watts": np.array(
+            [s.power_draw_watts for s in samples], dtype=float
+        ),
+        "energy_joules": np.array(
+            [np.nan if s.energy_joules is None else s.energy_joules for s in samples],
+            dtype=float,
+        ),
+    }
+
+
+def cumulative_energy(samples: GPUSamples) -> tuple[np.ndarray, np.ndarray]:
+    """Energy used by all sampled GPUs since the first sample.
+
+    Each GPU's reading of NVML's cumulative energy counter is used when
+    every one of its samples has it. Otherwise its power draw is
+    integrated with the trapezoidal rule. The per-GPU curves are then
+    summed at the union of sample times.
+
+    Args:
+        samples: GPU samples from :func:`~llm_perf_tools.monitor_gpu_usage`
+            or :func:`~llm_perf_tools.load_gpu_data`
+
+    Returns:
+        Tuple of sorted sample times and the joules used up to each
+
+    Example:
+        >>> samples = [
+        ...     GPUMetrics(timestamp=t, gpu_id=0, memory_used_mb=0,
+        ...                memory_total_mb=1, memory_utilization_percent=0,
+        ...                gpu_utilization_percent=0, temperature_celsius=0,
+        ...                power_draw_watts=100.0)
+        ...     for t in (0.0, 1.0, 2.0)
+        ... ]
+        >>> cumulative_energy(samples)[1].tolist()
+        [0.0, 100.0, 200.0]
+    """
+    columns = _sample_columns(samples)
+    timestamps = columns["timestamp"]
+    gpu_ids = columns["gpu_id"]
+    if not timestamps.size:
+        return np.empty(0), np.empty(0)
+
+    times = np.unique(timestamps)
+    total = np.zeros(times.size)
+    for gpu_id in np.unique(gpu_ids):
+        mine = gpu_ids == gpu_id
+        order = np.argsort(timestamps[mine], kind="stable")
+        gpu_times = timestamps[mine][order]
+        counter = columns["energy_joules"][mine][order]
+        if not np.isnan(counter).any():
+            energy = counter - counter[0]
+        else:
+            power = columns["power_draw_watts"][mine][order]
+            energy = np.concatenate(
+                ([0.0], np.cumsum(np.diff(gpu_times) * (power[1:] + power[:-1]) / 2))
+            )
+        # Outside its own samples a GPU contributes nothing further.
+        total += np.interp(times, gpu_times, energy)
+    return times, total
+
+
+def request_energy(
+    samples: GPUSamples, request_start: np.ndarray, request_end: np.ndarray
+) -> np.ndarray:
+    """Joules attributed to each request.
+
+    Energy drawn while several requests are in flight is split evenly
+    between them, so the result sums to the energy used while at least
+    one request was running. GPU timestamps must come from the same
+    clock as the request times, ``time.perf_counter`` for both
+    :class:`~llm_perf_tools.InferenceTracker` and
+    :func:`~llm_perf_tools.monitor_gpu_usage`.
+
+    Args:
+        samples: GPU samples covering the requests
+        request_start: Start time of each request
+        request_end: End time of each request
+
+    Returns:
+        Joules per request, NaN where ``request_end`` is NaN
+    """
+    request_start = np.asarray(request_start, dtype=float)
+    request_end = np.asarray(request_end, dtype=float)
+    result = np.full(request_start.size, np.nan)
+    finished = ~np.isnan(request_end)
+    times, energy = cumulative_energy(samples)
+    if times.size and finished.any():
+        result[finished] = _attribute(
+            times, energy, request_start[finished], request_end[finished]
+        )
+    return result
+
+
+def _attribute(
+    times: np.ndarray, energy: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    # Evaluate the energy curve at every sample and request boundary, then
+    # split each segment's energy between the requests active during it.
+    points = np.unique(np.concatenate((times, starts, ends)))
+    segment_energy = np.diff(np.interp(points, times, energy))
+    midpoints = (points[1:] + points[:-1]) / 2
+    active = np.searchsorted(np.sort(starts), midpoints) - np.searchsorted(
+        np.sort(ends), midpoints
+    )
+    share = np.divide(
+        segment_energy, active, out=np.zeros_like(segment_energy), where=active > 0
+    )
+    attributed = np.concatenate(([0.0], np.cumsum(share)))
+    return (
+        attributed[np.searchsorted(points, ends)]
+        - attributed[np.searchsorted(points, starts)]
+    )
+
+
+def energy_stats(
+    samples: GPUSamples, columns: dict[str, np.ndarray]
+) -> dict[str, float | None]:
+    """Energy fields of :class:`~llm_perf_tools.types.BatchInferenceStats`.
+
+    Args:
+        samples: GPU samples covering the batch
+        columns: Per-request columns, e.g. ``tracker.metrics.columns()``
+
+    Returns:
+        ``energy_joules`` used by the GPUs from the first request start to
+        the last end, idle gaps included; ``energy_per_output_token``, that
+        energy over all output tokens; and ``avg_energy_per_request``, the
+        mean energy attributed to each successful request by
+        :func:`request_energy`
+    """
+    result: dict[str, float | None] = {
+        "energy_joules": None,
+        "energy_per_output_token": None,
+        "avg_energy_per_request": None,
+    }
+    request_end = columns["request_end"]
+    successful = ~np.isnan(request_end)
+    times, energy = cumulative_energy(samples)
+    if not successful.any() or not times.size:
+        return result
+    request_start = columns["request_start"][successful]
+    request_end = request_end[successful]
+
+    start, end = np.interp(
+        [request_start.min(), request_end.max()], times, energy
+    ).tolist()
+    total = end - start
+    output_tokens = int(columns["output_tokens"][successful].sum())
+    result["energy_joules"] = total
+    if output_tokens:
+        result["energy_per_output_token"] = total / output_tokens
+    result["avg_energy_per_request"] = float(
+        _attribute(times, energy, request_start, request_end).mean()
+    )
+    return result
@@ -1,72 +1,155 @@
-import csv
-import time
-import threading
+from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
 from pathlib import Path
 
 import pynvml
+from .monitor import DeviceProvider, monitor_devices
+from .samples import GPU_SAMPLE_DTYPE, SampleBuffer
 from .types import GPUMetrics
 
 POWER_WATTS_DIVISOR = 1000.0
+ENERGY_JOULES_DIVISOR = 1000.0
 BYTES_TO_MB = 1024 * 1024
 
+# Fields queried in one nvmlDeviceGetFieldValues call: power in milliwatts
+# and the cumulative energy counter in millijoules.
+_FIELDS = [
+    pynvml.NVML_FI_DEV_POWER_INSTANT,
+    pynvml.NVML_FI_DEV_TOTAL_ENERGY_CONSUMPTION,
+]
 
-def _collect_gpu_metrics(gpu_id: int) -> GPUMetrics:
-    handle = pynvml.nvmlDeviceGetHandleByIndex(gpu_id)
 
-    memory_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-    utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
-    temperature = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
-    power = pynvml.nvmlDeviceGetPowerUsage(handle) / POWER_WATTS_DIVISOR
+def _field_value(field) -> float:
+    value_type = field.valueType
+    if value_type == pynvml.NVML_VALUE_TYPE_DOUBLE:
+        return field.value.dVal
+    if value_type == pynvml.NVML_VALUE_TYPE_UNSIGNED_LONG_LONG:
+        return field.value.ullVal
+    if value_type == pynvml.NVML_VALUE_TYPE_UNSIGNED_LONG:
+        return field.value.ulVal
+    return field.value.uiVal
 
-    return GPUMetrics(
-        timestamp=time.perf_counter(),
-        gpu_id=gpu_id,
-        memory_used_mb=memory_info.used // BYTES_TO_MB,
-        memory_total_mb=memory_info.total // BYTES_TO_MB,
-        memory_utilization_percent=round(memory_info.used / memory_info.total * 100, 2),
-        gpu_utilization_percent=utilization.gpu,
-        temperature_celsius=temperature,
-        power_draw_watts=power,
-    )
 
+class NvmlProvider(DeviceProvider):
+    """GPU samples from NVML, with handles resolved once.
 
-def _save_metrics_to_csv(metrics: list[GPUMetrics], output_path: str) -> None:
-    if not metrics:
-        return
+    Power and the energy counter are fetched with a single
+    ``nvmlDeviceGetFieldValues`` call per device when the driver supports
+    it. Otherwise power falls back to ``nvmlDeviceGetPowerUsage`` and the
+    energy is left NaN. Total memory never changes and is read only once.
 
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=metrics[0].model_fields.keys())
-        writer.writeheader()
-        for metric in metrics:
-            writer.writerow(metric.model_dump())
+    Args:
+        gpu_id: GPU index, several indices, or ``None`` for all GPUs
+    """
+
+    dtype = GPU_SAMPLE_DTYPE
+    record = GPUMetrics
+    errors = (pynvml.NVMLError, OSError)
+
+    def __init__(self, gpu_id: int | Iterable[int] | None = 0):
+        if isinstance(gpu_id, int):
+            gpu_id = [gpu_id]
+        self.gpu_ids = None if gpu_id is None else list(gpu_id)
+
+    def open(self) -> None:
+        pynvml.nvmlInit()
+        try:
+            if self.gpu_ids is None:
+                self.gpu_ids = list(range(pynvml.nvmlDeviceGetCount()))
+            self.handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in self.gpu_ids]
+            self.memory_total = [
+                pynvml.nvmlDeviceGetMemoryInfo(handle).total for handle in self.handles
+            ]
+            self.use_fields = all(self._fields_supported(h) for h in self.handles)
+        except BaseException:
+            pynvml.nvmlShutdown()
+            raise
+
+    def close(self) -> None:
+        pynvml.nvmlShutdown()
+
+    @staticmethod
+    def _fields_supported(handle) -> bool:
+        try:
+            pynvml.nvmlDeviceGetFieldValues(handle, _FIELDS)
+        except (pynvml.NVMLError, AttributeError):
+            return False
+        return True
+
+    def _power_and_energy(self, handle) -> tuple[float, float]:
+        power = None
+        energy = float("nan")
+        if self.use_fields:
+            power_field, energy_field = pynvml.nvmlDeviceGetFieldValues(handle, _FIELDS)
+            if power_field.nvmlReturn == pynvml.NVML_SUCCESS:
+                power = _field_value(power_field) / POWER_WATTS_DIVISOR
+            if energy_field.nvmlReturn == pynvml.NVML_SUCCESS:
+                energy = _field_value(energy_field) / ENERGY_JOULES_DIVISOR
+        if power is None:
+            power = pynvml.nvmlDeviceGetPowerUsage(handle) / POWER_WATTS_DIVISOR
+        return power, energy
+
+    def collect(self, timestamp: float) -> list[tuple]:
+        samples = []
+        for gpu_id, handle, total in zip(self.gpu_ids, self.handles, self.memory_total):
+            used = pynvml.nvmlDeviceGetMemoryInfo(handle).used
+            utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
+            temperature = pynvml.nvmlDeviceGetTemperature(
+                handle, pynvml.NVML_TEMPERATURE_GPU
+            )
+            power, energy = self._power_and_energy(handle)
+            samples.append(
+                (
+                    timestamp,
+                    gpu_id,
+                    used // BYTES_TO_MB,
+                    total // BYTES_TO_MB,
+                    round(used / total * 100, 2),
+                    utilization.gpu,
+                    temperature,
+                    power,
+                    energy,
+                )
+            )
+        return samples
 
 
 @contextmanager
 def monitor_gpu_usage(
-    output_path: str = "gpu_metrics.csv", interval: float = 0.1, gpu_id: int = 0
-):
-    pynvml.nvmlInit()
-    metrics = []
-    stop_event = threading.Event()
-
-    def _monitor_loop():
-        while not stop_event.is_set():
-            try:
-                metric = _collect_gpu_metrics(gpu_id)
-                metrics.append(metric)
-                time.sleep(interval)
-            except (pynvml.NVMLError, OSError):
-                break
-
-    thread = threading.Thread(target=_monitor_loop, daemon=True)
-    thread.start()
-
-    try:
+    output_path: str | Path = "gpu_metrics.csv",
+    interval: float = 0.1,
+    gpu_id: int | Iterable[int] | None = 0,
+    capacity: int = 65536,
+    flush_interval: float = 1.0,
+    provider: DeviceProvider | None = None,
+) -> Iterator[SampleBuffer[GPUMetrics]]:
+    """Sample GPU usage in a background thread while the block runs.
+
+    A single thread reads every selected GPU on a fixed-rate schedule, so
+    short intervals, e.g. 10 ms on an 8-GPU node, keep their period. All
+    GPUs in one sweep share a timestamp from ``time.perf_counter``, the
+    tracker's clock. Samples are streamed to ``output_path`` from a
+    bounded ring buffer, see :func:`~llm_perf_tools.monitor.monitor_devices`.
+
+    Args:
+        output_path: File for the collected samples, binary for ``.bin``
+        interval: Seconds between samples
+        gpu_id: GPU index, several indices, or ``None`` for all GPUs
+        capacity: Samples kept in memory, across all GPUs
+        flush_interval: Seconds between writes to ``output_path``
+        provider: Backend to sample instead of NVML, e.g.
+            :class:`~llm_perf_tools.providers.SimulatedGPUProvider` on
+            machines without a GPU; ``gpu_id`` is then ignored
+
+    Yields:
+        :class:`~llm_perf_tools.samples.SampleBuffer` of
+        :class:`~llm_perf_tools.types.GPUMetrics`. ``len()`` counts every
+        sample taken, :meth:`~llm_perf_tools.samples.SampleBuffer.recent`
+        returns the latest ones still held in memory.
+    """
+    if provider is None:
+        provider = NvmlProvider(gpu_id)
+    with monitor_devices(
+        provider, output_path, interval, capacity, flush_interval
+    ) as metrics:
         yield metrics
-    finally:
-        stop_event.set()
-        thread.join(timeout=1.0)
-        _save_metrics_to_csv(metrics, output_path)
-        pynvml.nvmlShutdown()
@@ -1,9 +1,40 @@
+import asyncio
+import json
+import threading
 import time
-from typing import Any, Callable
+import warnings
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import pairwise
+from types import SimpleNamespace
+from typing import Any, Callable, Literal
+
+import numpy as np
+
+from .window import RollingWindow
+from .types import RequestMetrics, InferenceStats, BatchInferenceStats
+from .arrivals import constant_arrivals, poisson_arrivals
+from .client import connect_time_var
+from .energy import GPUSamples, energy_stats
+from .probe import LoopLagProbe
+from .sink import ResultSink
+from .sketch import SketchBatchStats
+from .stats import BATCH_COLUMNS, OPTIONAL_BATCH_COLUMNS, batch_stats_from_columns
+from .store import MetricsStore
 
-from transformers import AutoTokenizer
 
-from .types import RequestMetrics, InferenceStats, BatchInferenceStats
+DEFAULT_TOKENIZER = "openai/gpt-oss-20b"
+
+
+def _load_default_tokenizer() -> Callable[[str], int]:
+    # transformers is imported here rather than at module level so that
+    # ``import llm_perf_tools`` stays cheap for callers that never tokenize.
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(DEFAULT_TOKENIZER)
+    return lambda text: len(tokenizer.encode(text))
 
 
 def time_to_first_token(metrics: RequestMetrics) -> float | None:
@@ -109,6 +140,35 @@ def requests_per_second(metrics: list[RequestMetrics], duration: float) -> float
     return completed_requests / duration
 
 
+def chunk_itl_stats(
+    chunk_times: array, stall_threshold: float
+) -> tuple[float | None, float | None, float | None, int | None]:
+    """Summarize the gaps between streamed chunk arrival times.
+
+    Unlike :func:`inter_token_latency`, which averages the whole decode
+    phase, this looks at every individual gap so decode stalls stay visible.
+
+    Args:
+        chunk_times: ``perf_counter`` arrival time of each content chunk
+        stall_threshold: Gap in seconds above which a gap counts as a stall
+
+    Returns:
+        Tuple of (p50 gap, p99 gap, max gap, stall count), all None if
+        fewer than two chunks were received
+
+    Example:
+        >>> from array import array
+        >>> chunk_itl_stats(array("d", [0.0, 0.25, 0.5, 1.5]), 0.5)
+        (0.25, 0.25, 1.0, 1)
+    """
+    if len(chunk_times) < 2:
+        return None, None, None, None
+    gaps = sorted(b - a for a, b in pairwise(chunk_times))
+    last = len(gaps) - 1
+    stalls = len(gaps) - bisect_right(gaps, stall_threshold)
+    return gaps[int(0.5 * last)], gaps[int(0.99 * last)], gaps[-1], stalls
+
+
 def compute_stats(metrics: RequestMetrics | list[RequestMetrics]) -> InferenceStats:
     """Compute inference statistics for single request or batch.
 
@@ -179,17 +239,70 @@ def percentile(values: list[float], percentile: float) -> float:
     return sorted_values[index]
 
 
+def _batch_columns(
+    metrics: "list[RequestMetrics] | MetricsStore",
+) -> dict[str, np.ndarray]:
+    if isinstance(metrics, MetricsStore):
+        return {
+            name: metrics.column(name)
+            for name in BATCH_COLUMNS + OPTIONAL_BATCH_COLUMNS
+        }
+    count = len(metrics)
+    nan = float("nan")
+    return {
+        "request_start": np.fromiter(
+            (m.request_start for m in metrics), np.float64, count
+        ),
+        "first_token_time": np.fromiter(
+            (
+                nan if m.first_token_time is None else m.first_token_time
+                for m in metrics
+            ),
+            np.float64,
+            count,
+        ),
+        "request_end": np.fromiter(
+            (nan if m.request_end is None else m.request_end for m in metrics),
+            np.float64,
+            count,
+        ),
+        "input_tokens": np.fromiter((m.input_tokens for m in metrics), np.int64, count),
+        "output_tokens": np.fromiter(
+            (m.output_tokens for m in metrics), np.int64, count
+        ),
+        **{
+            name: np.fromiter(
+                (
+                    nan if getattr(m, name) is None else getattr(m, name)
+                    for m in metrics
+                ),
+                np.float64,
+                count,
+            )
+            for name in OPTIONAL_BATCH_COLUMNS
+        },
+    }
+
+
 def compute_batch_metrics(
-    metrics_list: list[RequestMetrics], batch_duration: float
+    metrics_list: "list[RequestMetrics] | MetricsStore",
+    batch_duration: float,
+    slo_ttft: float | None = None,
+    slo_itl: float | None = None,
 ) -> BatchInferenceStats:
     """Compute comprehensive batch-level performance metrics.
 
     Analyzes multiple requests to calculate percentiles, averages,
     and other aggregate statistics for batch processing evaluation.
+    A :class:`MetricsStore` is read through zero-copy column views;
+    a list is converted to columns first.
 
     Args:
-        metrics_list: List of RequestMetrics from batch requests
+        metrics_list: RequestMetrics from batch requests, as a list or store
         batch_duration: Total time in seconds for batch processing
+        slo_ttft: TTFT target in seconds; with ``slo_itl`` enables the
+            ``slo_attainment`` and ``goodput_*`` fields
+        slo_itl: Target for the average inter-token latency in seconds
 
     Returns:
         BatchInferenceStats with percentiles, averages, and totals
@@ -203,85 +316,72 @@ def compute_batch_metrics(
         >>> batch_stats = compute_batch_metrics(metrics, 10.5)
         >>> batch_stats.total_requests
         2
+        >>> compute_batch_metrics(metrics, 10.5, slo_ttft=0.5).slo_attainment
+        0.0
     """
-
     if not metrics_list:
         return BatchInferenceStats()
-
-    successful_metrics = [m for m in metrics_list if m.request_end is not None]
-
-    ttft_values = [
-        m.first_token_time - m.request_start
-        for m in successful_metrics
-        if m.first_token_time is not None
-    ]
-
-    e2e_values = [
-        m.request_end - m.request_start
-        for m in successful_metrics
-        if m.request_end is not None
-    ]
-
-    itl_values = []
-    tps_values = []
-
-    for m in successful_metrics:
-        if m.first_token_time and m.request_end and m.output_tokens > 1:
-            generation_time = m.request_end - m.first_token_time
-            itl = generation_time / (m.output_tokens - 1)
-            itl_values.append(itl)
-
-            if generation_time > 0:
-                tps = m.output_tokens / generation_time
-                tps_values.append(tps)
-
-    total_input_tokens = sum(m.input_tokens for m in successful_metrics)
-    total_output_tokens = sum(m.output_tokens for m in successful_metrics)
-    avg_input_tokens = (
-        total_input_tokens / len(successful_metrics) if successful_metrics else None
-    )
-    avg_output_tokens = (
-        total_output_tokens / len(successful_metrics) if successful_metrics else None
+    return batch_stats_from_columns(
+        _batch_columns(metrics_list), batch_duration, slo_ttft, slo_itl
     )
 
-    rps = len(successful_metrics) / batch_duration if batch_duration > 0 else 0
-
-    return BatchInferenceStats(
-        avg_ttft=sum(ttft_values) / len(ttft_values) if ttft_values else None,
-        p50_ttft=percentile(ttft_values, 50) if ttft_values else None,
-        p95_ttft=percentile(ttft_values, 95) if ttft_values else None,
-        p99_ttft=percentile(ttft_values, 99) if ttft_values else None,
-        min_ttft=min(ttft_values) if ttft_values else None,
-        max_ttft=max(ttft_values) if ttft_values else None,
-        avg_e2e_latency=sum(e2e_values) / len(e2e_values) if e2e_values else None,
-        p50_e2e_latency=percentile(e2e_values, 50) if e2e_values else None,
-        p95_e2e_latency=percentile(e2e_values, 95) if e2e_values else None,
-        p99_e2e_latency=percentile(e2e_values, 99) if e2e_values else None,
-        min_e2e_latency=min(e2e_values) if e2e_values else None,
-        max_e2e_latency=max(e2e_values) if e2e_values else None,
-        avg_itl=sum(itl_values) / len(itl_values) if itl_values else None,
-        p50_itl=percentile(itl_values, 50) if itl_values else None,
-        p95_itl=percentile(itl_values, 95) if itl_values else None,
-        p99_itl=percentile(itl_values, 99) if itl_values else None,
-        min_itl=min(itl_values) if itl_values else None,
-        max_itl=max(itl_values) if itl_values else None,
-        avg_tps=sum(tps_values) / len(tps_values) if tps_values else None,
-        p50_tps=percentile(tps_values, 50) if tps_values else None,
-        p5_tps=percentile(tps_values, 5) if tps_values else None,
-        p1_tps=percentile(tps_values, 1) if tps_values else None,
-        min_tps=min(tps_values) if tps_values else None,
-        max_tps=max(tps_values) if tps_values else None,
-        overall_tps=tokens_per_second(successful_metrics),
-        total_input_tokens=total_input_tokens,
-        total_output_tokens=total_output_tokens,
-        avg_input_tokens=avg_input_tokens,
-        avg_output_tokens=avg_output_tokens,
-        rps=rps,
-        total_requests=len(metrics_list),
-        successful_requests=len(successful_metrics),
+
+async def _timed_chunks(response: Any, total: list[float]):
+    # Between handing out a chunk and being asked for the next one, the
+    # consumer's loop body runs without awaiting, so the gap is the time
+    # spent handling that chunk.
+    perf_counter = time.perf_counter
+    async for chunk in response:
+        handed_out = perf_counter()
+        yield chunk
+        total[0] += perf_counter() - handed_out
+
+
+def _require_rate(rate: float | None) -> float:
+    if rate is None:
+        raise ValueError("rate is required for poisson and constant arrivals")
+    return rate
+
+
+async def _gather_or_cancel(tasks: Iterable[asyncio.Task]) -> None:
+    # Like asyncio.gather, but the first exception cancels the other tasks
+    # instead of leaving them running behind the caller's back.
+    tasks = list(tasks)
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _request_errors() -> tuple[type[Exception], ...]:
+    # Ways a single request can fail. They are recorded and passed to
+    # on_response; anything else is a bug and stops the run. openai and
+    # httpx are imported here to keep ``import llm_perf_tools`` cheap.
+    import httpx
+    import openai
+
+    return (
+        openai.OpenAIError,
+        httpx.HTTPError,
+        asyncio.TimeoutError,
+        OSError,
+        RuntimeError,
+        ValueError,
     )
 
 
+def _split_prompt(prompt: Any) -> tuple[list[dict], dict[str, Any]]:
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}], {}
+    if isinstance(prompt, dict):
+        overrides = dict(prompt)
+        return overrides.pop("messages"), overrides
+    return prompt, {}
+
+
 class InferenceTracker:
     """Tracks performance metrics for LLM inference requests.
 
@@ -291,7 +391,55 @@ class InferenceTracker:
     Args:
         client: OpenAI async client for making requests
         tokenizer: Optional callable that returns the token count for a
-            given string. Defaults to openai/gpt-oss-20b tokenizer.
+            given string. Defaults to openai/gpt-oss-20b tokenizer, which is
+            loaded on first use rather than at construction.
+        record_chunk_times: Record the arrival time of every streamed
+            content chunk in :attr:`chunk_times` and derive per-request
+            ITL percentiles and stall counts from them. Off by default.
+        stall_threshold: Gap in seconds between two chunks that counts as
+            a decode stall when ``record_chunk_times`` is enabled.
+        tokenizer_workers: Number of threads used for token counting.
+            Tokenization runs off the event loop so counting long outputs
+            does not delay chunk timestamps of other in-flight requests.
+        prefer_server_usage: Request ``stream_options={"include_usage": True}``
+            and take token counts from the server's final usage chunk. The
+            local tokenizer is only used when a response carries no usage.
+        sketch_accuracy: When set, keep constant-memory quantile sketches
+            (:class:`~llm_perf_tools.sketch.SketchBatchStats`) instead of
+            raw per-request metrics, for multi-day runs. Reported
+            percentiles are then within this relative error, e.g. 0.01
+            for 1%; averages, extremes and totals stay exact.
+            :attr:`metrics` stays empty in this mode.
+        rolling_window: When set, also feed completed requests into a
+            :class:`~llm_perf_tools.window.RollingWindow` of this many
+            seconds, read with :meth:`compute_window_metrics`.
+        slo_ttft: Time-to-first-token target in seconds. When this or
+            ``slo_itl`` is set, computed stats report the share of requests
+            meeting every target (``slo_attainment``) and the requests and
+            output tokens per second served within it (``goodput_rps``,
+            ``goodput_tps``).
+        slo_itl: Target for a request's average inter-token latency in
+            seconds.
+        measure_client_overhead: Record each request's client-side
+            processing time (``client_overhead``: time spent handling its
+            chunks plus tokenizer CPU time) and the worst event-loop lag
+            while it was in flight (``loop_lag``, from a
+            :class:`~llm_perf_tools.probe.LoopLagProbe`). SSE parsing inside
+            the OpenAI client shows up as loop lag. Off by default.
+        overhead_warning: Emit a ``RuntimeWarning`` after
+            :meth:`run_batch` or :meth:`run_open_loop` when client overhead
+            plus loop lag exceeds this fraction of the total measured
+            latency, i.e. when the client rather than the server may be
+            the bottleneck. ``None`` disables the check.
+        raw_stream: Read the server-sent events directly instead of
+            through the OpenAI client's chunk objects. This skips building a
+            pydantic model per chunk, which dominates client CPU at high
+            concurrency, and timestamps each token as its line arrives.
+            Assumes an OpenAI-compatible SSE stream; off by default.
+        result_sink: :class:`~llm_perf_tools.sink.ResultSink` that every
+            completed request is streamed to, also with ``sketch_accuracy``.
+            :meth:`run_batch` and :meth:`run_open_loop` flush it and write
+            its stats sidecar when they finish. The caller closes it.
 
     Example:
         Track metrics for a single request:
@@ -313,14 +461,51 @@ class InferenceTracker:
             print(f"Time to first token: {metrics.avg_ttft:.3f}s")
     """
 
-    def __init__(self, client: Any, tokenizer: Callable[[str], int] | None = None):
+    def __init__(
+        self,
+        client: Any,
+        tokenizer: Callable[[str], int] | None = None,
+        record_chunk_times: bool = False,
+        stall_threshold: float = 0.1,
+        tokenizer_workers: int = 1,
+        prefer_server_usage: bool = False,
+        sketch_accuracy: float | None = None,
+        rolling_window: float | None = None,
+        slo_ttft: float | None = None,
+        slo_itl: float | None = None,
+        measure_client_overhead: bool = False,
+        overhead_warning: float | None = 0.1,
+        raw_stream: bool = False,
+        result_sink: ResultSink | None = None,
+    ):
         self.client = client
-        if tokenizer is None:
-            default_tokenizer = AutoTokenizer.from_pretrained("openai/gpt-oss-20b")
-            self.tokenizer = lambda text: len(default_tokenizer.encode(text))
-        else:
-            self.tokenizer = tokenizer
-        self.metrics: list[RequestMetrics] = []
+        self._tokenizer = tokenizer
+        self._tokenizer_lock = threading.Lock()
+        self.record_chunk_times = record_chunk_times
+        self.stall_threshold = stall_threshold
+        self.tokenizer_workers = tokenizer_workers
+        self.prefer_server_usage = prefer_server_usage
+        self._tokenizer_executor: ThreadPoolExecutor | None = None
+        self._store = MetricsStore()
+        self.slo_ttft = slo_ttft
+        self.slo_itl = slo_itl
+        self.sketch_accuracy = sketch_accuracy
+        self.sketch = (
+            SketchBatchStats(sketch_accuracy, slo_ttft=slo_ttft, slo_itl=slo_itl)
+            if sketch_accuracy is not None
+            else None
+        )
+        self.window = (
+            RollingWindow(rolling_window, slo_ttft=slo_ttft, slo_itl=slo_itl)
+            if rolling_window is not None
+            else None
+        )
+        self.raw_stream = raw_stream
+        self.result_sink = result_sink
+        self.measure_client_overhead = measure_client_overhead
+        self.overhead_warning = overhead_warning
+        self.loop_probe = LoopLagProbe() if measure_client_overhead else None
+        self.chunk_times: list[array] = []
         self._start_time: float | None = None
 
     async def create_chat_completion(
@@ -350,11 +535,6 @@ class InferenceTracker:
         Same interface as OpenAI's create() method, except stream=True
         is always enforced for performance metrics collection.
         """
-        if self._start_time is None:
-            self._start_time = time.perf_counter()
-
-        request_start = time.perf_counter()
-
         kwargs.update(
             {
                 k: v
@@ -378,30 +558,120 @@ class InferenceTracker:
                 if v is not None
             }
         )
+        return await self._stream_completion(
+            messages, model, kwargs, show_streaming=show_streaming
+        )
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=model, messages=messages, stream=True, **kwargs
-            )
+    async def _stream_completion(
+        self,
+        messages: list[dict],
+        model: str,
+        kwargs: dict[str, Any],
+        show_streaming: bool = False,
+        enqueued_at: float | None = None,
+        scheduled_at: float | None = None,
+    ) -> str:
+        values, result = await self._send_request(
+            messages, model, kwargs, show_streaming, enqueued_at, scheduled_at
+        )
+        self._record(**values)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _send_request(
+        self,
+        messages: list[dict],
+        model: str,
+        kwargs: dict[str, Any],
+        show_streaming: bool = False,
+        enqueued_at: float | None = None,
+        scheduled_at: float | None = None,
+    ) -> tuple[dict[str, Any], str | BaseException]:
+        # Streams one request and returns its metrics with the response
+        # text or the request error. Recording is left to the caller, so a
+        # failing result sink is never mistaken for a failed request.
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
 
-            first_token_time = None
-            content_chunks = []
+        sent_at = time.perf_counter()
+        queue_wait = sent_at - enqueued_at if enqueued_at is not None else None
+        # Open-loop runs measure from the intended send time, so a late
+        # scheduler cannot hide queueing delay (coordinated omission).
+        if scheduled_at is not None:
+            request_start = scheduled_at
+            send_lag = sent_at - scheduled_at
+        else:
+            request_start = sent_at
+            send_lag = None
+
+        perf_counter = time.perf_counter
+        record_chunks = self.record_chunk_times
+        chunk_times = array("d")
+        append_time = chunk_times.append
 
-            async for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    if first_token_time is None:
-                        first_token_time = time.perf_counter()
-                    content = chunk.choices[0].delta.content
-                    if show_streaming:
-                        print(content, end="", flush=True)
-                    content_chunks.append(content)
+        use_server_usage = self.prefer_server_usage
+        if use_server_usage:
+            kwargs.setdefault("stream_options", {"include_usage": True})
+
+        probe = self.loop_probe
+        handling_time = [0.0]
+        if probe is not None:
+            probe.acquire()
+        connect_cell: list[float | None] = [None, None]
+        connect_token = connect_time_var.set(connect_cell)
+
+        try:
+            if self.raw_stream:
+                first_token_time, content_chunks, usage = await self._read_raw_stream(
+                    messages,
+                    model,
+                    kwargs,
+                    show_streaming,
+                    append_time if record_chunks else None,
+                    handling_time if probe is not None else None,
+                )
+            else:
+                response = await self.client.chat.completions.create(
+                    model=model, messages=messages, stream=True, **kwargs
+                )
+                if probe is not None:
+                    response = _timed_chunks(response, handling_time)
+
+                first_token_time = None
+                content_chunks = []
+                usage = None
+
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if record_chunks:
+                            now = perf_counter()
+                            append_time(now)
+                            if first_token_time is None:
+                                first_token_time = now
+                        elif first_token_time is None:
+                            first_token_time = perf_counter()
+                        content = chunk.choices[0].delta.content
+                        if show_streaming:
+                            print(content, end="", flush=True)
+                        content_chunks.append(content)
+                    if use_server_usage and getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
 
             request_end = time.perf_counter()
             full_content = "".join(content_chunks)
 
-            input_text = " ".join(msg["content"] for msg in messages)
-            input_tokens = self.tokenizer(input_text)
-            output_tokens = self.tokenizer(full_content)
+            if usage is not None and usage.completion_tokens is not None:
+                input_tokens = usage.prompt_tokens or 0
+                output_tokens = usage.completion_tokens
+                usage_source = "server"
+            else:
+                input_text = " ".join(msg["content"] for msg in messages)
+                input_tokens, output_tokens, tokenize_time = await self._count_tokens(
+                    input_text, full_content
+                )
+                handling_time[0] += tokenize_time
+                usage_source = "tokenizer"
 
             ttft = first_token_time - request_start if first_token_time else None
             e2e_latency = request_end - request_start
@@ -414,50 +684,453 @@ class InferenceTracker:
             tps = (
                 output_tokens / decode_time if decode_time and decode_time > 0 else None
             )
+            itl_p50, itl_p99, itl_max, stall_count = (
+                chunk_itl_stats(chunk_times, self.stall_threshold)
+                if record_chunks
+                else (None, None, None, None)
+            )
+            connect_time = connect_cell[0]
+            prefill_time = ttft
+            if ttft is not None and connect_time:
+                prefill_time = ttft - connect_time
+            client_overhead = loop_lag = None
+            if probe is not None:
+                client_overhead = handling_time[0]
+                loop_lag = probe.max_lag(request_start, request_end)
+
+            values = {
+                "request_start": request_start,
+                "first_token_time": first_token_time,
+                "request_end": request_end,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "ttft": ttft,
+                "e2e_latency": e2e_latency,
+                "itl": itl,
+                "tps": tps,
+                "prefill_time": prefill_time,
+                "decode_time": decode_time,
+                "itl_p50": itl_p50,
+                "itl_p99": itl_p99,
+                "itl_max": itl_max,
+                "stall_count": stall_count,
+                "usage_source": usage_source,
+                "queue_wait": queue_wait,
+                "send_lag": send_lag,
+                "client_overhead": client_overhead,
+                "loop_lag": loop_lag,
+                "connect_time": connect_time,
+            }
+            result: str | BaseException = full_content
+        except _request_errors() as e:
+            request_end = time.perf_counter()
+            values = {
+                "request_start": request_start,
+                "first_token_time": None,
+                "request_end": request_end,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "ttft": None,
+                "e2e_latency": request_end - request_start,
+                "itl": None,
+                "tps": None,
+                "prefill_time": None,
+                "decode_time": None,
+                "queue_wait": queue_wait,
+                "send_lag": send_lag,
+            }
+            result = e
+        finally:
+            connect_time_var.reset(connect_token)
+            if probe is not None:
+                probe.release()
+        if record_chunks:
+            self.chunk_times.append(chunk_times)
+        return values, result
+
+    async def _read_raw_stream(
+        self,
+        messages: list[dict],
+        model: str,
+        kwargs: dict[str, Any],
+        show_streaming: bool,
+        append_time: Callable[[float], None] | None,
+        handling_time: list[float] | None,
+    ) -> tuple[float | None, list[str], Any]:
+        # Reads the SSE lines directly instead of letting the SDK build a
+        # pydantic ChatCompletionChunk per event; each event is timestamped
+        # as soon as its line arrives, before it is decoded.
+        perf_counter = time.perf_counter
+        loads = json.loads
+        use_server_usage = self.prefer_server_usage
+        first_token_time = None
+        content_chunks: list[str] = []
+        usage = None
+        async with self.client.chat.completions.with_streaming_response.create(
+            model=model, messages=messages, stream=True, **kwargs
+        ) as response:
+            lines = response.iter_lines()
+            if handling_time is not None:
+                lines = _timed_chunks(lines, handling_time)
+            async for line in lines:
+                if not line.startswith("data:"):
+                    continue
+                now = perf_counter()
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                event = loads(payload)
+                if "error" in event:
+                    error = event["error"]
+                    message = error.get("message") if isinstance(error, dict) else error
+                    raise RuntimeError(f"Server sent an error event: {message}")
+                # Servers differ in where the usage goes: a chunk of its own
+                # or the last content chunk, so it is read from every event.
+                if use_server_usage and event.get("usage") is not None:
+                    usage = SimpleNamespace(**event["usage"])
+                choices = event.get("choices")
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or {}).get("content")
+                if not content:
+                    continue
+                if append_time is not None:
+                    append_time(now)
+                if first_token_time is None:
+                    first_token_time = now
+                if show_streaming:
+                    print(content, end="", flush=True)
+                content_chunks.append(content)
+        return first_token_time, content_chunks, usage
+
+    async def run_batch(
+        self,
+        prompts: Iterable[Any],
+        model: str,
+        concurrency: int = 8,
+        on_response: Callable[[int, str | BaseException], None] | None = None,
+        **kwargs,
+    ) -> BatchInferenceStats:
+        """Run prompts closed-loop with exactly ``concurrency`` in flight.
+
+        A fixed pool of ``concurrency`` workers pulls prompts lazily from
+        ``prompts``, so arbitrarily long iterators or generators are never
+        materialized and no coroutine is created before a worker is free.
+        Every prompt counts as queued when the batch starts; the time until
+        a worker sends it is recorded as ``queue_wait``, separately from
+        the server-side latencies.
+
+        Failed requests are recorded as usual and do not stop the batch.
+        Any other exception, e.g. from ``on_response``, cancels the
+        remaining workers and is raised.
+
+        Args:
+            prompts: Items that are either a message list, a plain string
+                (sent as one user message) or a request dict with
+                ``messages`` plus per-request parameter overrides
+            model: Model name passed to the API
+            concurrency: Number of requests kept in flight
+            on_response: Optional callback receiving each prompt's index and
+                its response text, or the exception it raised
+            **kwargs: Parameters sent with every request
+
+        Returns:
+            BatchInferenceStats over all metrics recorded by the tracker
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        iterator = enumerate(prompts)
+        batch_start = time.perf_counter()
+
+        async def worker() -> None:
+            # Pulling from a shared iterator is safe: next() never awaits.
+            for index, prompt in iterator:
+                await self._run_one(
+                    index, prompt, model, kwargs, batch_start, on_response
+                )
+
+        await _gather_or_cancel(
+            asyncio.create_task(worker()) for _ in range(concurrency)
+        )
+        return self._finish_run()
+
+    async def run_open_loop(
+        self,
+        prompts: Iterable[Any],
+        model: str,
+        rate: float | None = None,
+        arrivals: Literal["poisson", "constant"] | Iterable[float] = "poisson",
+        seed: int | None = None,
+        on_response: Callable[[int, str | BaseException], None] | None = None,
+        **kwargs,
+    ) -> BatchInferenceStats:
+        """Send prompts open-loop on a fixed arrival schedule.
+
+        Unlike :meth:`run_batch`, requests are fired at their scheduled
+        times no matter how many are still in flight, so a slowing server
+        shows up as growing latency instead of a silently lower send rate.
+        Each request's latencies are measured from its intended send time,
+        which corrects for coordinated omission; how late the scheduler
+        actually fired is recorded as ``send_lag`` and summarized in
+        ``avg/p50/p99/max_send_lag``.
+
+        The run ends when ``prompts`` or the arrival schedule runs out.
+        As in :meth:`run_batch`, failed requests do not stop it, but any
+        other exception stops scheduling, cancels the requests in flight
+        and is raised.
+
+        Args:
+            prompts: Same item formats as :meth:`run_batch`
+            model: Model name passed to the API
+            rate: Target requests per second for ``"poisson"`` and
+                ``"constant"`` arrivals
+            arrivals: ``"poisson"``, ``"constant"`` or an iterable of send
+                offsets in seconds from the start, e.g. from
+                :func:`~llm_perf_tools.arrivals.trace_arrivals`
+            seed: Seed for the Poisson schedule
+            on_response: Optional callback receiving each prompt's index and
+                its response text, or the exception it raised
+            **kwargs: Parameters sent with every request
+
+        Returns:
+            BatchInferenceStats over all metrics recorded by the tracker
+        """
+        if arrivals == "poisson":
+            offsets = poisson_arrivals(_require_rate(rate), seed)
+        elif arrivals == "constant":
+            offsets = constant_arrivals(_require_rate(rate))
+        elif isinstance(arrivals, str):
+            raise ValueError(f"Unknown arrival process: {arrivals}")
+        else:
+            offsets = iter(arrivals)
+
+        start = time.perf_counter()
+        pending: set[asyncio.Task] = set()
+        # Set to the first task that fails with anything but a request
+        # error (those are caught in _run_one), which ends the run.
+        failed: asyncio.Future[asyncio.Task] = (
+            asyncio.get_running_loop().create_future()
+        )
 
-            metrics = RequestMetrics(
-                request_start=request_start,
-                first_token_time=first_token_time,
-                request_end=request_end,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                ttft=ttft,
-                e2e_latency=e2e_latency,
-                itl=itl,
-                tps=tps,
-                prefill_time=ttft,
-                decode_time=decode_time,
+        def done(task: asyncio.Task) -> None:
+            pending.discard(task)
+            if task.cancelled() or failed.done():
+                return
+            if task.exception() is not None:
+                failed.set_result(task)
+
+        for (index, prompt), offset in zip(enumerate(prompts), offsets):
+            scheduled_at = start + offset
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.wait((failed,), timeout=delay)
+            if failed.done():
+                break
+            task = asyncio.create_task(
+                self._run_one(
+                    index,
+                    prompt,
+                    model,
+                    kwargs,
+                    None,
+                    on_response,
+                    scheduled_at=scheduled_at,
+                )
             )
+            pending.add(task)
+            task.add_done_callback(done)
+
+        if failed.done():
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise failed.result().exception()
+        if pending:
+            await _gather_or_cancel(pending)
+        return self._finish_run()
+
+    async def _run_one(
+        self,
+        index: int,
+        prompt: Any,
+        model: str,
+        kwargs: dict[str, Any],
+        enqueued_at: float | None,
+        on_response: Callable[[int, str | BaseException], None] | None,
+        scheduled_at: float | None = None,
+    ) -> None:
+        messages, overrides = _split_prompt(prompt)
+        values, result = await self._send_request(
+            messages,
+            overrides.pop("model", model),
+            {**kwargs, **overrides},
+            enqueued_at=enqueued_at,
+            scheduled_at=scheduled_at,
+        )
+        self._record(**values)
+        if on_response is not None:
+            on_response(index, result)
 
-            self.metrics.append(metrics)
-            return full_content
+    @property
+    def metrics(self) -> MetricsStore:
+        """Per-request metrics, stored column-wise.
 
-        except Exception as e:
-            request_end = time.perf_counter()
-            failed_metrics = RequestMetrics(
-                request_start=request_start,
-                first_token_time=None,
-                request_end=request_end,
-                input_tokens=0,
-                output_tokens=0,
-                ttft=None,
-                e2e_latency=request_end - request_start,
-                itl=None,
-                tps=None,
-                prefill_time=None,
-                decode_time=None,
+        Behaves like a read-only ``list[RequestMetrics]``; use
+        :meth:`MetricsStore.column` for zero-copy access to a field.
+        """
+        return self._store
+
+    @metrics.setter
+    def metrics(self, metrics: Iterable[RequestMetrics]) -> None:
+        self._store = MetricsStore.from_records(metrics)
+
+    def _record(self, **values: Any) -> None:
+        if self.result_sink is not None:
+            self.result_sink.write(values)
+        if self.sketch is None:
+            self._store.append(**values)
+        else:
+            self.sketch.add(
+                values["request_start"],
+                values.get("first_token_time"),
+                values.get("request_end"),
+                values.get("input_tokens", 0),
+                values.get("output_tokens", 0),
+                values.get("queue_wait"),
+                values.get("send_lag"),
+                values.get("client_overhead"),
+                values.get("loop_lag"),
+                values.get("connect_time"),
+                values.get("prefill_time"),
+            )
+        if self.window is not None:
+            self.window.add(
+                values["request_start"],
+                values.get("first_token_time"),
+                values.get("request_end"),
+                values.get("input_tokens", 0),
+                values.get("output_tokens", 0),
+            )
+
+    @property
+    def tokenizer(self) -> Callable[[str], int]:
+        if self._tokenizer is None:
+            with self._tokenizer_lock:
+                if self._tokenizer is None:
+                    self._tokenizer = _load_default_tokenizer()
+        return self._tokenizer
+
+    @tokenizer.setter
+    def tokenizer(self, tokenizer: Callable[[str], int]) -> None:
+        self._tokenizer = tokenizer
+
+    async def _count_tokens(
+        self, input_text: str, output_text: str
+    ) -> tuple[int, int, float]:
+        if self._tokenizer_executor is None:
+            self._tokenizer_executor = ThreadPoolExecutor(
+                max_workers=self.tokenizer_workers,
+                thread_name_prefix="llm-perf-tokenizer",
             )
-            self.metrics.append(failed_metrics)
-            raise e
 
-    def compute_metrics(self) -> BatchInferenceStats:
-        if not self.metrics or self._start_time is None:
+        def count() -> tuple[int, int, float]:
+            # Resolve the tokenizer inside the pool so a lazy default load
+            # never blocks the event loop either, and before the timer
+            # starts so the load is not counted as client overhead.
+            tokenizer = self.tokenizer
+            started = time.thread_time()
+            input_tokens = tokenizer(input_text)
+            output_tokens = tokenizer(output_text)
+            return input_tokens, output_tokens, time.thread_time() - started
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._tokenizer_executor, count
+        )
+
+    def _finish_run(self) -> BatchInferenceStats:
+        stats = self._checked(self.compute_metrics())
+        if self.result_sink is not None:
+            self.result_sink.flush()
+            self.result_sink.write_stats(stats)
+        return stats
+
+    def _checked(self, stats: BatchInferenceStats) -> BatchInferenceStats:
+        fraction = stats.client_overhead_fraction
+        if (
+            self.overhead_warning is not None
+            and fraction is not None
+            and fraction > self.overhead_warning
+        ):
+            warnings.warn(
+                f"Client overhead and event-loop lag make up {fraction:.0%} of "
+                f"the measured latency (threshold {self.overhead_warning:.0%}); "
+                "the load generator may be the bottleneck. Consider fewer "
+                "requests per process or run_multiprocess.",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+        return stats
+
+    def compute_metrics(
+        self, gpu_samples: GPUSamples | None = None
+    ) -> BatchInferenceStats:
+        """Batch stats over all tracked requests.
+
+        Args:
+            gpu_samples: GPU samples recorded during the run, e.g. the
+                buffer yielded by :func:`~llm_perf_tools.monitor_gpu_usage`
+                or :func:`~llm_perf_tools.load_gpu_data` output. When given,
+                the energy fields are filled from them (see
+                :func:`~llm_perf_tools.energy.energy_stats`).
+        """
+        if gpu_samples is not None and self.sketch is not None:
+            raise ValueError(
+                "Energy accounting needs per-request metrics; "
+                "create the tracker without sketch_accuracy"
+            )
+        if self._start_time is None:
             return BatchInferenceStats()
 
         current_time = time.perf_counter()
         batch_duration = current_time - self._start_time
-        return compute_batch_metrics(self.metrics, batch_duration)
+        if self.sketch is not None:
+            return self.sketch.to_batch_stats(batch_duration)
+        if not self.metrics:
+            return BatchInferenceStats()
+        stats = compute_batch_metrics(
+            self.metrics, batch_duration, self.slo_ttft, self.slo_itl
+        )
+        if gpu_samples is not None:
+            stats = stats.model_copy(
+                update=energy_stats(gpu_samples, self.metrics.columns())
+            )
+        return stats
+
+    def compute_window_metrics(self) -> BatchInferenceStats:
+        """Stats over the last ``rolling_window`` seconds only.
+
+        Costs time proportional to the requests inside the window, so it
+        is cheap enough to poll from a live dashboard.
+        """
+        if self.window is None:
+            raise ValueError("Tracker was created without rolling_window")
+        return self.window.compute()
+
+    def close(self):
+        """Shut down the tokenizer thread pool."""
+        if self._tokenizer_executor is not None:
+            self._tokenizer_executor.shutdown(wait=True)
+            self._tokenizer_executor = None
 
     def reset(self):
         self.metrics.clear()
+        if self.sketch is not None:
+            self.sketch = SketchBatchStats(
+                self.sketch_accuracy, slo_ttft=self.slo_ttft, slo_itl=self.slo_itl
+            )
+        if self.window is not None:
+            self.window.reset()
+        if self.loop_probe is not None:
+            self.loop_probe.clear()
+        self.chunk_times.clear()
         self._start_time = None
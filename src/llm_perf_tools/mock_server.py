@@ -0,0 +1,364 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from typing import Self
+
+Distribution = Literal["constant", "uniform", "exponential", "lognormal"]
+
+
+class LatencyProfile(BaseModel):
+    """Timing behaviour of :class:`MockServer`.
+
+    ``ttft`` and ``itl`` are mean delays in seconds, drawn per request and
+    per token from their distribution. ``jitter`` sets the spread: ``+/-
+    jitter`` relative for ``uniform`` and the log-space sigma for
+    ``lognormal``; ``exponential`` is fully determined by its mean.
+
+    Load dependence follows a simple knee model: while more than
+    ``capacity`` requests are in flight, every delay is multiplied by
+    ``1 + slowdown * (in_flight - capacity)``.
+    """
+
+    ttft: float = 0.05
+    itl: float = 0.01
+    ttft_distribution: Distribution = "constant"
+    itl_distribution: Distribution = "constant"
+    jitter: float = 0.0
+    output_tokens: int = 32
+    failure_rate: float = 0.0
+    capacity: int = 1
+    slowdown: float = 0.0
+    seed: int | None = None
+
+
+class MockServer:
+    """Minimal OpenAI-compatible chat completions server for testing.
+
+    Serves ``POST /v1/chat/completions`` (streaming SSE or a plain JSON
+    response) and ``GET /v1/models`` with timings from a
+    :class:`LatencyProfile`, using nothing but asyncio. Streams follow the
+    OpenAI chunk format, including the final usage chunk when requested
+    with ``stream_options={"include_usage": True}``. Failed requests get an
+    HTTP 500, so create the client with ``max_retries=0`` to see them.
+
+    Run it in-process as an async context manager, or in its own process
+    with :func:`serve_in_subprocess` so that the server does not compete
+    with the load generator for the event loop.
+
+    Args:
+        profile: Latency profile; defaults to ``LatencyProfile()``
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+
+    Example:
+        .. code-block:: python
+
+            async with MockServer(LatencyProfile(ttft=0.1, itl=0.02)) as server:
+                client = AsyncOpenAI(base_url=server.base_url, api_key="mock")
+                tracker = InferenceTracker(client, tokenizer=len)
+                stats = await tracker.run_batch(prompts, "mock", concurrency=16)
+    """
+
+    def __init__(
+        self,
+        profile: LatencyProfile | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.profile = profile or LatencyProfile()
+        self.host = host
+        self.port = port
+        self.in_flight = 0
+        self.requests_served = 0
+        self._rng = random.Random(self.profile.seed)
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def __aenter__(self) -> "Self":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    def _sample(self, mean: float, distribution: Distribution) -> float:
+        jitter = self.profile.jitter
+        if mean <= 0:
+            return 0.0
+        if distribution == "uniform":
+            value = mean * self._rng.uniform(1 - jitter, 1 + jitter)
+        elif distribution == "exponential":
+            value = self._rng.expovariate(1 / mean)
+        elif distribution == "lognormal":
+            # Shift mu so the mean stays ``mean`` for any sigma.
+            value = mean * self._rng.lognormvariate(-(jitter**2) / 2, jitter)
+        else:
+            value = mean
+        over = self.in_flight - self.profile.capacity
+        if over > 0:
+            value *= 1 + self.profile.slowdown * over
+        return max(value, 0.0)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                await self._dispatch(method, path.split("?")[0], body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        if method == "GET" and path.rstrip("/") == "/v1/models":
+            models = {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+            await _send_json(writer, 200, models)
+        elif method == "POST" and path.rstrip("/") == "/v1/chat/completions":
+            self.in_flight += 1
+            try:
+                await self._chat_completion(json.loads(body or b"{}"), writer)
+            finally:
+                self.in_flight -= 1
+                self.requests_served += 1
+        else:
+            error = {"error": {"message": f"No route for {method} {path}"}}
+            await _send_json(writer, 404, error)
+
+    async def _chat_completion(
+        self, request: dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        profile = self.profile
+        if self._rng.random() < profile.failure_rate:
+            await asyncio.sleep(self._sample(profile.ttft, profile.ttft_distribution))
+            error = {"error": {"message": "Injected failure", "type": "server_error"}}
+            await _send_json(writer, 500, error)
+            return
+
+        model = request.get("model", "mock")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        prompt_tokens = sum(
+            len(str(message.get("content", "")).split())
+            for message in request.get("messages", [])
+        )
+        completion_tokens = request.get("max_tokens") or profile.output_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        if not request.get("stream"):
+            delay = self._sample(profile.ttft, profile.ttft_distribution)
+            for _ in range(completion_tokens - 1):
+                delay += self._sample(profile.itl, profile.itl_distribution)
+            await asyncio.sleep(delay)
+            message = {"role": "assistant", "content": " tok" * completion_tokens}
+            response = {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "message": message, "finish_reason": "length"}
+                ],
+                "usage": usage,
+            }
+            await _send_json(writer, 200, response)
+            return
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> bytes:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return _sse(data)
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        _write_chunk(writer, chunk({"role": "assistant", "content": ""}))
+        await writer.drain()
+
+        await asyncio.sleep(self._sample(profile.ttft, profile.ttft_distribution))
+        for index in range(completion_tokens):
+            if index:
+                await asyncio.sleep(self._sample(profile.itl, profile.itl_distribution))
+            _write_chunk(writer, chunk({"content": " tok"}))
+            await writer.drain()
+
+        _write_chunk(writer, chunk({}, finish_reason="length"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            usage_chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            }
+            _write_chunk(writer, _sse(usage_chunk))
+        _write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def _sse(data: dict[str, Any]) -> bytes:
+    return b"data: " + json.dumps(data, separators=(",", ":")).encode() + b"\n\n"
+
+
+def _write_chunk(writer: asyncio.StreamWriter, payload: bytes) -> None:
+    writer.write(b"%x\r\n%s\r\n" % (len(payload), payload))
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: int, data: Any) -> None:
+    reason = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}[status]
+    body = json.dumps(data).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+
+
+@contextmanager
+def serve_in_subprocess(
+    profile: LatencyProfile | None = None, host: str = "127.0.0.1", port: int = 0
+) -> Iterator[str]:
+    """Run a :class:`MockServer` in a child process.
+
+    Yields the server's base URL once it accepts connections and stops the
+    process on exit.
+
+    Example:
+        >>> with serve_in_subprocess(LatencyProfile(ttft=0.01)) as base_url:
+        ...     base_url.startswith("http://127.0.0.1:")
+        True
+    """
+    profile = profile or LatencyProfile()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "llm_perf_tools.mock_server",
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--profile",
+            profile.model_dump_json(),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("Mock server failed to start")
+        yield line.strip()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        process.stdout.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve mock OpenAI-compatible streaming chat completions."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--profile", help="LatencyProfile as JSON")
+    for name in LatencyProfile.model_fields:
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name)
+    args = parser.parse_args(argv)
+
+    values = json.loads(args.profile) if args.profile else {}
+    values.update(
+        {
+            name: getattr(args, name)
+            for name in LatencyProfile.model_fields
+            if getattr(args, name) is not None
+        }
+    )
+    profile = LatencyProfile.model_validate(values)
+
+    async def serve() -> None:
+        server = MockServer(profile, args.host, args.port)
+        await server.start()
+        # The first line of output is the base URL, read by
+        # serve_in_subprocess.
+        print(server.base_url, flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import threading
+import time
+import warnings
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from .samples import SampleBuffer, SampleWriter, _BackgroundFlusher
+
+
+class DeviceProvider(ABC):
+    """Source of device samples for :func:`monitor_devices`.
+
+    A provider describes one sample as a structured numpy ``dtype`` and
+    the pydantic ``record`` it is read back as, and returns one row per
+    device from :meth:`collect`. Everything else, i.e. the fixed-rate
+    scheduler, the ring buffer and the CSV or binary output, is shared by
+    all providers.
+
+    Subclasses set :attr:`dtype` and :attr:`record`, implement
+    :meth:`collect`, and override :meth:`open` and :meth:`close` if they
+    hold resources.
+    """
+
+    dtype: np.dtype
+    record: type[BaseModel]
+    # Errors from collect() that end sampling quietly, e.g. a GPU lost
+    # mid-run, instead of being raised from the sampler thread.
+    errors: tuple[type[BaseException], ...] = (OSError,)
+
+    def open(self) -> None:
+        """Acquire resources before the first sample."""
+
+    @abstractmethod
+    def collect(self, timestamp: float) -> list[tuple]:
+        """Rows in ``dtype`` field order, all stamped with ``timestamp``."""
+
+    def close(self) -> None:
+        """Release resources after the last sample."""
+
+
+def _run_fixed_rate(
+    sample: Callable[[float], None],
+    interval: float,
+    stop_event: threading.Event,
+    clock: Callable[[], float] = time.perf_counter,
+) -> int:
+    """Call ``sample(tick_time)`` every ``interval`` seconds until stopped.
+
+    Ticks are scheduled from the start time rather than from the end of
+    the previous sample, so the period does not drift by the time a sample
+    takes. Ticks that are already over when a slow sample returns are
+    skipped rather than run back to back.
+
+    Returns:
+        Number of skipped ticks
+    """
+    start = clock()
+    tick = 0
+    missed = 0
+    while True:
+        sample(clock())
+        elapsed = clock() - start
+        next_tick = int(elapsed // interval) + 1
+        missed += max(0, next_tick - tick - 1)
+        tick = next_tick
+        if stop_event.wait(max(0.0, start + tick * interval - clock())):
+            return missed
+
+
+@contextmanager
+def monitor_devices(
+    provider: DeviceProvider,
+    output_path: str | Path,
+    interval: float = 0.1,
+    capacity: int = 65536,
+    flush_interval: float = 1.0,
+) -> Iterator[SampleBuffer]:
+    """Sample a provider in a background thread while the block runs.
+
+    A single thread calls ``provider.collect`` on a fixed-rate schedule
+    with timestamps from ``time.perf_counter``, the tracker's clock.
+    Samples go into a fixed-size ring buffer and a second thread appends
+    them to ``output_path`` every ``flush_interval`` seconds, so memory
+    stays bounded on long runs and a crash keeps everything flushed so
+    far. A ``.bin`` suffix selects a compact binary format (see
+    :func:`~llm_perf_tools.samples.read_samples`), anything else CSV.
+
+    Args:
+        provider: Device backend, e.g.
+            :class:`~llm_perf_tools.providers.SimulatedGPUProvider`
+        output_path: File for the collected samples
+        interval: Seconds between samples
+        capacity: Samples kept in memory, across all devices
+        flush_interval: Seconds between writes to ``output_path``
+
+    Yields:
+        :class:`~llm_perf_tools.samples.SampleBuffer` of
+        ``provider.record``. ``len()`` counts every sample taken,
+        :meth:`~llm_perf_tools.samples.SampleBuffer.recent` returns the
+        latest ones still held in memory. Once the block exits, ``missed``
+        holds the number of skipped ticks; a non-zero count also raises a
+        ``RuntimeWarning``.
+
+    Example:
+        >>> import tempfile
+        >>> from llm_perf_tools.providers import SimulatedGPUProvider
+        >>> path = Path(tempfile.mkdtemp()) / "gpu.csv"
+        >>> with monitor_devices(SimulatedGPUProvider(2), path, 0.01) as samples:
+        ...     time.sleep(0.05)
+        >>> len(samples) >= 2
+        True
+    """
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    provider.open()
+
+    metrics = SampleBuffer(provider.dtype, provider.record, capacity)
+    flusher = _BackgroundFlusher(
+        metrics, SampleWriter(output_path, provider.dtype), flush_interval
+    )
+    stop_event = threading.Event()
+
+    def _sample(timestamp: float) -> None:
+        metrics.append(provider.collect(timestamp))
+
+    def _monitor_loop():
+        try:
+            metrics.missed = _run_fixed_rate(_sample, interval, stop_event)
+        except provider.errors:
+            pass
+
+    thread = threading.Thread(target=_monitor_loop, daemon=True)
+    thread.start()
+    flusher.start()
+
+    try:
+        yield metrics
+    finally:
+        stop_event.set()
+        thread.join(timeout=1.0)
+        try:
+            flusher.stop()
+        finally:
+            provider.close()
+        if metrics.missed:
+            warnings.warn(
+                f"{metrics.missed} sampling ticks were skipped because "
+                f"collecting a sample took longer than interval={interval}s",
+                RuntimeWarning,
+                stacklevel=3,
+            )
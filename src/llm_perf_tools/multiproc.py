@@ -0,0 +1,243 @@
+import asyncio
+import itertools
+import multiprocessing
+import time
+import traceback
+from collections.abc import Callable, Iterable, Sequence
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from .inference import InferenceTracker, compute_batch_metrics
+from .store import MetricsStore
+from .types import BatchInferenceStats
+
+# Absolute perf_counter timestamps; every other column is a duration or count.
+_TIME_COLUMNS = ("request_start", "first_token_time", "request_end")
+
+
+def _clock_offset() -> float:
+    # perf_counter has an arbitrary per-process origin on some platforms, so
+    # each process reports it against the shared wall clock.
+    return time.time() - time.perf_counter()
+
+
+def _worker_prompts(
+    prompts: Sequence[Any] | Callable[[], Iterable[Any]], index: int, processes: int
+) -> Iterable[Any]:
+    if callable(prompts):
+        return itertools.islice(prompts(), index, None, processes)
+    # Sequences were already split by the parent.
+    return prompts
+
+
+def _worker_main(
+    conn: Connection,
+    start_event: Any,
+    client_factory: Callable[[], Any],
+    prompts: Sequence[Any] | Callable[[], Iterable[Any]],
+    index: int,
+    processes: int,
+    model: str,
+    concurrency: int,
+    rate: float | None,
+    seed: int | None,
+    tracker_kwargs: dict[str, Any],
+    flush_interval: float,
+    kwargs: dict[str, Any],
+) -> None:
+    try:
+        tracker = InferenceTracker(client_factory(), **tracker_kwargs)
+
+        def flush() -> None:
+            if tracker.metrics:
+                conn.send(("metrics", tracker.metrics.columns()))
+                tracker.metrics.clear()
+
+        async def run() -> None:
+            async def flusher() -> None:
+                while True:
+                    await asyncio.sleep(flush_interval)
+                    flush()
+
+            flush_task = asyncio.create_task(flusher())
+            try:
+                source = _worker_prompts(prompts, index, processes)
+                if rate is None:
+                    await tracker.run_batch(source, model, concurrency, **kwargs)
+                else:
+                    await tracker.run_open_loop(
+                        source,
+                        model,
+                        rate=rate / processes,
+                        seed=None if seed is None else seed + index,
+                        **kwargs,
+                    )
+            finally:
+                flush_task.cancel()
+
+        conn.send(("ready", _clock_offset()))
+        start_event.wait()
+        try:
+            asyncio.run(run())
+        finally:
+            tracker.close()
+        flush()
+        conn.send(("done", None))
+    except BaseException:
+        # Report the failure to the parent, then let the worker exit with a
+        # non-zero code.
+        conn.send(("error", traceback.format_exc()))
+        raise
+    finally:
+        conn.close()
+
+
+def run_multiprocess(
+    client_factory: Callable[[], Any],
+    prompts: Sequence[Any] | Callable[[], Iterable[Any]],
+    model: str,
+    processes: int = 2,
+    concurrency: int = 8,
+    rate: float | None = None,
+    seed: int | None = None,
+    tracker_kwargs: dict[str, Any] | None = None,
+    flush_interval: float = 1.0,
+    metrics: MetricsStore | None = None,
+    start_method: str = "spawn",
+    **kwargs,
+) -> BatchInferenceStats:
+    """Generate load from several processes and merge their metrics.
+
+    A single event loop saturates on SSE parsing and chunk objects long
+    before a large serving cluster does. This driver starts ``processes``
+    workers, each with its own :class:`InferenceTracker` and event loop,
+    releases them at the same moment and merges everything they record into
+    one :class:`BatchInferenceStats`.
+
+    Workers stream their raw metrics back every ``flush_interval`` seconds
+    as numpy column arrays over a pipe, so neither side keeps per-request
+    objects around. Timestamps are moved onto the parent's
+    ``time.perf_counter`` timeline through each process's wall-clock
+    offset, so ``overall_tps`` and the latency percentiles are computed as
+    if a single client had sent every request.
+
+    Without ``rate`` every worker runs :meth:`InferenceTracker.run_batch`
+    with ``concurrency`` requests in flight, i.e. ``processes *
+    concurrency`` in total. With ``rate`` each worker runs
+    :meth:`InferenceTracker.run_open_loop` at ``rate / processes``; for
+    Poisson arrivals the combined schedule is again Poisson at ``rate``.
+
+    Everything handed to the workers must be picklable, so pass module-level
+    functions rather than lambdas.
+
+    Args:
+        client_factory: Called in each worker to build its OpenAI client
+        prompts: A sequence, or a callable returning a fresh iterable such
+            as ``functools.partial(load_requests, "trace.jsonl")`` that each
+            worker reads lazily; either way the prompts are split
+            round-robin, so every prompt is sent once
+        model: Model name passed to the API
+        processes: Number of worker processes
+        concurrency: Requests in flight per worker in closed-loop mode
+        rate: Total target requests per second for open-loop mode
+        seed: Base seed for the Poisson schedules; worker ``i`` uses
+            ``seed + i``
+        tracker_kwargs: Extra :class:`InferenceTracker` arguments for every
+            worker, e.g. ``{"prefer_server_usage": True}``
+        flush_interval: Seconds between metric uploads from each worker
+        metrics: Optional store that receives every request's metrics on
+            the shared timeline
+        start_method: ``multiprocessing`` start method
+        **kwargs: Parameters sent with every request
+
+    Returns:
+        BatchInferenceStats over the requests of all workers
+    """
+    if processes < 1:
+        raise ValueError("processes must be at least 1")
+    tracker_kwargs = dict(tracker_kwargs or {})
+    if tracker_kwargs.get("sketch_accuracy") is not None:
+        raise ValueError("Workers stream raw metrics; sketch_accuracy is unsupported")
+    store = metrics if metrics is not None else MetricsStore()
+
+    context = multiprocessing.get_context(start_method)
+    start_event = context.Event()
+    connections: list[Connection] = []
+    workers = []
+    for index in range(processes):
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        worker = context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                start_event,
+                client_factory,
+                prompts if callable(prompts) else prompts[index::processes],
+                index,
+                processes,
+                model,
+                concurrency,
+                rate,
+                seed,
+                tracker_kwargs,
+                flush_interval,
+                kwargs,
+            ),
+            daemon=True,
+        )
+        worker.start()
+        child_conn.close()
+        connections.append(parent_conn)
+        workers.append(worker)
+
+    waiting = set(connections)
+    try:
+        # Seconds to add to a worker's perf_counter to land on ours.
+        shifts = {
+            conn: _expect(conn, "ready") - _clock_offset() for conn in connections
+        }
+        start = time.perf_counter()
+        start_event.set()
+        while waiting:
+            for conn in wait(list(waiting)):
+                kind, payload = _receive(conn)
+                if kind == "done":
+                    waiting.discard(conn)
+                    continue
+                for name in _TIME_COLUMNS:
+                    payload[name] += shifts[conn]
+                store.extend_columns(payload)
+        batch_duration = time.perf_counter() - start
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for conn in connections:
+            conn.close()
+
+    if not store:
+        return BatchInferenceStats()
+    return compute_batch_metrics(
+        store,
+        batch_duration,
+        tracker_kwargs.get("slo_ttft"),
+        tracker_kwargs.get("slo_itl"),
+    )
+
+
+def _receive(conn: Connection) -> tuple[str, Any]:
+    try:
+        kind, payload = conn.recv()
+    except EOFError:
+        raise RuntimeError("Load generator process exited unexpectedly") from None
+    if kind == "error":
+        raise RuntimeError(f"Load generator process failed:\n{payload}")
+    return kind, payload
+
+
+def _expect(conn: Connection, expected: str) -> Any:
+    kind, payload = _receive(conn)
+    if kind != expected:
+        raise RuntimeError(f"Expected {expected!r} from worker, got {kind!r}")
+    return payload
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class LoopLagProbe:
+    """Measure how late the event loop runs scheduled callbacks.
+
+    While active, a background task sleeps for ``interval`` seconds over and
+    over and records by how much each wake-up overshot. A saturated loop,
+    e.g. one busy parsing SSE chunks for hundreds of streams, wakes the
+    probe late, and every response chunk waiting in the loop is delayed by
+    about as much. :meth:`max_lag` reports the worst lag seen during a
+    request, so an inflated TTFT can be attributed to the client rather
+    than the server.
+
+    The probe runs only while at least one caller holds it (see
+    :meth:`acquire`), and samples older than ``horizon`` seconds are
+    discarded, so memory stays bounded on long runs.
+
+    Args:
+        interval: Seconds between probe wake-ups
+        horizon: Seconds of samples kept for :meth:`max_lag`
+        clock: Time source, ``time.perf_counter`` like the tracker
+
+    Example:
+        >>> async def busy():
+        ...     probe = LoopLagProbe(interval=0.001)
+        ...     probe.acquire()
+        ...     start = time.perf_counter()
+        ...     await asyncio.sleep(0.005)
+        ...     time.sleep(0.05)  # block the loop
+        ...     await asyncio.sleep(0.005)
+        ...     probe.release()
+        ...     return probe.max_lag(start, time.perf_counter())
+        >>> asyncio.run(busy()) >= 0.04
+        True
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        horizon: float = 600.0,
+        clock=time.perf_counter,
+    ):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.horizon = horizon
+        self.clock = clock
+        self.times = array("d")
+        self.lags = array("d")
+        self._users = 0
+        self._task: asyncio.Task | None = None
+
+    def acquire(self) -> None:
+        """Start probing on the running loop unless already active."""
+        self._users += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def release(self) -> None:
+        """Stop probing once the last holder has released the probe."""
+        self._users = max(self._users - 1, 0)
+        if self._users == 0 and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def max_lag(self, start: float, end: float) -> float:
+        """Largest lag among wake-ups between ``start`` and ``end``."""
+        lo = bisect_left(self.times, start)
+        hi = bisect_right(self.times, end)
+        return max(self.lags[lo:hi], default=0.0)
+
+    def clear(self) -> None:
+        del self.times[:]
+        del self.lags[:]
+
+    async def _run(self) -> None:
+        interval = self.interval
+        clock = self.clock
+        expected = clock() + interval
+        while True:
+            await asyncio.sleep(interval)
+            now = clock()
+            self.times.append(now)
+            self.lags.append(max(now - expected, 0.0))
+            expected = now + interval
+            if len(self.times) % 1024 == 0:
+                cutoff = bisect_left(self.times, now - self.horizon)
+                del self.times[:cutoff]
+                del self.lags[:cutoff]
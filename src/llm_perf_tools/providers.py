@@ -0,0 +1,150 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .monitor import DeviceProvider
+from .samples import GPU_SAMPLE_DTYPE, HOST_SAMPLE_DTYPE
+from .types import GPUMetrics, HostMetrics
+
+BYTES_TO_MB = 1024 * 1024
+
+
+class SimulatedGPUProvider(DeviceProvider):
+    """Deterministic GPU samples for tests and machines without a GPU.
+
+    Each GPU's utilization follows a seeded random walk; memory, power and
+    temperature follow from it, and the energy counter integrates the
+    power over the sample timestamps, so energy accounting can be
+    exercised end to end. Apart from the energy counter, the values depend
+    only on ``seed`` and the sample number, not on timing.
+
+    Args:
+        gpu_count: Number of simulated GPUs
+        seed: Seed of the utilization random walk
+        memory_total_mb: Memory of each GPU
+        idle_watts: Power draw at 0% utilization
+        max_watts: Power draw at 100% utilization
+
+    Example:
+        >>> provider = SimulatedGPUProvider(gpu_count=2, seed=1)
+        >>> provider.open()
+        >>> [row[1] for row in provider.collect(0.0)]
+        [0, 1]
+    """
+
+    dtype = GPU_SAMPLE_DTYPE
+    record = GPUMetrics
+
+    def __init__(
+        self,
+        gpu_count: int = 1,
+        seed: int = 0,
+        memory_total_mb: int = 81920,
+        idle_watts: float = 60.0,
+        max_watts: float = 700.0,
+    ):
+        self.gpu_count = gpu_count
+        self.seed = seed
+        self.memory_total_mb = memory_total_mb
+        self.idle_watts = idle_watts
+        self.max_watts = max_watts
+
+    def open(self) -> None:
+        self._rng = np.random.default_rng(self.seed)
+        self._utilization = np.full(self.gpu_count, 50.0)
+        self._energy = np.zeros(self.gpu_count)
+        self._last_timestamp: float | None = None
+
+    def collect(self, timestamp: float) -> list[tuple]:
+        self._utilization = np.clip(
+            self._utilization + self._rng.normal(0, 10, self.gpu_count), 0, 100
+        )
+        power = self.idle_watts + (self.max_watts - self.idle_watts) * (
+            self._utilization / 100
+        )
+        if self._last_timestamp is not None:
+            self._energy += power * (timestamp - self._last_timestamp)
+        self._last_timestamp = timestamp
+
+        rows = []
+        for gpu_id in range(self.gpu_count):
+            utilization = float(self._utilization[gpu_id])
+            used = int(self.memory_total_mb * (0.2 + 0.6 * utilization / 100))
+            rows.append(
+                (
+                    timestamp,
+                    gpu_id,
+                    used,
+                    self.memory_total_mb,
+                    round(used / self.memory_total_mb * 100, 2),
+                    round(utilization),
+                    round(35 + 0.5 * utilization),
+                    float(power[gpu_id]),
+                    float(self._energy[gpu_id]),
+                )
+            )
+        return rows
+
+
+class HostProvider(DeviceProvider):
+    """CPU, memory and network usage of one process, read from ``/proc``.
+
+    Meant for servers running on the CPU, e.g. small models served without
+    a GPU. Linux only; sampling ends quietly when the process exits.
+
+    Args:
+        pid: Process to sample, defaults to the current one
+
+    Example:
+        >>> provider = HostProvider()
+        >>> provider.open()
+        >>> row = provider.collect(0.0)[0]
+        >>> row[1] == os.getpid() and row[3] > 0
+        True
+    """
+
+    dtype = HOST_SAMPLE_DTYPE
+    record = HostMetrics
+
+    def __init__(self, pid: int | None = None):
+        self.pid = os.getpid() if pid is None else pid
+
+    def open(self) -> None:
+        self._proc = Path(f"/proc/{self.pid}")
+        if not self._proc.exists():
+            raise ProcessLookupError(f"No process {self.pid} under /proc")
+        self._ticks_per_second = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._last: tuple[float, float] | None = None
+
+    def _read_stat(self) -> tuple[float, int]:
+        # The command name may contain spaces, so split after its ')'.
+        stat = (self._proc / "stat").read_text()
+        fields = stat[stat.rindex(")") + 2 :].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._ticks_per_second
+        return cpu_seconds, int(fields[21]) * self._page_size
+
+    def _read_network(self) -> tuple[int, int]:
+        received = sent = 0
+        for line in (self._proc / "net" / "dev").read_text().splitlines()[2:]:
+            interface, _, counters = line.partition(":")
+            if interface.strip() == "lo":
+                continue
+            values = counters.split()
+            received += int(values[0])
+            sent += int(values[8])
+        return received, sent
+
+    def collect(self, timestamp: float) -> list[tuple]:
+        cpu_seconds, rss = self._read_stat()
+        received, sent = self._read_network()
+        cpu_percent = float("nan")
+        if self._last is not None:
+            last_timestamp, last_cpu = self._last
+            if timestamp > last_timestamp:
+                cpu_percent = (
+                    (cpu_seconds - last_cpu) / (timestamp - last_timestamp) * 100
+                )
+        self._last = (timestamp, cpu_seconds)
+        return [(timestamp, self.pid, cpu_percent, rss / BYTES_TO_MB, received, sent)]
@@ -0,0 +1,278 @@
+import csv
+import json
+import threading
+import warnings
+from collections.abc import Iterator, Sequence
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Generic, TypeVar
+
+import numpy as np
+from pydantic import BaseModel
+
+from .utils import _nan_to_none
+
+# Columns of a GPU sample, in the order of GPUMetrics.
+GPU_SAMPLE_DTYPE = np.dtype(
+    [
+        ("timestamp", "f8"),
+        ("gpu_id", "i4"),
+        ("memory_used_mb", "i8"),
+        ("memory_total_mb", "i8"),
+        ("memory_utilization_percent", "f8"),
+        ("gpu_utilization_percent", "i4"),
+        ("temperature_celsius", "i4"),
+        ("power_draw_watts", "f8"),
+        ("energy_joules", "f8"),
+    ]
+)
+
+# Columns of a host process sample, in the order of HostMetrics.
+HOST_SAMPLE_DTYPE = np.dtype(
+    [
+        ("timestamp", "f8"),
+        ("pid", "i8"),
+        ("cpu_percent", "f8"),
+        ("rss_mb", "f8"),
+        ("net_rx_bytes", "i8"),
+        ("net_tx_bytes", "i8"),
+    ]
+)
+
+# First bytes of a binary sample file, followed by the dtype as JSON on the
+# same line and then the raw little-endian records.
+BINARY_MAGIC = b"LLMPERF-SAMPLES-1 "
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class SampleBuffer(Generic[T]):
+    """Fixed-size ring buffer of samples stored as numpy records.
+
+    Appending never allocates, so memory stays constant however long a
+    monitor runs; once ``capacity`` samples are held, the oldest are
+    overwritten. A background :class:`SampleWriter` drains new samples to
+    disk with :meth:`read_since`, and :meth:`recent` gives a live view of
+    the latest samples while the monitor runs. The buffer is safe to
+    append to from one thread while others read.
+
+    Args:
+        dtype: Structured numpy dtype of one sample
+        record: Pydantic model built from a sample by :meth:`recent`
+        capacity: Number of samples kept in memory
+
+    Example:
+        >>> from llm_perf_tools.types import GPUMetrics
+        >>> buffer = SampleBuffer(GPU_SAMPLE_DTYPE, GPUMetrics, capacity=2)
+        >>> for t in range(3):
+        ...     buffer.append([(t, 0, 1024, 2048, 50.0, 90, 60, 300.0, 0.0)])
+        >>> len(buffer), [m.timestamp for m in buffer.recent()]
+        (3, [1.0, 2.0])
+    """
+
+    def __init__(self, dtype: np.dtype, record: type[T], capacity: int = 65536):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.dtype = np.dtype(dtype)
+        self.record = record
+        self.capacity = capacity
+        self.total = 0
+        # Sampling ticks skipped because a sample overran the interval,
+        # set by monitor_devices when sampling stops.
+        self.missed = 0
+        self._data = np.zeros(capacity, dtype=self.dtype)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of samples appended so far, including overwritten ones."""
+        return self.total
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.recent())
+
+    def append(self, rows: Sequence[tuple]) -> None:
+        """Append samples given as tuples in dtype field order."""
+        data = self._data
+        capacity = self.capacity
+        with self._lock:
+            total = self.total
+            for row in rows:
+                data[total % capacity] = row
+                total += 1
+            self.total = total
+
+    def _slice(self, start: int, stop: int) -> np.ndarray:
+        begin = start % self.capacity
+        end = begin + stop - start
+        if end <= self.capacity:
+            return self._data[begin:end].copy()
+        return np.concatenate((self._data[begin:], self._data[: end - self.capacity]))
+
+    def array(self, count: int | None = None) -> np.ndarray:
+        """Copy of the last ``count`` retained samples, oldest first."""
+        with self._lock:
+            retained = min(self.total, self.capacity)
+            count = retained if count is None else min(count, retained)
+            return self._slice(self.total - count, self.total)
+
+    def recent(self, count: int | None = None) -> list[T]:
+        """The last ``count`` retained samples as ``record`` models."""
+        return records_to_models(self.array(count), self.record)
+
+    def read_since(self, position: int) -> tuple[np.ndarray, int, int]:
+        """Samples appended since ``position``, a previous :attr:`total`.
+
+        Returns:
+            Tuple of the new samples, the position to read from next time
+            and the number of samples overwritten before they were read
+        """
+        with self._lock:
+            total = self.total
+            start = max(position, total - self.capacity)
+            return self._slice(start, total), total, start - position
+
+
+def records_to_models(records: np.ndarray, record: type[T]) -> list[T]:
+    """Build one ``record`` model per numpy record, NaN becoming None."""
+    names = records.dtype.names
+    return [
+        record(**{name: _nan_to_none(value) for name, value in zip(names, row)})
+        for row in records.tolist()
+    ]
+
+
+class SampleWriter:
+    """Append sample records to a CSV or binary file.
+
+    CSV files have one row per sample under a header of the dtype's field
+    names and load with :func:`~llm_perf_tools.utils.load_gpu_data`.
+    Binary files hold the raw records behind a one-line header and are
+    read back with :func:`read_samples`. Each :meth:`write` is flushed, so
+    a crash loses at most the samples not yet written.
+
+    Args:
+        path: Output file, binary when the suffix is ``.bin``
+        dtype: Structured numpy dtype of the records
+    """
+
+    def __init__(self, path: str | Path, dtype: np.dtype):
+        self.path = Path(path)
+        self.dtype = np.dtype(dtype)
+        self.binary = self.path.suffix == ".bin"
+        self._file: IO | None = None
+        self._csv = None
+
+    def _open(self) -> IO:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The file stays open across writes; it is only closed here if the
+        # header cannot be written.
+        with ExitStack() as stack:
+            if self.binary:
+                f = stack.enter_context(open(self.path, "wb"))
+                descr = json.dumps(self.dtype.newbyteorder("<").descr)
+                f.write(BINARY_MAGIC + descr.encode() + b"\n")
+            else:
+                f = stack.enter_context(open(self.path, "w", newline=""))
+                self._csv = csv.writer(f)
+                self._csv.writerow(self.dtype.names)
+            stack.pop_all()
+        return f
+
+    def write(self, records: np.ndarray) -> None:
+        if not len(records):
+            return
+        if self._file is None:
+            self._file = self._open()
+        if self.binary:
+            self._file.write(records.astype(self.dtype.newbyteorder("<")).tobytes())
+        else:
+            self._csv.writerows(records.tolist())
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_samples(path: str | Path) -> np.ndarray:
+    """Load a binary sample file written by :class:`SampleWriter`.
+
+    Returns:
+        Structured numpy array with one record per sample
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        if not header.startswith(BINARY_MAGIC):
+            raise ValueError(f"{path} is not a binary sample file")
+        descr = json.loads(header[len(BINARY_MAGIC) :])
+        dtype = np.dtype([tuple(field) for field in descr])
+        data = f.read()
+    # A record cut off by a crash mid-write is dropped.
+    whole = len(data) // dtype.itemsize * dtype.itemsize
+    return np.frombuffer(data[:whole], dtype=dtype)
+
+
+def load_samples(path: str | Path, record: type[T]) -> list[T]:
+    """Load a CSV or binary sample file as ``record`` models.
+
+    Args:
+        path: File written by :func:`~llm_perf_tools.monitor.monitor_devices`
+        record: Model of one sample, e.g.
+            :class:`~llm_perf_tools.types.HostMetrics`
+
+    Returns:
+        One model per sample, with NaN and empty values read as None
+    """
+    path = Path(path)
+    if path.suffix == ".bin":
+        return records_to_models(read_samples(path), record)
+    with open(path, newline="") as f:
+        return [
+            record(**{k: None if v in ("", "nan") else v for k, v in row.items()})
+            for row in csv.DictReader(f)
+        ]
+
+
+class _BackgroundFlusher:
+    """Drain a :class:`SampleBuffer` into a :class:`SampleWriter` periodically."""
+
+    def __init__(
+        self, buffer: SampleBuffer, writer: SampleWriter, flush_interval: float
+    ):
+        self.buffer = buffer
+        self.writer = writer
+        self.flush_interval = flush_interval
+        self.position = 0
+        self.dropped = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def flush(self) -> None:
+        records, self.position, dropped = self.buffer.read_since(self.position)
+        self.dropped += dropped
+        self.writer.write(records)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread, write the remaining samples and close the file."""
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            self.writer.close()
+        if self.dropped:
+            warnings.warn(
+                f"{self.dropped} samples were overwritten before they were "
+                f"written to {self.writer.path}; increase capacity or lower "
+                "flush_interval",
+                RuntimeWarning,
+                stacklevel=3,
+            )
@@ -0,0 +1,207 @@
+import argparse
+import json
+import socket
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .sketch import DEFAULT_RELATIVE_ACCURACY, SketchBatchStats
+from .stats import BATCH_COLUMNS, OPTIONAL_BATCH_COLUMNS, batch_stats_from_columns
+from .types import BatchInferenceStats
+from .utils import _nan_to_none
+
+SHARD_TYPE = "metrics_shard"
+SHARD_VERSION = 1
+
+# Absolute perf_counter timestamps, stored as wall-clock epoch seconds.
+_TIME_COLUMNS = ("request_start", "first_token_time", "request_end")
+
+
+def save_shard(
+    tracker,
+    filename: str | Path,
+    node: str | None = None,
+    include_raw: bool = True,
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+) -> str:
+    """Write a tracker's results as a mergeable shard.
+
+    A shard is a JSON file holding a
+    :class:`~llm_perf_tools.sketch.SketchBatchStats` summary and,
+    optionally, the raw per-request columns. Every timestamp is converted
+    from the tracker's ``time.perf_counter`` to wall-clock epoch seconds
+    when saving, so shards written on different hosts share one timeline
+    (up to the hosts' clock synchronization) and can be combined with
+    :func:`merge_shards`.
+
+    Args:
+        tracker: InferenceTracker with collected metrics
+        filename: Output path
+        node: Name of the load generator, defaults to the hostname
+        include_raw: Also store raw columns, needed for exact merges;
+            ignored for trackers running in sketch mode
+        relative_accuracy: Sketch accuracy used when summarizing raw
+            metrics
+
+    Returns:
+        Path to the saved shard
+    """
+    # Offset from this process's perf_counter to the wall clock.
+    offset = time.time() - time.perf_counter()
+    end_time = time.perf_counter()
+    start_time = tracker._start_time if tracker._start_time is not None else end_time
+
+    columns = None
+    if tracker.sketch is not None:
+        sketch = SketchBatchStats.from_dict(tracker.sketch.to_dict())
+    else:
+        sketch = SketchBatchStats(
+            relative_accuracy, slo_ttft=tracker.slo_ttft, slo_itl=tracker.slo_itl
+        )
+        columns = {
+            name: tracker.metrics.column(name)
+            for name in BATCH_COLUMNS + OPTIONAL_BATCH_COLUMNS
+        }
+        sketch.add_columns(columns)
+    sketch.shift(offset)
+
+    data: dict[str, Any] = {
+        "type": SHARD_TYPE,
+        "version": SHARD_VERSION,
+        "node": node or socket.gethostname(),
+        "timestamp": datetime.now().isoformat(),
+        "start_time": start_time + offset,
+        "end_time": end_time + offset,
+        "sketch": sketch.to_dict(),
+    }
+    if include_raw and columns is not None:
+        data["columns"] = {
+            name: _to_json_list(column + offset if name in _TIME_COLUMNS else column)
+            for name, column in columns.items()
+        }
+
+    path = Path(filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def load_shard(path: str | Path) -> dict[str, Any]:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Shard not found: {path}")
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("type") != SHARD_TYPE:
+        raise ValueError(f"{path} is not a metrics shard")
+    if data.get("version", 0) > SHARD_VERSION:
+        raise ValueError(f"{path} uses unsupported shard version {data['version']}")
+    return data
+
+
+def merge_shards(
+    shards: Iterable[str | Path | dict[str, Any]], exact: bool = False
+) -> BatchInferenceStats:
+    """Combine shards from several load generators into one result.
+
+    By default only the shards' sketches are merged, so the cost depends on
+    the number of shards and sketch buckets, not on how many requests were
+    recorded. Percentiles are then within the sketches' relative accuracy;
+    counts, totals, averages, extremes and goodput are exact. With
+    ``exact=True`` the raw columns are concatenated instead and every
+    statistic is exact, which requires shards saved with raw columns.
+
+    The global batch duration runs from the earliest shard start to the
+    latest shard end.
+
+    Args:
+        shards: Shard paths or already loaded shard dicts
+        exact: Recompute from raw columns instead of merging sketches
+
+    Returns:
+        BatchInferenceStats over the requests of all shards
+    """
+    loaded = [
+        shard if isinstance(shard, dict) else load_shard(shard) for shard in shards
+    ]
+    if not loaded:
+        return BatchInferenceStats()
+    batch_duration = max(s["end_time"] for s in loaded) - min(
+        s["start_time"] for s in loaded
+    )
+
+    sketches = [SketchBatchStats.from_dict(s["sketch"]) for s in loaded]
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+
+    if not exact:
+        return merged.to_batch_stats(batch_duration)
+
+    return batch_stats_from_columns(
+        merge_shard_columns(loaded), batch_duration, merged.slo_ttft, merged.slo_itl
+    )
+
+
+def merge_shard_columns(
+    shards: Iterable[str | Path | dict[str, Any]],
+) -> dict[str, np.ndarray]:
+    """Concatenate the raw columns of several shards into one timeline.
+
+    Times are wall-clock epoch seconds with NaN for missing values, and
+    rows are ordered by ``request_start`` across all shards, ready for
+    plotting or :func:`~llm_perf_tools.stats.batch_stats_from_columns`.
+    Only the optional columns present in every shard are returned.
+    """
+    loaded = [
+        shard if isinstance(shard, dict) else load_shard(shard) for shard in shards
+    ]
+    missing = [s["node"] for s in loaded if "columns" not in s]
+    if missing:
+        raise ValueError(f"Shards without raw columns: {', '.join(missing)}")
+    columns = {
+        name: np.concatenate(
+            [np.asarray(s["columns"][name], dtype=np.float64) for s in loaded]
+        )
+        for name in BATCH_COLUMNS + OPTIONAL_BATCH_COLUMNS
+        if all(name in s["columns"] for s in loaded)
+    }
+    for name in ("input_tokens", "output_tokens"):
+        columns[name] = columns[name].astype(np.int64)
+    order = np.argsort(columns["request_start"], kind="stable")
+    return {name: column[order] for name, column in columns.items()}
+
+
+def _to_json_list(column: np.ndarray) -> list[Any]:
+    # JSON has no NaN; missing timestamps are written as null.
+    if column.dtype.kind == "f":
+        return [_nan_to_none(value) for value in column.tolist()]
+    return column.tolist()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Merge metrics shards from several load generators."
+    )
+    parser.add_argument("shards", nargs="+", help="Shard JSON files")
+    parser.add_argument(
+        "--exact", action="store_true", help="Recompute from raw columns"
+    )
+    parser.add_argument("-o", "--output", help="Write the merged stats here")
+    args = parser.parse_args(argv)
+
+    stats = merge_shards(args.shards, exact=args.exact)
+    text = json.dumps(stats.model_dump(), indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
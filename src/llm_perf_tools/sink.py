@@ -0,0 +1,209 @@
+import json
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .store import COLUMN_DTYPES, MetricsStore
+from .types import BatchInferenceStats
+
+if TYPE_CHECKING:
+    from typing import Self
+
+SINK_TYPE = "result_sink_stats"
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _parquet_schema():
+    # Fixed rather than inferred from the first buffer, where a column such
+    # as usage_source may be all None and would get the null type.
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            (name, pa.string() if dtype == object else pa.from_numpy_dtype(dtype))
+            for name, dtype in COLUMN_DTYPES.items()
+        ]
+    )
+
+
+class ResultSink:
+    """Stream completed requests to disk while a run is in progress.
+
+    Each request handed to :meth:`write` becomes one JSON line in ``path``.
+    Lines are buffered and appended every ``buffer_size`` requests, so a
+    crashed run keeps everything but the last partial buffer and a large
+    run is never serialized in one go. Pass the sink to
+    :class:`~llm_perf_tools.InferenceTracker` as ``result_sink`` to have
+    every tracked request written as it finishes.
+
+    With ``parquet`` enabled, the same rows are also written to a Parquet
+    file next to ``path``, one row group per buffer (requires
+    ``pyarrow``). Parquet files are only readable once the sink is
+    closed, so JSONL remains the crash-safe copy.
+
+    Batch stats go to a small ``<stem>.stats.json`` sidecar, rewritten
+    atomically by :meth:`write_stats` after every tracker run.
+
+    A sink holds the results of one session: existing output files are
+    replaced when it is created, so the JSONL, Parquet and stats files
+    always describe the same requests.
+
+    Args:
+        path: JSONL output file, replaced if it exists
+        buffer_size: Requests buffered between writes
+        parquet: Also write ``<stem>.parquet``
+
+    Example:
+        >>> import tempfile
+        >>> path = Path(tempfile.mkdtemp()) / "results.jsonl"
+        >>> with ResultSink(path) as sink:
+        ...     sink.write({"request_start": 1.0, "request_end": 2.5})
+        >>> load_results(path)[0].request_end
+        2.5
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        buffer_size: int = 256,
+        parquet: bool = False,
+    ):
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be positive")
+        if parquet and not _parquet_available():
+            raise ImportError("Parquet output requires the 'pyarrow' package")
+        self.path = Path(path)
+        self.stats_path = self.path.with_name(self.path.stem + ".stats.json")
+        self.parquet_path = self.path.with_suffix(".parquet") if parquet else None
+        self.buffer_size = buffer_size
+        self.rows_written = 0
+        self._rows: list[dict[str, Any]] = []
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+        self._parquet_writer = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Held open for the sink's lifetime and closed by close().
+        self._file = open(self.path, "w")  # noqa: SIM115
+        if self.parquet_path is not None:
+            self.parquet_path.unlink(missing_ok=True)
+        self.stats_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write(self, values: dict[str, Any]) -> None:
+        """Queue one request's metrics, keyed by ``RequestMetrics`` field."""
+        self._rows.append(values)
+        if len(self._rows) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered requests to the output files."""
+        rows = self._rows
+        if not rows:
+            return
+        self._rows = []
+        encode = self._encode
+        self._file.write("".join([encode(row) + "\n" for row in rows]))
+        self._file.flush()
+        if self.parquet_path is not None:
+            self._write_parquet(rows)
+        self.rows_written += len(rows)
+
+    def _write_parquet(self, rows: list[dict[str, Any]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        store = MetricsStore(capacity=len(rows))
+        for row in rows:
+            store.append(**row)
+        columns = {}
+        for name, column in store.columns().items():
+            if column.dtype == object:
+                columns[name] = pa.array(column.tolist(), type=pa.string())
+            else:
+                # NaN marks a missing optional value in the store.
+                mask = np.isnan(column) if column.dtype.kind == "f" else None
+                columns[name] = pa.array(column, mask=mask)
+        table = pa.table(columns, schema=_parquet_schema())
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def write_stats(self, stats: BatchInferenceStats) -> None:
+        """Replace the stats sidecar with ``stats``."""
+        data = {
+            "type": SINK_TYPE,
+            "results": self.path.name,
+            "rows": self.rows_written + len(self._rows),
+            "batch_stats": stats.model_dump(),
+        }
+        temporary = self.stats_path.with_name(self.stats_path.name + ".tmp")
+        temporary.write_text(json.dumps(data, indent=2))
+        os.replace(temporary, self.stats_path)
+
+    def close(self) -> None:
+        """Write any buffered requests and close the output files."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def load_results(path: str | Path) -> MetricsStore:
+    """Read requests written by :class:`ResultSink`.
+
+    A last line cut off by a crash is skipped.
+
+    Args:
+        path: JSONL file, or the ``.parquet`` file written next to it
+
+    Returns:
+        :class:`~llm_perf_tools.store.MetricsStore` with one row per request
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        columns = {}
+        for name in table.column_names:
+            if name not in COLUMN_DTYPES:
+                continue
+            values = table.column(name).to_numpy(zero_copy_only=False)
+            if COLUMN_DTYPES[name] != object:
+                values = np.asarray(values, dtype=COLUMN_DTYPES[name])
+            columns[name] = values
+        store = MetricsStore(capacity=max(table.num_rows, 1))
+        store.extend_columns(columns)
+        return store
+
+    store = MetricsStore()
+    with open(path) as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            store.append(**row)
+    return store
@@ -0,0 +1,387 @@
+import math
+from typing import Any
+
+from .stats import BATCH_COLUMNS, OPTIONAL_BATCH_COLUMNS, apply_summary
+from .types import BatchInferenceStats
+from .utils import _nan_to_none
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmically sized buckets (the DDSketch
+    scheme): bucket ``k`` covers ``(gamma**(k-1), gamma**k]`` with
+    ``gamma = (1 + a) / (1 - a)``, so any quantile is reported within a
+    relative error ``a`` of an actual value of that rank. Updates are O(1)
+    and memory only depends on the dynamic range of the data. With the
+    default 1% accuracy, latencies from 1 microsecond to 3 hours fit in
+    about 1,200 buckets. Count, sum, min and max are tracked exactly.
+
+    Non-positive values are counted in a dedicated zero bucket.
+
+    Args:
+        relative_accuracy: Maximum relative error of reported quantiles,
+            between 0 and 1 (default 0.01, i.e. 1%)
+
+    Example:
+        >>> sketch = QuantileSketch(relative_accuracy=0.01)
+        >>> for value in range(1, 101):
+        ...     sketch.add(value / 100)
+        >>> abs(sketch.quantile(0.5) - 0.5) <= 0.5 * 0.01
+        True
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the value at quantile ``q`` (0-1).
+
+        Uses the same rank as :func:`~llm_perf_tools.inference.percentile`,
+        ``int(q * (count - 1))``, so exact and sketched stats line up.
+        """
+        if self.count == 0:
+            return None
+        rank = int(q * (self.count - 1))
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                estimate = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float | None:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class SketchBatchStats:
+    """Constant-memory accumulator for :class:`BatchInferenceStats`.
+
+    Keeps a :class:`QuantileSketch` for TTFT, E2E latency, ITL and TPS plus
+    exact totals, instead of every request's raw values. Requests are
+    classified exactly as in
+    :func:`~llm_perf_tools.inference.compute_batch_metrics`; only the
+    percentiles are approximate, within ``relative_accuracy``. Averages,
+    minima, maxima and token totals are exact. Accumulators built with the
+    same accuracy can be merged, e.g. across processes or hosts.
+
+    Args:
+        relative_accuracy: Relative error bound for reported percentiles
+        slo_ttft: Optional TTFT target in seconds; requests are checked
+            against the targets as they are added, so goodput is exact
+        slo_itl: Optional average ITL target in seconds
+
+    Example:
+        >>> stats = SketchBatchStats(relative_accuracy=0.01)
+        >>> stats.add(1000.0, 1001.0, 1003.0, input_tokens=5, output_tokens=20)
+        >>> stats.to_batch_stats(batch_duration=3.0).total_output_tokens
+        20
+    """
+
+    METRICS = (
+        "ttft",
+        "e2e_latency",
+        "itl",
+        "tps",
+        "queue_wait",
+        "send_lag",
+        "client_overhead",
+        "loop_lag",
+        "connect_time",
+        "prefill_time",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        slo_ttft: float | None = None,
+        slo_itl: float | None = None,
+    ):
+        self.relative_accuracy = relative_accuracy
+        self.slo_ttft = slo_ttft
+        self.slo_itl = slo_itl
+        self.sketches = {
+            name: QuantileSketch(relative_accuracy) for name in self.METRICS
+        }
+        self.total_requests = 0
+        self.successful_requests = 0
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.good_requests = 0
+        self.good_output_tokens = 0
+        # E2E latency of the requests with a measured client overhead
+        self.overhead_e2e_sum = 0.0
+        self.first_start = math.inf
+        self.last_end = -math.inf
+
+    def add(
+        self,
+        request_start: float,
+        first_token_time: float | None,
+        request_end: float | None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        queue_wait: float | None = None,
+        send_lag: float | None = None,
+        client_overhead: float | None = None,
+        loop_lag: float | None = None,
+        connect_time: float | None = None,
+        prefill_time: float | None = None,
+    ) -> None:
+        self.total_requests += 1
+        if queue_wait is not None:
+            self.sketches["queue_wait"].add(queue_wait)
+        if send_lag is not None:
+            self.sketches["send_lag"].add(send_lag)
+        if request_end is None:
+            return
+        if client_overhead is not None:
+            self.sketches["client_overhead"].add(client_overhead)
+            self.overhead_e2e_sum += request_end - request_start
+            if loop_lag is not None:
+                self.sketches["loop_lag"].add(loop_lag)
+        if connect_time is not None:
+            self.sketches["connect_time"].add(connect_time)
+        if prefill_time is not None:
+            self.sketches["prefill_time"].add(prefill_time)
+        self.successful_requests += 1
+        self.total_input_tokens += input_tokens
+        self.total_output_tokens += output_tokens
+        self.first_start = min(self.first_start, request_start)
+        self.last_end = max(self.last_end, request_end)
+
+        sketches = self.sketches
+        sketches["e2e_latency"].add(request_end - request_start)
+        if first_token_time is None:
+            return
+        ttft = first_token_time - request_start
+        sketches["ttft"].add(ttft)
+        itl = None
+        if output_tokens > 1:
+            itl = (request_end - first_token_time) / (output_tokens - 1)
+        if first_token_time and request_end and output_tokens > 1:
+            generation_time = request_end - first_token_time
+            sketches["itl"].add(itl)
+            if generation_time > 0:
+                sketches["tps"].add(output_tokens / generation_time)
+        if (self.slo_ttft is None or ttft <= self.slo_ttft) and (
+            self.slo_itl is None or itl is None or itl <= self.slo_itl
+        ):
+            self.good_requests += 1
+            self.good_output_tokens += output_tokens
+
+    def add_columns(self, columns: dict[str, Any]) -> None:
+        """Add many requests at once from arrays named as in ``BATCH_COLUMNS``.
+
+        NaN marks a missing time, as in
+        :class:`~llm_perf_tools.store.MetricsStore` columns.
+        """
+        names = BATCH_COLUMNS + tuple(n for n in OPTIONAL_BATCH_COLUMNS if n in columns)
+        rows = zip(*(columns[name].tolist() for name in names))
+        for row in rows:
+            start, first_token, end, input_tokens, output_tokens, *extra = map(
+                _nan_to_none, row
+            )
+            self.add(
+                start,
+                first_token,
+                end,
+                input_tokens,
+                output_tokens,
+                **dict(zip(names[len(BATCH_COLUMNS) :], extra)),
+            )
+
+    def merge(self, other: "SketchBatchStats") -> None:
+        if (other.slo_ttft, other.slo_itl) != (self.slo_ttft, self.slo_itl):
+            raise ValueError("Cannot merge stats recorded with different SLOs")
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+        self.total_requests += other.total_requests
+        self.successful_requests += other.successful_requests
+        self.total_input_tokens += other.total_input_tokens
+        self.total_output_tokens += other.total_output_tokens
+        self.good_requests += other.good_requests
+        self.good_output_tokens += other.good_output_tokens
+        self.overhead_e2e_sum += other.overhead_e2e_sum
+        self.first_start = min(self.first_start, other.first_start)
+        self.last_end = max(self.last_end, other.last_end)
+
+    def shift(self, offset: float) -> None:
+        """Move the recorded timeline by ``offset`` seconds."""
+        if self.successful_requests:
+            self.first_start += offset
+            self.last_end += offset
+
+    def to_batch_stats(self, batch_duration: float) -> BatchInferenceStats:
+        if self.total_requests == 0:
+            return BatchInferenceStats()
+
+        successful = self.successful_requests
+        duration = self.last_end - self.first_start if successful else 0.0
+        overall_tps = None
+        if successful and self.total_output_tokens:
+            overall_tps = self.total_output_tokens / duration if duration > 0 else None
+
+        stats = BatchInferenceStats(
+            overall_tps=overall_tps,
+            total_input_tokens=self.total_input_tokens,
+            total_output_tokens=self.total_output_tokens,
+            avg_input_tokens=self.total_input_tokens / successful
+            if successful
+            else None,
+            avg_output_tokens=(
+                self.total_output_tokens / successful if successful else None
+            ),
+            rps=successful / batch_duration if batch_duration > 0 else 0,
+            total_requests=self.total_requests,
+            successful_requests=successful,
+        )
+        if self.slo_ttft is not None or self.slo_itl is not None:
+            stats.slo_ttft = self.slo_ttft
+            stats.slo_itl = self.slo_itl
+            stats.slo_attainment = self.good_requests / self.total_requests
+            stats.goodput_rps = (
+                self.good_requests / batch_duration if batch_duration > 0 else 0
+            )
+            stats.goodput_tps = (
+                self.good_output_tokens / duration if duration > 0 else None
+            )
+        for name, percentiles in (
+            ("ttft", (50, 95, 99)),
+            ("e2e_latency", (50, 95, 99)),
+            ("itl", (50, 95, 99)),
+            ("tps", (50, 5, 1)),
+            ("queue_wait", (50, 99)),
+            ("send_lag", (50, 99)),
+            ("client_overhead", (50, 99)),
+            ("loop_lag", (50, 99)),
+            ("connect_time", (50, 99)),
+            ("prefill_time", (50, 99)),
+        ):
+            sketch = self.sketches[name]
+            if sketch.count == 0:
+                continue
+            apply_summary(
+                stats,
+                name,
+                (
+                    sketch.mean,
+                    sketch.min,
+                    sketch.max,
+                    {p: sketch.quantile(p / 100) for p in percentiles},
+                ),
+            )
+        if self.overhead_e2e_sum > 0:
+            client_time = (
+                self.sketches["client_overhead"].sum + self.sketches["loop_lag"].sum
+            )
+            stats.client_overhead_fraction = client_time / self.overhead_e2e_sum
+        return stats
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "slo_ttft": self.slo_ttft,
+            "slo_itl": self.slo_itl,
+            "sketches": {
+                name: sketch.to_dict() for name, sketch in self.sketches.items()
+            },
+            "total_requests": self.total_requests,
+            "successful_requests": self.successful_requests,
+            "total_input_tokens": self.total_input_tokens,
+            "total_output_tokens": self.total_output_tokens,
+            "good_requests": self.good_requests,
+            "good_output_tokens": self.good_output_tokens,
+            "overhead_e2e_sum": self.overhead_e2e_sum,
+            "first_start": self.first_start if self.successful_requests else None,
+            "last_end": self.last_end if self.successful_requests else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SketchBatchStats":
+        stats = cls(
+            data["relative_accuracy"],
+            slo_ttft=data.get("slo_ttft"),
+            slo_itl=data.get("slo_itl"),
+        )
+        stats.sketches = {
+            name: QuantileSketch(stats.relative_accuracy) for name in cls.METRICS
+        }
+        stats.sketches.update(
+            {
+                name: QuantileSketch.from_dict(sketch)
+                for name, sketch in data["sketches"].items()
+            }
+        )
+        stats.total_requests = data["total_requests"]
+        stats.successful_requests = data["successful_requests"]
+        stats.total_input_tokens = data["total_input_tokens"]
+        stats.total_output_tokens = data["total_output_tokens"]
+        stats.good_requests = data.get("good_requests", 0)
+        stats.good_output_tokens = data.get("good_output_tokens", 0)
+        stats.overhead_e2e_sum = data.get("overhead_e2e_sum", 0.0)
+        if stats.successful_requests:
+            stats.first_start = data["first_start"]
+            stats.last_end = data["last_end"]
+        return stats
@@ -0,0 +1,245 @@
+import numpy as np
+
+from .types import BatchInferenceStats
+
+BATCH_COLUMNS = (
+    "request_start",
+    "first_token_time",
+    "request_end",
+    "input_tokens",
+    "output_tokens",
+)
+# Columns that only some producers fill; absent or all-NaN means unknown.
+OPTIONAL_BATCH_COLUMNS = (
+    "queue_wait",
+    "send_lag",
+    "client_overhead",
+    "loop_lag",
+    "connect_time",
+    "prefill_time",
+)
+
+
+def _select_ranks(values: np.ndarray, ranks: list[int]) -> dict[int, float]:
+    # One full partition at the rank nearest the median, then each further
+    # rank only partitions the shrinking slice beyond the previous one. This
+    # is markedly cheaper than np.partition with several kth at once.
+    # ``values`` is reordered in place rather than copied.
+    last = values.size - 1
+    pivot = min(ranks, key=lambda rank: abs(2 * rank - last))
+    partitioned = values
+    partitioned.partition(pivot)
+    selected = {pivot: float(partitioned[pivot])}
+    upper = pivot + 1
+    for rank in sorted(rank for rank in ranks if rank > pivot):
+        partitioned[upper:].partition(rank - upper)
+        selected[rank] = float(partitioned[rank])
+        upper = rank + 1
+    lower = pivot
+    for rank in sorted((rank for rank in ranks if rank < pivot), reverse=True):
+        partitioned[:lower].partition(rank)
+        selected[rank] = float(partitioned[rank])
+        lower = rank
+    return selected
+
+
+def _summarize(
+    values: np.ndarray, percentiles: tuple[float, ...]
+) -> tuple[float, float, float, dict[float, float]] | None:
+    # The rank formula matches percentile() so results are identical.
+    # Reorders ``values``, which must be a temporary owned by the caller.
+    if values.size == 0:
+        return None
+    last = values.size - 1
+    ranks = {p: int((p / 100) * last) for p in percentiles}
+    selected = _select_ranks(values, sorted(set(ranks.values())))
+    return (
+        float(values.sum() / values.size),
+        float(values.min()),
+        float(values.max()),
+        {p: selected[rank] for p, rank in ranks.items()},
+    )
+
+
+def _sum_successful(values: np.ndarray, failed: np.ndarray | None) -> int:
+    # Failed requests are rare, so subtracting their few values is much
+    # cheaper than copying the whole column through a boolean mask.
+    total = int(values.sum())
+    if failed is not None:
+        total -= int(values[failed].sum())
+    return total
+
+
+def batch_stats_from_columns(
+    columns: dict[str, np.ndarray],
+    batch_duration: float,
+    slo_ttft: float | None = None,
+    slo_itl: float | None = None,
+    throughput_span: float | None = None,
+) -> BatchInferenceStats:
+    """Compute :class:`BatchInferenceStats` from per-request column arrays.
+
+    Vectorized engine behind :func:`compute_batch_metrics`. Each metric is
+    derived with array arithmetic and summarized with a single partition,
+    so the cost is a few linear passes regardless of how many percentiles
+    are reported. Failed requests are left out through NaN and masked
+    reductions, so input columns are not copied through the success mask.
+
+    Args:
+        columns: Mapping with the arrays named in ``BATCH_COLUMNS``; missing
+            times are NaN
+        batch_duration: Total time in seconds for batch processing
+        slo_ttft: Optional TTFT target in seconds for goodput
+        slo_itl: Optional average ITL target in seconds for goodput
+        throughput_span: Seconds that ``overall_tps`` and ``goodput_tps``
+            are measured over; defaults to first request start to last end
+
+    Returns:
+        BatchInferenceStats with percentiles, averages, and totals
+    """
+    request_start = columns["request_start"]
+    total_requests = int(request_start.size)
+    if total_requests == 0:
+        return BatchInferenceStats()
+
+    first_token_time = columns["first_token_time"]
+    request_end = columns["request_end"]
+    input_tokens = columns["input_tokens"]
+    output_tokens = columns["output_tokens"]
+
+    successful = ~np.isnan(request_end)
+    successful_count = int(np.count_nonzero(successful))
+    failed = None
+    if successful_count < total_requests:
+        failed = np.flatnonzero(~successful)
+
+    # Derived over every row; failed requests have a NaN request_end, so
+    # their e2e and generation times are NaN and drop out below.
+    ttft_all = first_token_time - request_start
+    has_first_token = ~np.isnan(ttft_all)
+    if failed is not None:
+        has_first_token &= successful
+    ttft_values = ttft_all if has_first_token.all() else ttft_all[has_first_token]
+    e2e_all = request_end - request_start
+    e2e_values = e2e_all if failed is None else e2e_all[successful]
+
+    decoded = (output_tokens > 1) & (first_token_time != 0) & (request_end != 0)
+    # NaN first-token times fall out here: NaN > 0 and NaN <= 0 are both False.
+    generation_time = request_end - first_token_time
+    decoded &= ~np.isnan(generation_time)
+    if not decoded.all():
+        generation_time = generation_time[decoded]
+        decoded_tokens = output_tokens[decoded]
+    else:
+        decoded_tokens = output_tokens
+    itl_values = generation_time / (decoded_tokens - 1)
+    positive = generation_time > 0
+    if positive.all():
+        tps_values = decoded_tokens / generation_time
+    else:
+        tps_values = decoded_tokens[positive] / generation_time[positive]
+
+    total_input_tokens = _sum_successful(input_tokens, failed)
+    total_output_tokens = _sum_successful(output_tokens, failed)
+    avg_input_tokens = (
+        total_input_tokens / successful_count if successful_count else None
+    )
+    avg_output_tokens = (
+        total_output_tokens / successful_count if successful_count else None
+    )
+
+    overall_tps = None
+    if throughput_span is not None:
+        duration = throughput_span
+        overall_tps = total_output_tokens / duration if duration > 0 else None
+    else:
+        duration = 0.0
+        if successful_count:
+            # fmax skips the NaN ends of failed requests.
+            first_start = request_start.min(
+                where=successful if failed is not None else True, initial=np.inf
+            )
+            duration = float(np.fmax.reduce(request_end) - first_start)
+        if successful_count and total_output_tokens:
+            overall_tps = total_output_tokens / duration if duration > 0 else None
+
+    rps = successful_count / batch_duration if batch_duration > 0 else 0
+
+    stats = BatchInferenceStats(
+        overall_tps=overall_tps,
+        total_input_tokens=total_input_tokens,
+        total_output_tokens=total_output_tokens,
+        avg_input_tokens=avg_input_tokens,
+        avg_output_tokens=avg_output_tokens,
+        rps=rps,
+        total_requests=total_requests,
+        successful_requests=successful_count,
+    )
+    if slo_ttft is not None or slo_itl is not None:
+        # A request is good if it produced a first token within slo_ttft and
+        # decoded at or below slo_itl on average; single-token outputs have
+        # no ITL and only need to meet the TTFT target.
+        good = has_first_token.copy()
+        if slo_ttft is not None:
+            good &= ttft_all <= slo_ttft
+        if slo_itl is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                itl = (request_end - first_token_time) / (output_tokens - 1)
+            good &= (output_tokens <= 1) | (itl <= slo_itl)
+        good_count = int(np.count_nonzero(good))
+        good_tokens = int(output_tokens.sum(where=good))
+        stats.slo_ttft = slo_ttft
+        stats.slo_itl = slo_itl
+        stats.slo_attainment = good_count / total_requests
+        stats.goodput_rps = good_count / batch_duration if batch_duration > 0 else 0
+        stats.goodput_tps = good_tokens / duration if duration > 0 else None
+
+    overhead = columns.get("client_overhead")
+    if overhead is not None:
+        measured = ~np.isnan(overhead)
+        if failed is not None:
+            measured &= successful
+        if measured.any():
+            client_time = overhead.sum(where=measured)
+            loop_lag = columns.get("loop_lag")
+            if loop_lag is not None:
+                client_time += loop_lag.sum(where=measured & ~np.isnan(loop_lag))
+            e2e_total = e2e_all.sum(where=measured)
+            if e2e_total > 0:
+                stats.client_overhead_fraction = float(client_time / e2e_total)
+
+    # Summaries reorder their input, so they come after every use of
+    # e2e_all above.
+    for name, values, percentiles in (
+        ("ttft", ttft_values, (50, 95, 99)),
+        ("e2e_latency", e2e_values, (50, 95, 99)),
+        ("itl", itl_values, (50, 95, 99)),
+        ("tps", tps_values, (50, 5, 1)),
+    ):
+        apply_summary(stats, name, _summarize(values, percentiles))
+
+    # Summarized over every request that reports them, failed ones included.
+    for name in OPTIONAL_BATCH_COLUMNS:
+        values = columns.get(name)
+        if values is not None:
+            values = values[~np.isnan(values)]
+            apply_summary(stats, name, _summarize(values, (50, 99)))
+
+    return stats
+
+
+def apply_summary(
+    stats: BatchInferenceStats,
+    name: str,
+    summary: tuple[float, float, float, dict[float, float]] | None,
+) -> None:
+    # Not every metric reports every aggregate (e.g. no min_queue_wait), so
+    # only fields that exist on the model are set.
+    if summary is None:
+        return
+    avg, low, high, quantiles = summary
+    values = {f"avg_{name}": avg, f"min_{name}": low, f"max_{name}": high}
+    values.update({f"p{p}_{name}": value for p, value in quantiles.items()})
+    for field, value in values.items():
+        if field in BatchInferenceStats.model_fields:
+            setattr(stats, field, value)
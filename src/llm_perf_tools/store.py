@@ -0,0 +1,176 @@
+from collections.abc import Iterable, Iterator
+from types import UnionType
+from typing import Any, Union, get_args, get_origin, overload
+
+import numpy as np
+
+from .types import RequestMetrics
+from .utils import _nan_to_none
+
+DEFAULT_CAPACITY = 1024
+
+
+def _column_dtype(annotation: Any) -> np.dtype:
+    # Optional numbers are stored as float64 with NaN standing in for None;
+    # anything non-numeric (e.g. Literal tags) falls back to an object column.
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1 and args[0] in (int, float):
+            return np.dtype(np.float64)
+        return np.dtype(object)
+    if annotation is int:
+        return np.dtype(np.int64)
+    if annotation is float:
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+COLUMN_DTYPES: dict[str, np.dtype] = {
+    name: _column_dtype(field.annotation)
+    for name, field in RequestMetrics.model_fields.items()
+}
+_DEFAULTS: dict[str, Any] = {
+    name: field.default for name, field in RequestMetrics.model_fields.items()
+}
+_OPTIONAL_INT_FIELDS = frozenset(
+    name
+    for name, field in RequestMetrics.model_fields.items()
+    if int in get_args(field.annotation)
+)
+
+
+class MetricsStore:
+    """Append-only columnar storage for per-request metrics.
+
+    Keeps one NumPy array per :class:`RequestMetrics` field and grows them
+    geometrically, so appending a request costs a handful of scalar writes
+    instead of building and validating a pydantic model. Statistics code
+    reads the columns directly through :meth:`column`, which returns a
+    zero-copy view. Indexing or iterating materializes ``RequestMetrics``
+    objects on demand, so the store can stand in for ``list[RequestMetrics]``.
+
+    Missing optional values are stored as NaN in float columns and read back
+    as None.
+
+    Args:
+        capacity: Initial number of rows to allocate
+
+    Example:
+        >>> store = MetricsStore()
+        >>> store.append(request_start=1.0, request_end=3.0, output_tokens=5)
+        >>> len(store)
+        1
+        >>> store[0].e2e_latency is None
+        True
+        >>> store.column("request_end").tolist()
+        [3.0]
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._size = 0
+        self._columns = {
+            name: np.empty(max(capacity, 1), dtype=dtype)
+            for name, dtype in COLUMN_DTYPES.items()
+        }
+
+    @classmethod
+    def from_records(cls, records: Iterable[RequestMetrics]) -> "MetricsStore":
+        records = list(records)
+        store = cls(capacity=max(len(records), DEFAULT_CAPACITY))
+        store.extend(records)
+        return store
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns["request_start"])
+
+    def append(self, **values: Any) -> None:
+        """Append one request. Fields not given take the model defaults."""
+        if self._size == self.capacity:
+            self._grow(self._size + 1)
+        i = self._size
+        for name, column in self._columns.items():
+            value = values.get(name, _DEFAULTS[name])
+            if value is None and column.dtype.kind == "f":
+                value = np.nan
+            column[i] = value
+        self._size = i + 1
+
+    def extend(self, records: Iterable[RequestMetrics]) -> None:
+        for record in records:
+            self.append(**dict(record))
+
+    def extend_columns(self, columns: dict[str, np.ndarray]) -> None:
+        """Append many rows at once from a mapping of equal-length arrays."""
+        count = len(next(iter(columns.values()))) if columns else 0
+        if count == 0:
+            return
+        if self._size + count > self.capacity:
+            self._grow(self._size + count)
+        end = self._size + count
+        for name, column in self._columns.items():
+            if name in columns:
+                column[self._size : end] = columns[name]
+            else:
+                default = _DEFAULTS[name]
+                if default is None and column.dtype.kind == "f":
+                    default = np.nan
+                column[self._size : end] = default
+        self._size = end
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a read-only, zero-copy view of a column."""
+        view = self._columns[name][: self._size]
+        view.flags.writeable = False
+        return view
+
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: self.column(name) for name in self._columns}
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, self.capacity * 2)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def _record(self, index: int) -> RequestMetrics:
+        values = {}
+        for name, column in self._columns.items():
+            value = column[index].item() if column.dtype.kind != "O" else column[index]
+            value = _nan_to_none(value)
+            if name in _OPTIONAL_INT_FIELDS and value is not None:
+                value = int(value)
+            values[name] = value
+        return RequestMetrics.model_construct(**values)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, index: int) -> RequestMetrics: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RequestMetrics]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("MetricsStore index out of range")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[RequestMetrics]:
+        for i in range(self._size):
+            yield self._record(i)
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __repr__(self) -> str:
+        return f"MetricsStore(size={self._size}, capacity={self.capacity})"
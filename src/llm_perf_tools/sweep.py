@@ -0,0 +1,276 @@
+import itertools
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Any, Literal
+
+from .inference import InferenceTracker
+from .types import BatchInferenceStats, SweepPoint, SweepResult
+
+Prompts = Sequence[Any] | Callable[[], Iterable[Any]]
+
+
+def find_knee(points: Sequence[tuple[float, float]]) -> int | None:
+    """Locate the knee of a throughput-versus-latency curve.
+
+    Both axes are min-max normalized and the knee is the point furthest
+    above the diagonal, i.e. where throughput has nearly peaked while
+    latency has not yet taken off (the Kneedle criterion).
+
+    Args:
+        points: ``(throughput, latency)`` pairs in order of increasing load
+
+    Returns:
+        Index of the knee, or None with fewer than three points
+
+    Example:
+        >>> curve = [(10, 1.0), (20, 1.1), (38, 1.3), (40, 2.5), (41, 6.0)]
+        >>> find_knee(curve)
+        2
+    """
+    if len(points) < 3:
+        return None
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    x_span = (max(xs) - min(xs)) or 1.0
+    y_span = (max(ys) - min(ys)) or 1.0
+    scores = [(x - min(xs)) / x_span - (y - min(ys)) / y_span for x, y in points]
+    return max(range(len(points)), key=scores.__getitem__)
+
+
+def _level_prompts(prompts: Prompts, count: int) -> Iterable[Any]:
+    source = prompts() if callable(prompts) else itertools.cycle(prompts)
+    return itertools.islice(source, count)
+
+
+async def _adaptive_sweep(
+    run_level: Callable[[float], Awaitable[BatchInferenceStats]],
+    levels: Sequence[float] | None,
+    start: float,
+    max_level: float,
+    integer: bool,
+    throughput_metric: str,
+    latency_metric: str,
+    latency_limit: float | None,
+    min_gain: float,
+    bisect_steps: int,
+) -> tuple[list[SweepPoint], float | None]:
+    measured: dict[float, SweepPoint] = {}
+
+    async def measure(level: float) -> SweepPoint:
+        stats = await run_level(level)
+        point = SweepPoint(
+            level=level,
+            throughput=getattr(stats, throughput_metric),
+            latency=getattr(stats, latency_metric),
+            stats=stats,
+        )
+        measured[level] = point
+        return point
+
+    def breaches(point: SweepPoint) -> bool:
+        return (
+            latency_limit is not None
+            and point.latency is not None
+            and point.latency > latency_limit
+        )
+
+    def gained(point: SweepPoint, previous: SweepPoint) -> bool:
+        # The required gain scales with the step size: ``min_gain`` for a
+        # doubling, proportionally less for the smaller bisection steps.
+        step = point.level / previous.level - 1
+        required = (previous.throughput or 0.0) * (1 + min_gain * step)
+        return (point.throughput or 0.0) > required
+
+    schedule: Iterable[float]
+    if levels is not None:
+        schedule = levels
+    else:
+        schedule = itertools.takewhile(
+            lambda level: level <= max_level,
+            (start * 2**i for i in itertools.count()),
+        )
+
+    good: SweepPoint | None = None
+    saturated: SweepPoint | None = None
+    for level in schedule:
+        point = await measure(level)
+        if breaches(point) or (good is not None and not gained(point, good)):
+            saturated = point
+            break
+        good = point
+
+    # Narrow the gap between the last level that still scaled and the first
+    # one that did not, instead of paying for every level in between.
+    if good is not None and saturated is not None:
+        low, high = good, saturated
+        for _ in range(bisect_steps):
+            mid = (low.level + high.level) / 2
+            if integer:
+                mid = float(int(mid))
+            if mid in measured or mid <= low.level:
+                break
+            point = await measure(mid)
+            if breaches(point) or not gained(point, low):
+                high = point
+            else:
+                low = point
+        saturation = high.level
+    else:
+        saturation = saturated.level if saturated is not None else None
+
+    return sorted(measured.values(), key=lambda p: p.level), saturation
+
+
+def _result(
+    mode: Literal["concurrency", "rate"],
+    points: list[SweepPoint],
+    saturation: float | None,
+    throughput_metric: str,
+    latency_metric: str,
+) -> SweepResult:
+    curve = [
+        (p.throughput, p.latency)
+        for p in points
+        if p.throughput is not None and p.latency is not None
+    ]
+    knee_index = find_knee(curve)
+    usable = [p for p in points if p.throughput is not None and p.latency is not None]
+    return SweepResult(
+        mode=mode,
+        throughput_metric=throughput_metric,
+        latency_metric=latency_metric,
+        points=points,
+        knee=usable[knee_index].level if knee_index is not None else None,
+        saturation=saturation,
+    )
+
+
+async def sweep_concurrency(
+    tracker: InferenceTracker,
+    prompts: Prompts,
+    model: str,
+    levels: Sequence[int] | None = None,
+    max_concurrency: int = 256,
+    requests_per_level: Callable[[int], int] | int | None = None,
+    throughput_metric: str = "overall_tps",
+    latency_metric: str = "p99_e2e_latency",
+    latency_limit: float | None = None,
+    min_gain: float = 0.1,
+    bisect_steps: int = 2,
+    **kwargs,
+) -> SweepResult:
+    """Find where throughput stops scaling with concurrency.
+
+    Runs :meth:`InferenceTracker.run_batch` at increasing concurrency,
+    doubling from 1 up to ``max_concurrency`` unless explicit ``levels``
+    are given, and stops at the first level whose throughput grew by less
+    than ``min_gain`` per doubling of concurrency, or whose latency exceeded
+    ``latency_limit``. The gap between the last scaling level and that
+    saturated level is then bisected ``bisect_steps`` times. The tracker is
+    reset before every level.
+
+    Args:
+        tracker: Tracker used to send requests
+        prompts: Sequence reused cyclically, or a callable returning a fresh
+            iterable for each level
+        model: Model name passed to the API
+        levels: Explicit concurrency levels to try in order
+        max_concurrency: Upper bound for the doubling schedule
+        requests_per_level: Requests per level, as a number or a function
+            of the level (default ``max(8 * level, 32)``)
+        throughput_metric: BatchInferenceStats field used as throughput
+        latency_metric: BatchInferenceStats field used as latency
+        latency_limit: Stop once ``latency_metric`` exceeds this value
+        min_gain: Minimum relative throughput gain per doubling of load to
+            count as still scaling
+        bisect_steps: Extra levels measured around the saturation point
+        **kwargs: Parameters sent with every request
+
+    Returns:
+        SweepResult with every measured point, the knee of the
+        throughput-latency curve and the saturation level
+    """
+
+    def count_for(level: int) -> int:
+        if requests_per_level is None:
+            return max(8 * level, 32)
+        if callable(requests_per_level):
+            return requests_per_level(level)
+        return requests_per_level
+
+    async def run_level(level: float) -> BatchInferenceStats:
+        concurrency = int(level)
+        tracker.reset()
+        return await tracker.run_batch(
+            _level_prompts(prompts, count_for(concurrency)),
+            model,
+            concurrency=concurrency,
+            **kwargs,
+        )
+
+    points, saturation = await _adaptive_sweep(
+        run_level,
+        [float(level) for level in levels] if levels is not None else None,
+        start=1.0,
+        max_level=float(max_concurrency),
+        integer=True,
+        throughput_metric=throughput_metric,
+        latency_metric=latency_metric,
+        latency_limit=latency_limit,
+        min_gain=min_gain,
+        bisect_steps=bisect_steps,
+    )
+    return _result("concurrency", points, saturation, throughput_metric, latency_metric)
+
+
+async def sweep_rate(
+    tracker: InferenceTracker,
+    prompts: Prompts,
+    model: str,
+    rates: Sequence[float] | None = None,
+    start_rate: float = 1.0,
+    max_rate: float = 1024.0,
+    duration: float = 30.0,
+    arrivals: Literal["poisson", "constant"] = "poisson",
+    seed: int | None = None,
+    throughput_metric: str = "overall_tps",
+    latency_metric: str = "p99_e2e_latency",
+    latency_limit: float | None = None,
+    min_gain: float = 0.1,
+    bisect_steps: int = 2,
+    **kwargs,
+) -> SweepResult:
+    """Open-loop counterpart of :func:`sweep_concurrency`.
+
+    Each level runs :meth:`InferenceTracker.run_open_loop` at a target
+    request rate for about ``duration`` seconds. Rates double from
+    ``start_rate`` unless explicit ``rates`` are given; early stopping and
+    bisection work as in :func:`sweep_concurrency`.
+
+    Returns:
+        SweepResult whose levels are request rates
+    """
+
+    async def run_level(rate: float) -> BatchInferenceStats:
+        tracker.reset()
+        return await tracker.run_open_loop(
+            _level_prompts(prompts, max(int(rate * duration), 1)),
+            model,
+            rate=rate,
+            arrivals=arrivals,
+            seed=seed,
+            **kwargs,
+        )
+
+    points, saturation = await _adaptive_sweep(
+        run_level,
+        rates,
+        start=start_rate,
+        max_level=max_rate,
+        integer=False,
+        throughput_metric=throughput_metric,
+        latency_metric=latency_metric,
+        latency_limit=latency_limit,
+        min_gain=min_gain,
+        bisect_steps=bisect_steps,
+    )
+    return _result("rate", points, saturation, throughput_metric, latency_metric)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 
@@ -13,6 +15,16 @@ class RequestMetrics(BaseModel):
     tps: float | None = None
     prefill_time: float | None = None
     decode_time: float | None = None
+    itl_p50: float | None = None
+    itl_p99: float | None = None
+    itl_max: float | None = None
+    stall_count: int | None = None
+    usage_source: Literal["server", "tokenizer"] | None = None
+    queue_wait: float | None = None
+    send_lag: float | None = None
+    client_overhead: float | None = None
+    loop_lag: float | None = None
+    connect_time: float | None = None
 
 
 class InferenceStats(BaseModel):
@@ -65,6 +77,58 @@ class BatchInferenceStats(BaseModel):
     # Requests Per Second
     rps: float | None = None
 
+    # SLO goodput: requests meeting TTFT <= slo_ttft and ITL <= slo_itl
+    slo_ttft: float | None = None
+    slo_itl: float | None = None
+    slo_attainment: float | None = None
+    goodput_rps: float | None = None
+    goodput_tps: float | None = None
+
+    # Client-side queue wait before a request was sent
+    avg_queue_wait: float | None = None
+    p50_queue_wait: float | None = None
+    p99_queue_wait: float | None = None
+    max_queue_wait: float | None = None
+
+    # Open-loop scheduler lateness: actual minus intended send time
+    avg_send_lag: float | None = None
+    p50_send_lag: float | None = None
+    p99_send_lag: float | None = None
+    max_send_lag: float | None = None
+
+    # Client-side processing time per request: chunk handling plus
+    # tokenization CPU time
+    avg_client_overhead: float | None = None
+    p50_client_overhead: float | None = None
+    p99_client_overhead: float | None = None
+    max_client_overhead: float | None = None
+
+    # Worst event-loop lag observed while each request was in flight
+    avg_loop_lag: float | None = None
+    p50_loop_lag: float | None = None
+    p99_loop_lag: float | None = None
+    max_loop_lag: float | None = None
+
+    # TCP connect plus TLS handshake time, excluded from prefill time
+    avg_connect_time: float | None = None
+    p50_connect_time: float | None = None
+    p99_connect_time: float | None = None
+    max_connect_time: float | None = None
+
+    # Time to first token minus connection setup
+    avg_prefill_time: float | None = None
+    p50_prefill_time: float | None = None
+    p99_prefill_time: float | None = None
+    max_prefill_time: float | None = None
+
+    # Client overhead plus loop lag as a share of total E2E latency
+    client_overhead_fraction: float | None = None
+
+    # GPU energy, filled when GPU samples are passed to compute_metrics
+    energy_joules: float | None = None
+    energy_per_output_token: float | None = None
+    avg_energy_per_request: float | None = None
+
     total_requests: int = 0
     successful_requests: int = 0
 
@@ -78,3 +142,34 @@ class GPUMetrics(BaseModel):
     gpu_utilization_percent: int
     temperature_celsius: int
     power_draw_watts: float
+    # NVML's cumulative energy counter, None where the GPU lacks it
+    energy_joules: float | None = None
+
+
+class HostMetrics(BaseModel):
+    timestamp: float
+    pid: int
+    # Process CPU time over wall time since the previous sample, in percent
+    # of one core; None for the first sample
+    cpu_percent: float | None = None
+    rss_mb: float
+    # Cumulative counters of the process's network namespace, loopback
+    # excluded
+    net_rx_bytes: int
+    net_tx_bytes: int
+
+
+class SweepPoint(BaseModel):
+    level: float
+    throughput: float | None = None
+    latency: float | None = None
+    stats: BatchInferenceStats
+
+
+class SweepResult(BaseModel):
+    mode: Literal["concurrency", "rate"]
+    throughput_metric: str
+    latency_metric: str
+    points: list[SweepPoint]
+    knee: float | None = None
+    saturation: float | None = None
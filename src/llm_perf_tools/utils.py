@@ -1,5 +1,6 @@
 import json
 import csv
+import math
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -79,11 +80,28 @@ def load_inference_data(json_path: str | Path) -> dict[str, Any]:
         return json.load(f)
 
 
+def _nan_to_none(value: Any) -> Any:
+    """``value``, or None if it is a float NaN."""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _optional_float(value: str | None) -> float | None:
+    if not value:
+        return None
+    return _nan_to_none(float(value))
+
+
 def load_gpu_data(csv_path: str | Path) -> list[GPUMetrics]:
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(f"GPU data file not found: {path}")
 
+    if path.suffix == ".bin":
+        # Imported here because samples uses _nan_to_none from this module.
+        from .samples import read_samples, records_to_models
+
+        return records_to_models(read_samples(path), GPUMetrics)
+
     metrics = []
     with open(path, "r") as f:
         reader = csv.DictReader(f)
@@ -98,6 +116,7 @@ def load_gpu_data(csv_path: str | Path) -> list[GPUMetrics]:
                     gpu_utilization_percent=int(row["gpu_utilization_percent"]),
                     temperature_celsius=int(row["temperature_celsius"]),
                     power_draw_watts=float(row["power_draw_watts"]),
+                    energy_joules=_optional_float(row.get("energy_joules")),
                 )
             )
     return metrics
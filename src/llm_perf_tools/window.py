@@ -0,0 +1,134 @@
+import math
+import time
+from array import array
+
+import numpy as np
+
+from .stats import batch_stats_from_columns
+from .types import BatchInferenceStats
+
+_FLOAT_COLUMNS = ("request_start", "first_token_time", "request_end")
+_INT_COLUMNS = ("input_tokens", "output_tokens")
+
+
+class _Bucket:
+    __slots__ = ("columns", "index")
+
+    def __init__(self):
+        self.index = -1
+        self.columns = {name: array("d") for name in _FLOAT_COLUMNS}
+        self.columns.update({name: array("q") for name in _INT_COLUMNS})
+
+    def reset(self, index: int) -> None:
+        self.index = index
+        for column in self.columns.values():
+            del column[:]
+
+
+class RollingWindow:
+    """Sliding-window metrics over a ring buffer of time buckets.
+
+    Completed requests are filed into the bucket of their end time. The
+    ring holds just enough buckets to cover ``window`` seconds, and a bucket
+    is recycled once it falls out of the window, so memory and the cost of
+    :meth:`compute` are proportional to the requests inside the window,
+    not to the length of the run.
+
+    Args:
+        window: Window length in seconds
+        bucket_width: Time resolution in seconds; the window edge advances
+            in steps of this size, so the covered span is between ``window``
+            and ``window + bucket_width`` seconds
+        clock: Time source, ``time.perf_counter`` like the tracker
+        slo_ttft: Optional TTFT target for goodput, see
+            :func:`~llm_perf_tools.inference.compute_batch_metrics`
+        slo_itl: Optional average ITL target for goodput
+
+    Example:
+        >>> window = RollingWindow(window=10.0, bucket_width=1.0, clock=lambda: 20.0)
+        >>> window.add(15.0, 15.5, 18.0, input_tokens=3, output_tokens=12)
+        >>> window.add(1.0, 1.5, 2.0, output_tokens=4)  # already outside
+        >>> window.compute().total_requests
+        1
+    """
+
+    def __init__(
+        self,
+        window: float = 30.0,
+        bucket_width: float = 1.0,
+        clock=time.perf_counter,
+        slo_ttft: float | None = None,
+        slo_itl: float | None = None,
+    ):
+        if window <= 0 or bucket_width <= 0:
+            raise ValueError("window and bucket_width must be positive")
+        self.window = window
+        self.bucket_width = bucket_width
+        self.clock = clock
+        self.slo_ttft = slo_ttft
+        self.slo_itl = slo_itl
+        # One extra bucket for the partially elapsed current one, so the
+        # window always spans at least ``window`` seconds.
+        num_buckets = math.ceil(window / bucket_width) + 1
+        self._buckets = [_Bucket() for _ in range(num_buckets)]
+        self._origin: float | None = None
+
+    def add(
+        self,
+        request_start: float,
+        first_token_time: float | None,
+        request_end: float | None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        completed = request_end if request_end is not None else self.clock()
+        if self._origin is None:
+            self._origin = request_start
+        index = int(completed // self.bucket_width)
+        if index <= self._current_index() - len(self._buckets):
+            return
+        bucket = self._buckets[index % len(self._buckets)]
+        if bucket.index != index:
+            bucket.reset(index)
+        columns = bucket.columns
+        columns["request_start"].append(request_start)
+        columns["first_token_time"].append(
+            math.nan if first_token_time is None else first_token_time
+        )
+        columns["request_end"].append(math.nan if request_end is None else request_end)
+        columns["input_tokens"].append(input_tokens)
+        columns["output_tokens"].append(output_tokens)
+
+    def compute(self) -> BatchInferenceStats:
+        """Aggregate the requests that completed within the window.
+
+        ``rps`` and ``overall_tps`` are rates over the window span (or the
+        time since the first request, if shorter), i.e. completions and
+        output tokens per second over the last ``window`` seconds.
+        """
+        now = self.clock()
+        current = int(now // self.bucket_width)
+        oldest = current - len(self._buckets) + 1
+        live = [bucket for bucket in self._buckets if oldest <= bucket.index <= current]
+        if not live or self._origin is None:
+            return BatchInferenceStats()
+
+        columns = {
+            name: np.concatenate(
+                [np.frombuffer(bucket.columns[name], dtype=dtype) for bucket in live]
+            )
+            for names, dtype in ((_FLOAT_COLUMNS, np.float64), (_INT_COLUMNS, np.int64))
+            for name in names
+        }
+        span = now - max(oldest * self.bucket_width, self._origin)
+        return batch_stats_from_columns(
+            columns, span, self.slo_ttft, self.slo_itl, throughput_span=span
+        )
+
+    def reset(self) -> None:
+        for bucket in self._buckets:
+            bucket.reset(-1)
+        self._origin = None
+
+    def _current_index(self) -> int:
+        return int(self.clock() // self.bucket_width)
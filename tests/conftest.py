@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from types import SimpleNamespace
+
+import pytest
+from openai import AsyncOpenAI
+
+
+def busy_wait(seconds: float) -> None:
+    """Hold the CPU, and with it the event loop, for ``seconds``."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class FakeClient:
+    """Stand-in for ``AsyncOpenAI`` streaming fixed tokens.
+
+    Records every ``create()`` call and how many streams are in flight.
+
+    Args:
+        tokens: Content of the streamed chunks
+        delay: Seconds before each chunk
+        fail_on: Prompt content for which ``create()`` raises
+        block_on: Prompt content whose stream keeps the event loop busy
+            for 50 ms after each chunk, like slow client-side parsing
+        slots: Streams served at full speed; beyond that every chunk is
+            delayed proportionally, like a saturated server
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[str] = ("x", "y"),
+        delay: float = 0.01,
+        fail_on: str | None = None,
+        block_on: str | None = None,
+        slots: int | None = None,
+    ):
+        self.tokens = tokens
+        self.delay = delay
+        self.fail_on = fail_on
+        self.block_on = block_on
+        self.slots = slots
+        self.calls: list[dict] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = kwargs["messages"][0]["content"]
+        if content == self.fail_on:
+            raise RuntimeError("boom")
+        return self._stream(content)
+
+    async def _stream(self, content: str):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            for token in self.tokens:
+                slowdown = 1.0
+                if self.slots is not None:
+                    slowdown = max(1.0, self.in_flight / self.slots)
+                await asyncio.sleep(self.delay * slowdown)
+                if content == self.block_on:
+                    busy_wait(0.05)
+                yield SimpleNamespace(
+                    choices=[SimpleNamespace(delta=SimpleNamespace(content=token))]
+                )
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_client() -> type[FakeClient]:
+    """:class:`FakeClient`, called with its arguments to build a client."""
+    return FakeClient
+
+
+@pytest.fixture
+def openai_client() -> Callable[[str], AsyncOpenAI]:
+    """Build an ``AsyncOpenAI`` client for a mock server's base URL."""
+
+    def make(base_url: str) -> AsyncOpenAI:
+        return AsyncOpenAI(base_url=base_url, api_key="mock", max_retries=0)
+
+    return make
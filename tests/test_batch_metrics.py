@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from llm_perf_tools.inference import compute_batch_metrics, percentile
+from llm_perf_tools.store import MetricsStore
+from llm_perf_tools.types import RequestMetrics
+
+
+def _random_metrics(count: int, seed: int = 0) -> list[RequestMetrics]:
+    rng = random.Random(seed)
+    metrics = []
+    for _ in range(count):
+        start = rng.uniform(0, 100)
+        if rng.random() < 0.1:
+            metrics.append(RequestMetrics(request_start=start))
+            continue
+        first_token = None if rng.random() < 0.1 else start + rng.uniform(0, 2)
+        metrics.append(
+            RequestMetrics(
+                request_start=start,
+                first_token_time=first_token,
+                request_end=(first_token or start) + rng.uniform(0, 5),
+                input_tokens=rng.randint(0, 50),
+                output_tokens=rng.randint(0, 40),
+            )
+        )
+    return metrics
+
+
+def test_matches_sorted_percentiles():
+    metrics = _random_metrics(500)
+    successful = [m for m in metrics if m.request_end is not None]
+    ttft = [
+        m.first_token_time - m.request_start
+        for m in successful
+        if m.first_token_time is not None
+    ]
+    e2e = [m.request_end - m.request_start for m in successful]
+
+    stats = compute_batch_metrics(metrics, 10.0)
+
+    assert stats.total_requests == 500
+    assert stats.successful_requests == len(successful)
+    assert stats.p50_ttft == percentile(ttft, 50)
+    assert stats.p95_ttft == percentile(ttft, 95)
+    assert stats.p99_ttft == percentile(ttft, 99)
+    assert stats.min_ttft == min(ttft)
+    assert stats.max_e2e_latency == max(e2e)
+    assert stats.p99_e2e_latency == percentile(e2e, 99)
+    assert stats.avg_e2e_latency == pytest.approx(sum(e2e) / len(e2e))
+    assert stats.total_output_tokens == sum(m.output_tokens for m in successful)
+
+
+def test_store_and_list_give_same_stats():
+    metrics = _random_metrics(200, seed=1)
+
+    from_list = compute_batch_metrics(metrics, 5.0)
+    from_store = compute_batch_metrics(MetricsStore.from_records(metrics), 5.0)
+
+    assert from_list == from_store
+
+
+def test_empty_input_returns_default_stats():
+    assert compute_batch_metrics([], 1.0).total_requests == 0
+    assert compute_batch_metrics(MetricsStore(), 1.0).total_requests == 0
+
+
+def test_slo_goodput_counts_requests_meeting_every_target():
+    metrics = [
+        # TTFT 0.2s, ITL 0.01s: good
+        RequestMetrics(
+            request_start=0.0, first_token_time=0.2, request_end=1.2, output_tokens=101
+        ),
+        # TTFT 1.0s: misses the TTFT target
+        RequestMetrics(
+            request_start=0.0, first_token_time=1.0, request_end=2.0, output_tokens=101
+        ),
+        # ITL 0.1s: misses the ITL target
+        RequestMetrics(
+            request_start=1.0, first_token_time=1.1, request_end=3.1, output_tokens=21
+        ),
+        # Single token: only the TTFT target applies
+        RequestMetrics(
+            request_start=2.0, first_token_time=2.1, request_end=2.1, output_tokens=1
+        ),
+        # Failed request
+        RequestMetrics(request_start=3.0),
+    ]
+
+    stats = compute_batch_metrics(metrics, 4.0, slo_ttft=0.5, slo_itl=0.05)
+
+    assert stats.slo_ttft == 0.5
+    assert stats.slo_itl == 0.05
+    assert stats.slo_attainment == 2 / 5
+    assert stats.goodput_rps == 2 / 4.0
+    assert stats.goodput_tps == pytest.approx(102 / 3.1)
+    assert compute_batch_metrics(metrics, 4.0).slo_attainment is None
+
+
+def test_sketch_goodput_matches_exact_goodput():
+    from llm_perf_tools.sketch import SketchBatchStats
+
+    metrics = _random_metrics(300, seed=2)
+    sketch = SketchBatchStats(slo_ttft=1.0, slo_itl=0.1)
+    for m in metrics:
+        sketch.add(
+            m.request_start,
+            m.first_token_time,
+            m.request_end,
+            m.input_tokens,
+            m.output_tokens,
+        )
+
+    exact = compute_batch_metrics(metrics, 10.0, slo_ttft=1.0, slo_itl=0.1)
+    sketched = sketch.to_batch_stats(10.0)
+
+    assert sketched.slo_attainment == exact.slo_attainment
+    assert sketched.goodput_rps == exact.goodput_rps
+    assert sketched.goodput_tps == pytest.approx(exact.goodput_tps)
@@ -0,0 +1,53 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+BENCH_PATH = Path(__file__).parents[1] / "benchmarks" / "bench.py"
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_benchmarks_run_and_detect_regressions(tmp_path):
+    bench = _load_bench()
+    output = tmp_path / "results.json"
+
+    assert (
+        bench.main(["--sizes", "1000", "--repeat", "1", "--output", str(output)]) == 0
+    )
+
+    results = bench.json.loads(output.read_text())["results"]
+    assert set(results) == {f"{name}[1000]" for name in bench.BENCHMARKS}
+    slower = {key: {**r, "seconds": r["seconds"] * 2} for key, r in results.items()}
+    assert bench.compare(slower, results, tolerance=0.25)
+    assert not bench.compare(results, results, tolerance=0.25)
+    assert all(r["seconds"] > 0 for r in results.values())
+    broken = {**results, "percentile[1000]": {"seconds": -0.001}}
+    with pytest.raises(ValueError, match="percentile"):
+        bench.compare(results, broken, tolerance=0.25)
+
+
+def test_missing_baseline_skips_comparison(tmp_path, capsys):
+    bench = _load_bench()
+    baseline = tmp_path / "missing.json"
+
+    assert (
+        bench.main(
+            [
+                "percentile",
+                "--sizes",
+                "1000",
+                "--repeat",
+                "1",
+                "--baseline",
+                str(baseline),
+            ]
+        )
+        == 0
+    )
+    assert "skipping comparison" in capsys.readouterr().out
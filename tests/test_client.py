@@ -0,0 +1,51 @@
+import pytest
+from openai import AsyncOpenAI
+
+from llm_perf_tools.client import create_client
+from llm_perf_tools.inference import InferenceTracker
+from llm_perf_tools.mock_server import LatencyProfile, MockServer
+
+
+def test_pool_limits_are_applied():
+    client = create_client(
+        "http://localhost:8000/v1", api_key="none", max_connections=2048
+    )
+
+    pool = client._client._transport._pool
+    assert pool._max_connections == 2048
+    assert pool._max_keepalive_connections == 2048
+
+
+@pytest.mark.asyncio
+async def test_connect_time_is_recorded_apart_from_prefill():
+    async with MockServer(LatencyProfile(ttft=0.02, itl=0.0)) as server:
+        client = create_client(server.base_url, api_key="mock", max_retries=0)
+        tracker = InferenceTracker(client, tokenizer=len)
+        stats = await tracker.run_batch(["a"] * 6, "mock", concurrency=2)
+
+    connect_times = [m.connect_time for m in tracker.metrics]
+    # Two connections are opened and then reused by the other requests.
+    assert sum(t > 0 for t in connect_times) == 2
+    assert connect_times.count(0.0) == 4
+    for m in tracker.metrics:
+        assert m.prefill_time == pytest.approx(m.ttft - m.connect_time)
+    assert stats.max_connect_time > 0
+    assert stats.p50_prefill_time is not None
+
+
+@pytest.mark.asyncio
+async def test_plain_client_reports_no_connect_time():
+    async with MockServer(LatencyProfile(ttft=0.0, itl=0.0)) as server:
+        client = AsyncOpenAI(base_url=server.base_url, api_key="mock")
+        tracker = InferenceTracker(client, tokenizer=len)
+        await tracker.run_batch(["a"], "mock")
+
+    assert tracker.metrics[0].connect_time is None
+    assert tracker.metrics[0].prefill_time == tracker.metrics[0].ttft
+
+
+def test_http2_requires_h2(mocker):
+    mocker.patch.dict("sys.modules", {"h2": None})
+
+    with pytest.raises(ImportError, match="h2"):
+        create_client("http://localhost:8000/v1", api_key="none", http2=True)
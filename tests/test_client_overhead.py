@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from llm_perf_tools.inference import InferenceTracker
+
+
+def _slow_tokenizer(text: str) -> int:
+    deadline = time.thread_time() + 0.01
+    while time.thread_time() < deadline:
+        pass
+    return len(text)
+
+
+@pytest.mark.asyncio
+async def test_records_client_overhead_and_loop_lag(fake_client):
+    tracker = InferenceTracker(
+        fake_client(tokens=["a", "b", "c"], block_on="hog"),
+        tokenizer=_slow_tokenizer,
+        measure_client_overhead=True,
+        overhead_warning=None,
+    )
+
+    stats = await tracker.run_batch(
+        ["hog", "p1", "p2", "p3"], "gpt-test", concurrency=4
+    )
+
+    # Two tokenizer calls of at least 10ms CPU each.
+    assert all(m.client_overhead >= 0.02 for m in tracker.metrics)
+    assert all(m.loop_lag >= 0.04 for m in tracker.metrics)
+    assert stats.max_loop_lag >= 0.04
+    assert stats.p50_client_overhead >= 0.02
+    assert 0 < stats.client_overhead_fraction
+    assert tracker.loop_probe._task is None
+
+
+@pytest.mark.asyncio
+async def test_warns_when_client_overhead_dominates(fake_client):
+    tracker = InferenceTracker(
+        fake_client(),
+        tokenizer=_slow_tokenizer,
+        measure_client_overhead=True,
+        overhead_warning=0.05,
+    )
+
+    with pytest.warns(RuntimeWarning, match="load generator may be the bottleneck"):
+        await tracker.run_batch(["p1", "p2"], "gpt-test", concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default(fake_client):
+    tracker = InferenceTracker(fake_client(), tokenizer=len)
+
+    stats = await tracker.run_batch(["p1"], "gpt-test")
+
+    assert tracker.loop_probe is None
+    assert tracker.metrics[0].client_overhead is None
+    assert stats.client_overhead_fraction is None
+
+
+@pytest.mark.asyncio
+async def test_sketch_mode_reports_overhead(fake_client):
+    tracker = InferenceTracker(
+        fake_client(),
+        tokenizer=_slow_tokenizer,
+        measure_client_overhead=True,
+        overhead_warning=None,
+        sketch_accuracy=0.01,
+    )
+
+    stats = await tracker.run_batch(["p1", "p2"], "gpt-test", concurrency=2)
+
+    assert stats.avg_client_overhead >= 0.02
+    assert stats.client_overhead_fraction > 0
+
+
+@pytest.mark.asyncio
+async def test_tokenizer_load_is_not_client_overhead(mocker, fake_client):
+    def load():
+        # 30ms of CPU, like loading a real tokenizer.
+        deadline = time.thread_time() + 0.03
+        while time.thread_time() < deadline:
+            pass
+        return len
+
+    mocker.patch("llm_perf_tools.inference._load_default_tokenizer", load)
+    tracker = InferenceTracker(
+        fake_client(), measure_client_overhead=True, overhead_warning=None
+    )
+
+    await tracker.run_batch(["p1"], "gpt-test")
+
+    assert tracker.metrics[0].client_overhead < 0.01
@@ -0,0 +1,93 @@
+import gzip
+import json
+
+import pytest
+
+from llm_perf_tools.dataset import load_requests
+
+
+def _write_jsonl(path, records, opener=open):
+    with opener(path, "wt") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_reads_chat_batch_and_prompt_records(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    _write_jsonl(
+        path,
+        [
+            {"messages": [{"role": "user", "content": "a"}], "stream": True},
+            {"custom_id": "1", "body": {"messages": [], "max_tokens": 3}},
+            {"prompt": "c", "model": "other"},
+        ],
+    )
+
+    requests = list(load_requests(path, overrides={"temperature": 0.0}))
+
+    assert requests[0] == {
+        "messages": [{"role": "user", "content": "a"}],
+        "temperature": 0.0,
+    }
+    assert requests[1]["max_tokens"] == 3
+    assert requests[2] == {
+        "messages": [{"role": "user", "content": "c"}],
+        "temperature": 0.0,
+    }
+
+
+def test_only_chat_parameters_are_replayed(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    _write_jsonl(
+        path,
+        [{"prompt": "hello", "id": "abc", "timestamp": 1.0, "model": "m", "seed": 1}],
+    )
+
+    assert next(load_requests(path)) == {
+        "messages": [{"role": "user", "content": "hello"}],
+        "seed": 1,
+    }
+    assert next(load_requests(path, record_model=True))["model"] == "m"
+    assert next(load_requests(path, passthrough=True)).keys() == {
+        "messages",
+        "seed",
+        "id",
+        "timestamp",
+    }
+
+
+def test_gzip_sampling_shuffle_and_limit(tmp_path):
+    path = tmp_path / "requests.jsonl.gz"
+    _write_jsonl(path, [{"prompt": str(i)} for i in range(1000)], opener=gzip.open)
+
+    def contents(**kwargs):
+        return [r["messages"][0]["content"] for r in load_requests(path, **kwargs)]
+
+    assert len(contents()) == 1000
+    sampled = contents(sample_rate=0.1, seed=0)
+    assert 50 < len(sampled) < 150
+    shuffled = contents(shuffle_buffer=100, seed=0)
+    assert sorted(shuffled, key=int) == [str(i) for i in range(1000)]
+    assert shuffled != [str(i) for i in range(1000)]
+    assert len(contents(limit=5)) == 5
+
+
+def test_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "requests.jsonl.zst"
+    lines = "".join(json.dumps({"prompt": str(i)}) + "\n" for i in range(3))
+    path.write_bytes(zstandard.ZstdCompressor().compress(lines.encode()))
+
+    assert [r["messages"][0]["content"] for r in load_requests(path)] == [
+        "0",
+        "1",
+        "2",
+    ]
+
+
+def test_invalid_record_reports_line(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"prompt": "ok"}\n{not json}\n')
+
+    with pytest.raises(ValueError, match="bad.jsonl:2"):
+        list(load_requests(path))
@@ -0,0 +1,109 @@
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from llm_perf_tools.energy import cumulative_energy, energy_stats, request_energy
+from llm_perf_tools.inference import InferenceTracker
+from llm_perf_tools.samples import GPU_SAMPLE_DTYPE, SampleBuffer
+from llm_perf_tools.types import GPUMetrics
+
+
+def _samples(times, watts, gpu_id=0, energy=None) -> list[GPUMetrics]:
+    energy = energy if energy is not None else [None] * len(times)
+    return [
+        GPUMetrics(
+            timestamp=t,
+            gpu_id=gpu_id,
+            memory_used_mb=0,
+            memory_total_mb=1,
+            memory_utilization_percent=0.0,
+            gpu_utilization_percent=0,
+            temperature_celsius=0,
+            power_draw_watts=w,
+            energy_joules=e,
+        )
+        for t, w, e in zip(times, watts, energy)
+    ]
+
+
+def test_integrates_power_when_no_counter():
+    samples = _samples([0, 1, 2, 3], [100, 300, 300, 100])
+
+    times, energy = cumulative_energy(samples)
+
+    assert times.tolist() == [0, 1, 2, 3]
+    assert energy.tolist() == [0, 200, 500, 700]
+
+
+def test_prefers_energy_counter():
+    samples = _samples([0, 1, 2], [0, 0, 0], energy=[5000.0, 5100.0, 5400.0])
+
+    assert cumulative_energy(samples)[1].tolist() == [0, 100, 400]
+
+
+def test_sums_gpus():
+    samples = _samples(range(5), [100] * 5, gpu_id=0) + _samples(
+        range(5), [50] * 5, gpu_id=1
+    )
+
+    assert cumulative_energy(samples)[1][-1] == 600
+
+
+def test_overlapping_requests_share_energy():
+    samples = _samples(range(11), [100] * 11)
+
+    energy = request_energy(
+        samples, np.array([0.0, 2.0, 8.0]), np.array([4.0, 6.0, np.nan])
+    )
+
+    # [0, 2) alone, [2, 4) shared, [4, 6) alone.
+    assert energy[:2].tolist() == pytest.approx([300, 300])
+    assert np.isnan(energy[2])
+
+
+def test_energy_stats_include_idle_gaps():
+    samples = _samples(range(11), [100] * 11)
+    columns = {
+        "request_start": np.array([1.0, 6.0]),
+        "request_end": np.array([3.0, 9.0]),
+        "output_tokens": np.array([10, 30]),
+    }
+
+    stats = energy_stats(samples, columns)
+
+    assert stats["energy_joules"] == pytest.approx(800)
+    assert stats["energy_per_output_token"] == pytest.approx(20)
+    assert stats["avg_energy_per_request"] == pytest.approx(250)
+
+
+def test_tracker_fills_energy_fields():
+    tracker = InferenceTracker(MagicMock(), tokenizer=len)
+    now = time.perf_counter()
+    tracker._start_time = now - 10
+    tracker.metrics.append(
+        request_start=now - 8,
+        first_token_time=now - 7,
+        request_end=now - 4,
+        input_tokens=5,
+        output_tokens=20,
+    )
+    buffer = SampleBuffer(GPU_SAMPLE_DTYPE, GPUMetrics)
+    buffer.append(
+        [(now - t, 0, 0, 1, 0.0, 0, 0, 250.0, np.nan) for t in range(10, -1, -1)]
+    )
+
+    stats = tracker.compute_metrics(gpu_samples=buffer)
+
+    assert stats.energy_joules == pytest.approx(1000)
+    assert stats.avg_energy_per_request == pytest.approx(1000)
+    assert stats.energy_per_output_token == pytest.approx(50)
+    assert tracker.compute_metrics().energy_joules is None
+
+
+def test_sketch_mode_rejects_gpu_samples():
+    tracker = InferenceTracker(MagicMock(), tokenizer=len, sketch_accuracy=0.01)
+
+    with pytest.raises(ValueError, match="sketch_accuracy"):
+        tracker.compute_metrics(gpu_samples=[])
@@ -0,0 +1,205 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pynvml
+import pytest
+
+from llm_perf_tools import gpu, monitor
+from llm_perf_tools.samples import (
+    GPU_SAMPLE_DTYPE,
+    SampleBuffer,
+    SampleWriter,
+    read_samples,
+)
+from llm_perf_tools.types import GPUMetrics
+from llm_perf_tools.utils import load_gpu_data
+
+GB = 1024**3
+
+
+class FakeNvml:
+    """Stand-in for the NVML calls used by gpu.py, counting each call."""
+
+    def __init__(self, count: int = 2, fields: bool = True):
+        self.count = count
+        self.fields = fields
+        self.energy_mj = 0
+        self.calls: dict[str, int] = {}
+
+    def _call(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def install(self, mocker) -> None:
+        for name in (
+            "nvmlInit",
+            "nvmlShutdown",
+            "nvmlDeviceGetCount",
+            "nvmlDeviceGetHandleByIndex",
+            "nvmlDeviceGetMemoryInfo",
+            "nvmlDeviceGetUtilizationRates",
+            "nvmlDeviceGetTemperature",
+            "nvmlDeviceGetPowerUsage",
+            "nvmlDeviceGetFieldValues",
+        ):
+            mocker.patch.object(pynvml, name, getattr(self, name))
+
+    def nvmlInit(self):
+        self._call("init")
+
+    def nvmlShutdown(self):
+        self._call("shutdown")
+
+    def nvmlDeviceGetCount(self):
+        return self.count
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        self._call("handle")
+        return index
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        return SimpleNamespace(used=(handle + 1) * GB, total=80 * GB)
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        return SimpleNamespace(gpu=50 + handle)
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        return 60
+
+    def nvmlDeviceGetPowerUsage(self, handle):
+        self._call("power")
+        return 200_000
+
+    def nvmlDeviceGetFieldValues(self, handle, field_ids):
+        self._call("fields")
+        if not self.fields:
+            raise pynvml.NVMLError_NotSupported()
+        self.energy_mj += 1000
+        values = []
+        for field_id, value in zip(field_ids, (300_000, self.energy_mj)):
+            field = pynvml.c_nvmlFieldValue_t()
+            field.fieldId = field_id
+            field.valueType = pynvml.NVML_VALUE_TYPE_UNSIGNED_LONG_LONG
+            field.nvmlReturn = pynvml.NVML_SUCCESS
+            field.value.ullVal = value
+            values.append(field)
+        return values
+
+
+@pytest.mark.parametrize("fields, watts", [(True, 300.0), (False, 200.0)])
+def test_samples_all_gpus_with_cached_handles(mocker, tmp_path, fields, watts):
+    nvml = FakeNvml(count=3, fields=fields)
+    nvml.install(mocker)
+    output = tmp_path / "gpu.csv"
+
+    with gpu.monitor_gpu_usage(str(output), interval=0.01, gpu_id=None) as buffer:
+        time.sleep(0.1)
+    samples = buffer.recent()
+
+    assert nvml.calls["handle"] == 3
+    assert nvml.calls["shutdown"] == 1
+    assert {s.gpu_id for s in samples} == {0, 1, 2}
+    assert all(s.power_draw_watts == watts for s in samples)
+    assert all((s.energy_joules is not None) == fields for s in samples)
+    assert samples[1].memory_used_mb == 2048
+    assert samples[1].memory_utilization_percent == 2.5
+    # One sweep covers every GPU under a single timestamp.
+    assert samples[0].timestamp == samples[1].timestamp == samples[2].timestamp
+    assert len(load_gpu_data(output)) == len(samples)
+
+
+def test_selected_gpus(mocker, tmp_path):
+    FakeNvml(count=8).install(mocker)
+
+    with gpu.monitor_gpu_usage(
+        str(tmp_path / "gpu.csv"), interval=0.01, gpu_id=[1, 5]
+    ) as samples:
+        time.sleep(0.05)
+
+    assert {s.gpu_id for s in samples} == {1, 5}
+
+
+def test_samples_are_flushed_while_running(mocker, tmp_path):
+    FakeNvml(count=2).install(mocker)
+    output = tmp_path / "gpu.csv"
+
+    with gpu.monitor_gpu_usage(
+        str(output), interval=0.01, flush_interval=0.02, capacity=64
+    ) as samples:
+        time.sleep(0.1)
+        # Written before the block exits, so a crash would keep them.
+        assert len(load_gpu_data(output)) > 0
+        assert len(samples.recent(3)) == 3
+
+    assert len(load_gpu_data(output)) == len(samples)
+
+
+def test_binary_output_round_trips(mocker, tmp_path):
+    FakeNvml(count=2).install(mocker)
+    output = tmp_path / "gpu.bin"
+
+    with gpu.monitor_gpu_usage(str(output), interval=0.01, gpu_id=None) as samples:
+        time.sleep(0.05)
+
+    loaded = load_gpu_data(output)
+    assert loaded == samples.recent()
+
+
+def test_truncated_binary_file_keeps_whole_records(tmp_path):
+    writer = SampleWriter(tmp_path / "gpu.bin", GPU_SAMPLE_DTYPE)
+    records = np.zeros(3, dtype=GPU_SAMPLE_DTYPE)
+    records["timestamp"] = [1.0, 2.0, 3.0]
+    writer.write(records)
+    writer.close()
+    with open(tmp_path / "gpu.bin", "r+b") as f:
+        f.truncate(f.seek(0, 2) - 5)
+
+    assert read_samples(tmp_path / "gpu.bin")["timestamp"].tolist() == [1.0, 2.0]
+
+
+def test_ring_buffer_reports_overwritten_samples():
+    buffer = SampleBuffer(GPU_SAMPLE_DTYPE, GPUMetrics, capacity=4)
+    row = (0.0, 0, 1, 2, 50.0, 1, 1, 1.0, 0.0)
+    buffer.append([row] * 3)
+    records, position, dropped = buffer.read_since(0)
+    assert (len(records), position, dropped) == (3, 3, 0)
+
+    buffer.append([(float(t),) + row[1:] for t in range(6)])
+    records, position, dropped = buffer.read_since(position)
+    assert records["timestamp"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert (position, dropped) == (9, 2)
+    assert len(buffer) == 9
+    assert [m.timestamp for m in buffer.recent(2)] == [4.0, 5.0]
+
+
+def test_fixed_rate_schedule_does_not_drift():
+    stop = threading.Event()
+    ticks = []
+
+    def sample(timestamp):
+        ticks.append(timestamp)
+        time.sleep(0.004)
+        if len(ticks) == 20:
+            stop.set()
+
+    missed = monitor._run_fixed_rate(sample, 0.01, stop)
+
+    assert missed == 0
+    # A sleep-after-sample loop would have drifted by 20 * 4ms here.
+    assert ticks[-1] - ticks[0] == pytest.approx(0.19, abs=0.03)
+
+
+def test_fixed_rate_schedule_skips_missed_ticks():
+    stop = threading.Event()
+    ticks = []
+
+    def sample(timestamp):
+        ticks.append(timestamp)
+        if len(ticks) == 1:
+            time.sleep(0.035)
+        else:
+            stop.set()
+
+    assert monitor._run_fixed_rate(sample, 0.01, stop) == 3
+    assert ticks[1] - ticks[0] == pytest.approx(0.04, abs=0.01)
@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ["transformers", "matplotlib", "seaborn", "pynvml", "torch"]
+IMPORT_BUDGET_SECONDS = 1.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import llm_perf_tools
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _import_probe() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_does_not_load_heavy_dependencies():
+    loaded = set(_import_probe()["modules"])
+
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_import_time_within_budget():
+    # Best of three to smooth out cold filesystem caches on CI.
+    elapsed = min(_import_probe()["elapsed"] for _ in range(3))
+
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_attributes_resolve():
+    import llm_perf_tools
+
+    assert callable(llm_perf_tools.plot_inference_metrics)
+    assert "monitor_gpu_usage" in dir(llm_perf_tools)
@@ -1,3 +1,4 @@
+import threading
 from types import SimpleNamespace
 
 import pytest
@@ -100,3 +101,159 @@ async def test_custom_tokenizer_is_used(mocker):
     assert stats.total_output_tokens == 11
     assert stats.avg_input_tokens == 11
     assert stats.avg_output_tokens == 11
+
+
+@pytest.mark.asyncio
+async def test_record_chunk_times_tracks_itl_distribution(mocker):
+    tokens = ["a", "b", "c", "d"]
+
+    async def fake_response():
+        for token in tokens:
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=token))]
+            )
+
+    mock_create = mocker.AsyncMock(return_value=fake_response())
+    mock_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=mock_create))
+    )
+
+    tracker = InferenceTracker(
+        mock_client, tokenizer=len, record_chunk_times=True, stall_threshold=0.5
+    )
+
+    mocker.patch(
+        "llm_perf_tools.inference.time.perf_counter",
+        side_effect=[0.0, 1.0, 2.0, 2.25, 2.5, 3.5, 4.0],
+    )
+
+    await tracker.create_chat_completion(
+        messages=[{"role": "user", "content": "hi"}], model="gpt-test"
+    )
+
+    assert list(tracker.chunk_times[0]) == [2.0, 2.25, 2.5, 3.5]
+    metric = tracker.metrics[0]
+    assert metric.first_token_time == 2.0
+    assert metric.request_end == 4.0
+    assert metric.itl_p50 == 0.25
+    assert metric.itl_max == 1.0
+    assert metric.stall_count == 1
+
+
+@pytest.mark.asyncio
+async def test_tokenizer_runs_off_event_loop(mocker):
+    async def fake_response():
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content="hello"))]
+        )
+
+    mock_create = mocker.AsyncMock(return_value=fake_response())
+    mock_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=mock_create))
+    )
+
+    thread_names = []
+
+    def recording_tokenizer(text: str) -> int:
+        thread_names.append(threading.current_thread().name)
+        return len(text)
+
+    tracker = InferenceTracker(mock_client, tokenizer=recording_tokenizer)
+    await tracker.create_chat_completion(
+        messages=[{"role": "user", "content": "hi"}], model="gpt-test"
+    )
+    tracker.close()
+
+    assert tracker.metrics[0].output_tokens == 5
+    assert thread_names
+    assert all(name.startswith("llm-perf-tokenizer") for name in thread_names)
+
+
+@pytest.mark.asyncio
+async def test_prefer_server_usage_reads_usage_chunk(mocker):
+    async def fake_response():
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content="hello"))],
+            usage=None,
+        )
+        yield SimpleNamespace(
+            choices=[],
+            usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3),
+        )
+
+    mock_create = mocker.AsyncMock(return_value=fake_response())
+    mock_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=mock_create))
+    )
+    tokenizer = mocker.Mock(return_value=99)
+
+    tracker = InferenceTracker(
+        mock_client, tokenizer=tokenizer, prefer_server_usage=True
+    )
+    messages = [{"role": "user", "content": "hi"}]
+    await tracker.create_chat_completion(messages=messages, model="gpt-test")
+
+    metric = tracker.metrics[0]
+    assert metric.input_tokens == 7
+    assert metric.output_tokens == 3
+    assert metric.usage_source == "server"
+    tokenizer.assert_not_called()
+    mock_create.assert_called_once_with(
+        model="gpt-test",
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+
+
+@pytest.mark.asyncio
+async def test_prefer_server_usage_falls_back_to_tokenizer(mocker):
+    async def fake_response():
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content="hello"))],
+            usage=None,
+        )
+
+    mock_create = mocker.AsyncMock(return_value=fake_response())
+    mock_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=mock_create))
+    )
+
+    tracker = InferenceTracker(mock_client, tokenizer=len, prefer_server_usage=True)
+    await tracker.create_chat_completion(
+        messages=[{"role": "user", "content": "hi"}], model="gpt-test"
+    )
+
+    metric = tracker.metrics[0]
+    assert metric.input_tokens == 2
+    assert metric.output_tokens == 5
+    assert metric.usage_source == "tokenizer"
+
+
+@pytest.mark.asyncio
+async def test_sketch_mode_keeps_no_raw_metrics(mocker):
+    async def fake_response():
+        for token in ["a", "b", "c"]:
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=token))]
+            )
+
+    mock_client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(
+                create=mocker.AsyncMock(side_effect=lambda **_: fake_response())
+            )
+        )
+    )
+    tracker = InferenceTracker(mock_client, tokenizer=len, sketch_accuracy=0.01)
+
+    for _ in range(3):
+        await tracker.create_chat_completion(
+            messages=[{"role": "user", "content": "hi"}], model="gpt-test"
+        )
+
+    stats = tracker.compute_metrics()
+    assert len(tracker.metrics) == 0
+    assert stats.total_requests == 3
+    assert stats.total_output_tokens == 9
+    assert stats.p50_ttft is not None
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from llm_perf_tools.store import MetricsStore
+from llm_perf_tools.types import RequestMetrics
+
+
+def test_append_and_materialize_round_trip():
+    store = MetricsStore(capacity=1)
+    store.append(request_start=1.0, first_token_time=1.5, request_end=2.0)
+    store.append(request_start=2.0, request_end=4.0, output_tokens=3, stall_count=2)
+
+    assert len(store) == 2
+    assert store.capacity >= 2
+    assert store[0] == RequestMetrics(
+        request_start=1.0, first_token_time=1.5, request_end=2.0
+    )
+    assert store[-1].stall_count == 2
+    assert store[-1].first_token_time is None
+    assert [m.request_start for m in store] == [1.0, 2.0]
+
+
+def test_column_is_read_only_view():
+    store = MetricsStore()
+    store.append(request_start=1.0, output_tokens=4)
+
+    column = store.column("output_tokens")
+
+    assert column.dtype == np.int64
+    assert column.tolist() == [4]
+    with pytest.raises(ValueError):
+        column[0] = 5
+
+
+def test_extend_columns_fills_defaults():
+    store = MetricsStore.from_records(
+        [RequestMetrics(request_start=0.0, request_end=1.0)]
+    )
+    store.extend_columns(
+        {"request_start": np.array([1.0, 2.0]), "request_end": np.array([2.0, 3.0])}
+    )
+
+    assert len(store) == 3
+    assert store.column("output_tokens").tolist() == [0, 0, 0]
+    assert np.isnan(store.column("ttft")).all()
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from llm_perf_tools.inference import InferenceTracker
+from llm_perf_tools.mock_server import LatencyProfile, MockServer, serve_in_subprocess
+
+
+@pytest.mark.asyncio
+async def test_streams_with_profile_latencies(openai_client):
+    profile = LatencyProfile(ttft=0.05, itl=0.01, output_tokens=6)
+    async with MockServer(profile) as server:
+        tracker = InferenceTracker(
+            openai_client(server.base_url), tokenizer=len, prefer_server_usage=True
+        )
+        stats = await tracker.run_batch(["hello world"] * 4, "mock", concurrency=2)
+
+    assert stats.successful_requests == 4
+    assert stats.total_output_tokens == 24
+    assert stats.total_input_tokens == 8
+    assert {m.usage_source for m in tracker.metrics} == {"server"}
+    assert 0.05 <= stats.p50_ttft < 0.15
+    assert 0.01 <= stats.p50_itl < 0.03
+
+
+@pytest.mark.asyncio
+async def test_injected_failures_surface_as_errors(openai_client):
+    profile = LatencyProfile(ttft=0.0, itl=0.0, failure_rate=1.0)
+    async with MockServer(profile) as server:
+        tracker = InferenceTracker(openai_client(server.base_url), tokenizer=len)
+        results = {}
+        await tracker.run_batch(["a", "b"], "mock", on_response=results.__setitem__)
+
+    assert all(isinstance(result, Exception) for result in results.values())
+    assert server.requests_served == 2
+
+
+@pytest.mark.asyncio
+async def test_slowdown_grows_with_concurrency(openai_client):
+    profile = LatencyProfile(ttft=0.02, itl=0.0, capacity=1, slowdown=1.0)
+    async with MockServer(profile) as server:
+        tracker = InferenceTracker(openai_client(server.base_url), tokenizer=len)
+        alone = await tracker.run_batch(["a"] * 2, "mock", concurrency=1)
+        tracker.reset()
+        crowded = await tracker.run_batch(["a"] * 8, "mock", concurrency=8)
+
+    assert crowded.p50_ttft > 3 * alone.p50_ttft
+
+
+@pytest.mark.asyncio
+async def test_non_streaming_completion(openai_client):
+    async with MockServer(LatencyProfile(ttft=0.0, itl=0.0)) as server:
+        response = await openai_client(server.base_url).chat.completions.create(
+            model="mock", messages=[{"role": "user", "content": "hi"}], max_tokens=3
+        )
+
+    assert response.choices[0].message.content == " tok tok tok"
+    assert response.usage.completion_tokens == 3
+
+
+def test_subprocess_server(openai_client):
+    with serve_in_subprocess(LatencyProfile(ttft=0.0, itl=0.0)) as base_url:
+        tracker = InferenceTracker(openai_client(base_url), tokenizer=len)
+        stats = asyncio.run(tracker.run_batch(["a", "b", "c"], "mock"))
+
+    assert stats.successful_requests == 3
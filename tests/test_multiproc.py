@@ -0,0 +1,86 @@
+import functools
+
+import pytest
+
+from llm_perf_tools.multiproc import run_multiprocess
+from llm_perf_tools.store import MetricsStore
+
+
+@pytest.fixture
+def client_factory(fake_client):
+    # Workers build their own client, so they get a picklable factory.
+    return functools.partial(
+        fake_client, tokens=["x", "y", "z"], delay=0.005, fail_on="fail"
+    )
+
+
+def _broken_client():
+    raise RuntimeError("no client here")
+
+
+def _prompts():
+    return (f"prompt {i}" for i in range(30))
+
+
+def test_merges_metrics_from_all_processes(client_factory):
+    store = MetricsStore()
+    stats = run_multiprocess(
+        client_factory,
+        [f"prompt {i}" for i in range(20)] + ["fail"],
+        model="gpt-test",
+        processes=2,
+        concurrency=4,
+        tracker_kwargs={"tokenizer": len},
+        flush_interval=0.01,
+        metrics=store,
+    )
+
+    assert stats.total_requests == 21
+    assert stats.total_output_tokens == 20 * len("xyz")
+    assert len(store) == 21
+    # Merged timestamps share the parent's timeline and cover one run.
+    starts = store.column("request_start")
+    assert store.column("request_end").max() - starts.min() < 5.0
+    assert stats.p50_e2e_latency < 1.0
+
+
+def test_callable_prompts_are_split_between_workers(client_factory):
+    stats = run_multiprocess(
+        client_factory,
+        _prompts,
+        model="gpt-test",
+        processes=3,
+        tracker_kwargs={"tokenizer": len},
+    )
+
+    assert stats.total_requests == 30
+
+
+def test_worker_failure_is_raised():
+    with pytest.raises(RuntimeError, match="no client here"):
+        run_multiprocess(_broken_client, ["a"], model="gpt-test", processes=1)
+
+
+def test_rejects_sketch_mode(client_factory):
+    with pytest.raises(ValueError):
+        run_multiprocess(
+            client_factory,
+            ["a"],
+            model="gpt-test",
+            tracker_kwargs={"sketch_accuracy": 0.01},
+        )
+
+
+def test_open_loop_rate_is_split_between_workers(client_factory):
+    stats = run_multiprocess(
+        client_factory,
+        [f"prompt {i}" for i in range(20)],
+        model="gpt-test",
+        processes=2,
+        rate=200.0,
+        seed=0,
+        tracker_kwargs={"tokenizer": len},
+    )
+
+    assert stats.total_requests == 20
+    assert stats.max_send_lag is not None
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from llm_perf_tools.arrivals import constant_arrivals, trace_arrivals
+from llm_perf_tools.inference import InferenceTracker
+
+
+@pytest.mark.asyncio
+async def test_open_loop_fires_on_schedule(fake_client):
+    tracker = InferenceTracker(fake_client(delay=0.005), tokenizer=len)
+
+    start = time.perf_counter()
+    stats = await tracker.run_open_loop(
+        ["hi"] * 10, model="gpt-test", rate=100.0, arrivals="constant"
+    )
+
+    assert stats.total_requests == 10
+    assert time.perf_counter() - start >= 0.09
+    assert stats.max_send_lag is not None
+    assert stats.p50_send_lag < 0.05
+
+
+@pytest.mark.asyncio
+async def test_latency_is_measured_from_intended_send_time(fake_client):
+    tracker = InferenceTracker(fake_client(delay=0.005), tokenizer=len)
+
+    def stall_loop(index, _response):
+        if index == 0:
+            time.sleep(0.2)
+
+    await tracker.run_open_loop(
+        ["hi"] * 4,
+        model="gpt-test",
+        arrivals=[0.0, 0.05, 0.1, 0.15],
+        on_response=stall_loop,
+    )
+
+    late = [m for m in tracker.metrics if m.send_lag > 0.05]
+    assert late
+    for metric in late:
+        assert metric.e2e_latency >= metric.send_lag
+
+
+def test_arrival_schedules():
+    offsets = constant_arrivals(2.0)
+    assert [next(offsets) for _ in range(3)] == [0.0, 0.5, 1.0]
+    assert list(trace_arrivals([])) == []
+    with pytest.raises(ValueError):
+        constant_arrivals(0)
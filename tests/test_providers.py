@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+from llm_perf_tools import gpu
+from llm_perf_tools.energy import cumulative_energy
+from llm_perf_tools.monitor import DeviceProvider, monitor_devices
+from llm_perf_tools.providers import HostProvider, SimulatedGPUProvider
+from llm_perf_tools.samples import GPU_SAMPLE_DTYPE, load_samples
+from llm_perf_tools.types import GPUMetrics, HostMetrics
+from llm_perf_tools.utils import load_gpu_data
+
+
+def _collect(provider, timestamps):
+    provider.open()
+    return [row for t in timestamps for row in provider.collect(t)]
+
+
+def test_simulated_provider_is_deterministic():
+    first = _collect(SimulatedGPUProvider(gpu_count=2, seed=3), [0.0, 0.5, 1.0])
+    second = _collect(SimulatedGPUProvider(gpu_count=2, seed=3), [0.0, 0.5, 1.0])
+    other = _collect(SimulatedGPUProvider(gpu_count=2, seed=4), [0.0, 0.5, 1.0])
+
+    assert first == second
+    assert first != other
+    assert [row[1] for row in first] == [0, 1] * 3
+
+
+def test_simulated_energy_counter_matches_power():
+    provider = SimulatedGPUProvider(seed=0)
+    rows = _collect(provider, [0.0, 1.0, 2.0])
+
+    assert rows[0][-1] == 0.0
+    assert rows[1][-1] == pytest.approx(rows[1][-2])
+    assert rows[2][-1] == pytest.approx(rows[1][-2] + rows[2][-2])
+
+
+def test_monitor_gpu_usage_accepts_provider(tmp_path):
+    output = tmp_path / "gpu.csv"
+
+    with gpu.monitor_gpu_usage(
+        output, interval=0.01, provider=SimulatedGPUProvider(gpu_count=4)
+    ) as samples:
+        time.sleep(0.05)
+
+    loaded = load_gpu_data(output)
+    assert loaded == samples.recent()
+    assert {m.gpu_id for m in loaded} == {0, 1, 2, 3}
+    assert cumulative_energy(loaded)[1][-1] > 0
+
+
+def test_host_provider_samples_process(tmp_path):
+    output = tmp_path / "host.bin"
+
+    with monitor_devices(HostProvider(), output, interval=0.01) as samples:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    loaded = load_samples(output, HostMetrics)
+    assert loaded == samples.recent()
+    assert all(m.pid == os.getpid() and m.rss_mb > 0 for m in loaded)
+    assert loaded[0].cpu_percent is None
+    assert max(m.cpu_percent for m in loaded[1:]) > 10
+
+
+def test_host_provider_csv_round_trip(tmp_path):
+    output = tmp_path / "host.csv"
+
+    with monitor_devices(HostProvider(), output, interval=0.01) as samples:
+        time.sleep(0.03)
+
+    assert load_samples(output, HostMetrics) == samples.recent()
+
+
+def test_host_provider_rejects_missing_process():
+    with pytest.raises(ProcessLookupError):
+        HostProvider(pid=2**22 + 1).open()
+
+
+def test_load_samples_reads_gpu_csv(tmp_path):
+    output = tmp_path / "gpu.csv"
+    with gpu.monitor_gpu_usage(
+        output, interval=0.01, provider=SimulatedGPUProvider()
+    ) as samples:
+        time.sleep(0.02)
+
+    assert load_samples(output, GPUMetrics) == samples.recent()
+
+
+def test_provider_without_collect_cannot_be_created():
+    class Incomplete(DeviceProvider):
+        dtype = GPU_SAMPLE_DTYPE
+        record = GPUMetrics
+
+    with pytest.raises(TypeError, match="collect"):
+        Incomplete()
+
+
+def test_missed_ticks_are_reported(tmp_path):
+    class SlowProvider(SimulatedGPUProvider):
+        def collect(self, timestamp):
+            time.sleep(0.025)
+            return super().collect(timestamp)
+
+    with pytest.warns(RuntimeWarning, match="ticks were skipped"):
+        with monitor_devices(SlowProvider(), tmp_path / "gpu.csv", 0.01) as samples:
+            time.sleep(0.1)
+
+    assert samples.missed > 0
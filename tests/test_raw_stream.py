@@ -0,0 +1,117 @@
+import json
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from llm_perf_tools.inference import InferenceTracker
+from llm_perf_tools.mock_server import LatencyProfile, MockServer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefer_server_usage", [True, False])
+async def test_raw_stream_matches_sdk_stream(prefer_server_usage, openai_client):
+    profile = LatencyProfile(ttft=0.01, itl=0.002, output_tokens=5)
+    async with MockServer(profile) as server:
+        results = {}
+        for raw_stream in (False, True):
+            tracker = InferenceTracker(
+                openai_client(server.base_url),
+                tokenizer=lambda text: len(text.split()),
+                prefer_server_usage=prefer_server_usage,
+                record_chunk_times=True,
+                raw_stream=raw_stream,
+            )
+            responses = {}
+            await tracker.run_batch(
+                ["hello world"] * 3, "mock", on_response=responses.__setitem__
+            )
+            results[raw_stream] = (tracker.metrics, responses)
+
+    (sdk_metrics, sdk_responses), (raw_metrics, raw_responses) = (
+        results[False],
+        results[True],
+    )
+    assert raw_responses == sdk_responses
+    assert raw_responses[0] == " tok tok tok tok tok"
+    for sdk, raw in zip(sdk_metrics, raw_metrics):
+        assert raw.input_tokens == sdk.input_tokens
+        assert raw.output_tokens == sdk.output_tokens
+        assert raw.usage_source == sdk.usage_source
+        assert raw.ttft >= 0.01
+        assert raw.itl_p50 is not None
+
+
+@pytest.mark.asyncio
+async def test_raw_stream_failures_surface_as_errors(openai_client):
+    profile = LatencyProfile(ttft=0.0, itl=0.0, failure_rate=1.0)
+    async with MockServer(profile) as server:
+        tracker = InferenceTracker(
+            openai_client(server.base_url), tokenizer=len, raw_stream=True
+        )
+        results = {}
+        await tracker.run_batch(["a"], "mock", on_response=results.__setitem__)
+
+    assert isinstance(results[0], Exception)
+
+
+@pytest.mark.asyncio
+async def test_raw_stream_with_overhead_measurement(openai_client):
+    async with MockServer(LatencyProfile(ttft=0.0, itl=0.0)) as server:
+        tracker = InferenceTracker(
+            openai_client(server.base_url),
+            tokenizer=len,
+            raw_stream=True,
+            measure_client_overhead=True,
+        )
+        await tracker.run_batch(["a"] * 2, "mock")
+
+    assert all(m.client_overhead > 0 for m in tracker.metrics)
+
+
+def _sse_client(events: list[dict]) -> AsyncOpenAI:
+    body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+    body += "data: [DONE]\n\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=body.encode(), headers={"content-type": "text/event-stream"}
+        )
+
+    return AsyncOpenAI(
+        base_url="http://mock/v1",
+        api_key="mock",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw_stream", [False, True])
+async def test_usage_on_final_choice_chunk(raw_stream):
+    def chunk(delta: dict, **extra) -> dict:
+        return {
+            "id": "x",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "mock",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            **extra,
+        }
+
+    usage = {"prompt_tokens": 7, "completion_tokens": 2, "total_tokens": 9}
+    client = _sse_client(
+        [chunk({"content": "a"}), chunk({"content": "b"}), chunk({}, usage=usage)]
+    )
+    tracker = InferenceTracker(
+        client,
+        tokenizer=lambda text: 100,
+        prefer_server_usage=True,
+        raw_stream=raw_stream,
+    )
+
+    await tracker.run_batch(["hi"], "mock")
+
+    metrics = tracker.metrics[0]
+    assert (metrics.input_tokens, metrics.output_tokens) == (7, 2)
+    assert metrics.usage_source == "server"
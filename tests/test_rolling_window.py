@@ -0,0 +1,40 @@
+import pytest
+
+from llm_perf_tools.window import RollingWindow
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_window_only_reports_recent_requests():
+    clock = FakeClock()
+    window = RollingWindow(window=10.0, bucket_width=1.0, clock=clock)
+
+    for second in range(30):
+        clock.now = second + 0.5
+        window.add(second, second + 0.1, second + 0.5, output_tokens=10)
+
+    clock.now = 30.0
+    stats = window.compute()
+
+    assert stats.total_requests == 10
+    assert stats.total_output_tokens == 100
+    assert stats.rps == pytest.approx(1.0)
+    assert stats.overall_tps == pytest.approx(10.0)
+    assert stats.max_ttft == pytest.approx(0.1)
+
+
+def test_window_empties_after_idle_period():
+    clock = FakeClock(5.0)
+    window = RollingWindow(window=2.0, bucket_width=0.5, clock=clock)
+    window.add(4.0, 4.2, 5.0, output_tokens=3)
+
+    assert window.compute().total_requests == 1
+
+    clock.now = 60.0
+    assert window.compute().total_requests == 0
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from llm_perf_tools.inference import InferenceTracker
+
+
+@pytest.mark.asyncio
+async def test_run_batch_keeps_concurrency_bounded(fake_client):
+    client = fake_client()
+    tracker = InferenceTracker(client, tokenizer=len)
+    pulled = []
+
+    def prompts():
+        for i in range(10):
+            pulled.append(i)
+            yield f"prompt {i}"
+
+    responses = {}
+    stats = await tracker.run_batch(
+        prompts(),
+        model="gpt-test",
+        concurrency=3,
+        on_response=responses.__setitem__,
+        max_tokens=4,
+    )
+
+    assert client.peak == 3
+    assert pulled == list(range(10))
+    assert responses == {i: "xy" for i in range(10)}
+    assert stats.total_requests == 10
+    assert all(call["max_tokens"] == 4 for call in client.calls)
+    # Later prompts waited for a free worker.
+    assert stats.max_queue_wait > stats.p50_queue_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_run_batch_records_failures_and_overrides(fake_client):
+    client = fake_client(fail_on="bad")
+    tracker = InferenceTracker(client, tokenizer=len)
+    prompts = [
+        {"messages": [{"role": "user", "content": "good"}], "max_tokens": 8},
+        [{"role": "user", "content": "bad"}],
+    ]
+
+    responses = {}
+    stats = await tracker.run_batch(
+        prompts, model="gpt-test", concurrency=2, on_response=responses.__setitem__
+    )
+
+    assert stats.total_requests == 2
+    assert isinstance(responses[1], RuntimeError)
+    assert client.calls[0]["max_tokens"] == 8
+    assert tracker.metrics[1].queue_wait is not None
+
+
+@pytest.mark.asyncio
+async def test_run_batch_cancels_workers_on_error(fake_client):
+    client = fake_client(delay=0.05)
+    tracker = InferenceTracker(client, tokenizer=len)
+
+    def on_response(index, response):
+        if index == 0:
+            raise KeyError(index)
+
+    with pytest.raises(KeyError):
+        await tracker.run_batch(
+            [f"prompt {i}" for i in range(10)],
+            model="gpt-test",
+            concurrency=3,
+            on_response=on_response,
+        )
+    sent = len(client.calls)
+    await asyncio.sleep(0.2)
+
+    # The other workers were stopped mid-request and sent nothing more.
+    assert len(client.calls) == sent < 10
+    assert client.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_open_loop_stops_on_error(fake_client):
+    client = fake_client(delay=0.05)
+    tracker = InferenceTracker(client, tokenizer=len)
+
+    def on_response(index, response):
+        if index == 0:
+            raise KeyError(index)
+
+    with pytest.raises(KeyError):
+        await tracker.run_open_loop(
+            [f"prompt {i}" for i in range(5)],
+            model="gpt-test",
+            arrivals=[0.0, 0.1, 0.2, 0.3, 0.4],
+            on_response=on_response,
+        )
+    sent = len(client.calls)
+    await asyncio.sleep(0.5)
+
+    # Scheduling stopped once request 0 failed, and nothing was left running.
+    assert len(client.calls) == sent < 5
+    assert client.in_flight == 0
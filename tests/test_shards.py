@@ -0,0 +1,115 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from llm_perf_tools.inference import InferenceTracker, compute_batch_metrics
+from llm_perf_tools.shards import (
+    load_shard,
+    main,
+    merge_shard_columns,
+    merge_shards,
+    save_shard,
+)
+from llm_perf_tools.types import RequestMetrics
+
+
+def _tracker(offset: float, count: int, **kwargs) -> InferenceTracker:
+    tracker = InferenceTracker(MagicMock(), tokenizer=len, **kwargs)
+    now = time.perf_counter()
+    tracker._start_time = now - 20
+    for i in range(count):
+        start = now - 20 + offset + i * 0.1
+        tracker._record(
+            request_start=start,
+            first_token_time=start + 0.05 * (1 + i % 4),
+            request_end=start + 1.0 + 0.01 * i,
+            input_tokens=10,
+            output_tokens=20 + i % 7,
+        )
+    return tracker
+
+
+def test_sketch_merge_matches_combined_run(tmp_path):
+    first = _tracker(0.0, 40, slo_ttft=0.1)
+    second = _tracker(5.0, 60, slo_ttft=0.1)
+    paths = [
+        save_shard(first, tmp_path / "a.json", node="a"),
+        save_shard(second, tmp_path / "b.json", node="b"),
+    ]
+
+    merged = merge_shards(paths)
+    combined = compute_batch_metrics(
+        list(first.metrics) + list(second.metrics), 20.0, slo_ttft=0.1
+    )
+
+    assert merged.total_requests == 100
+    assert merged.total_output_tokens == combined.total_output_tokens
+    assert merged.max_e2e_latency == pytest.approx(combined.max_e2e_latency)
+    assert merged.p99_e2e_latency == pytest.approx(combined.p99_e2e_latency, rel=0.01)
+    assert merged.overall_tps == pytest.approx(combined.overall_tps)
+    assert merged.slo_attainment == combined.slo_attainment
+
+
+def test_exact_merge_uses_raw_columns(tmp_path):
+    first = _tracker(0.0, 30)
+    second = _tracker(2.0, 30)
+    paths = [
+        save_shard(first, tmp_path / "a.json"),
+        save_shard(second, tmp_path / "b.json"),
+    ]
+
+    merged = merge_shards(paths, exact=True)
+    combined = compute_batch_metrics(list(first.metrics) + list(second.metrics), 1)
+
+    # Epoch-second timestamps resolve to about 0.25 microseconds.
+    assert merged.p50_ttft == pytest.approx(combined.p50_ttft, abs=1e-6)
+    assert merged.p99_itl == pytest.approx(combined.p99_itl, abs=1e-6)
+
+    columns = merge_shard_columns(paths)
+    assert len(columns["request_start"]) == 60
+    # Wall-clock timeline, ordered across shards.
+    assert abs(columns["request_start"][0] - time.time()) < 60
+    assert (columns["request_start"][1:] >= columns["request_start"][:-1]).all()
+
+
+def test_exact_merge_requires_raw_columns(tmp_path):
+    path = save_shard(_tracker(0.0, 5), tmp_path / "a.json", include_raw=False)
+
+    with pytest.raises(ValueError, match="without raw columns"):
+        merge_shards([path], exact=True)
+
+
+def test_sketch_mode_tracker_shard(tmp_path):
+    tracker = InferenceTracker(MagicMock(), tokenizer=len, sketch_accuracy=0.01)
+    tracker._start_time = time.perf_counter()
+    tracker._record(
+        **RequestMetrics(
+            request_start=tracker._start_time,
+            first_token_time=tracker._start_time + 0.1,
+            request_end=tracker._start_time + 1.0,
+            output_tokens=10,
+        ).model_dump(exclude_none=True)
+    )
+    path = save_shard(tracker, tmp_path / "sketch.json")
+
+    assert "columns" not in load_shard(path)
+    assert merge_shards([path]).total_output_tokens == 10
+
+
+def test_load_shard_rejects_other_files(tmp_path):
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps({"type": "tracker_metrics"}))
+
+    with pytest.raises(ValueError, match="not a metrics shard"):
+        load_shard(path)
+
+
+def test_cli_writes_merged_stats(tmp_path):
+    shard = save_shard(_tracker(0.0, 10), tmp_path / "a.json")
+    output = tmp_path / "merged.json"
+
+    main([shard, "--output", str(output)])
+
+    assert json.loads(output.read_text())["total_requests"] == 10
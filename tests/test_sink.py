@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from llm_perf_tools.inference import InferenceTracker
+from llm_perf_tools.mock_server import LatencyProfile, MockServer
+from llm_perf_tools.sink import ResultSink, load_results
+from llm_perf_tools.types import BatchInferenceStats
+
+
+@pytest.mark.asyncio
+async def test_tracker_streams_requests_and_stats(tmp_path, openai_client):
+    path = tmp_path / "results.jsonl"
+    with ResultSink(path, buffer_size=2, parquet=False) as sink:
+        async with MockServer(LatencyProfile(ttft=0.0, itl=0.0)) as server:
+            tracker = InferenceTracker(
+                openai_client(server.base_url), tokenizer=len, result_sink=sink
+            )
+            stats = await tracker.run_batch(["a"] * 5, "mock", concurrency=2)
+
+        assert len(path.read_text().splitlines()) == 5
+        sidecar = json.loads(sink.stats_path.read_text())
+        assert sidecar["rows"] == 5
+        assert sidecar["batch_stats"] == stats.model_dump()
+
+    loaded = load_results(path)
+    assert list(loaded) == list(tracker.metrics)
+
+
+@pytest.mark.asyncio
+async def test_sketch_tracker_still_streams_raw_requests(tmp_path, openai_client):
+    path = tmp_path / "results.jsonl"
+    with ResultSink(path, parquet=False) as sink:
+        async with MockServer(LatencyProfile(ttft=0.0, itl=0.0)) as server:
+            tracker = InferenceTracker(
+                openai_client(server.base_url),
+                tokenizer=len,
+                sketch_accuracy=0.01,
+                result_sink=sink,
+            )
+            await tracker.run_batch(["a"] * 3, "mock")
+
+    assert len(tracker.metrics) == 0
+    assert len(load_results(path)) == 3
+
+
+def test_rows_are_written_per_buffer(tmp_path):
+    path = tmp_path / "results.jsonl"
+    sink = ResultSink(path, buffer_size=3, parquet=False)
+    for i in range(4):
+        sink.write({"request_start": float(i), "request_end": i + 1.0})
+
+    assert len(path.read_text().splitlines()) == 3
+    sink.close()
+    assert len(path.read_text().splitlines()) == 4
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with ResultSink(path, parquet=False) as sink:
+        sink.write({"request_start": 1.0, "output_tokens": 3})
+    with open(path, "a") as f:
+        f.write('{"request_start": 2.0, "outp')
+
+    loaded = load_results(path)
+    assert len(loaded) == 1
+    assert loaded[0].output_tokens == 3
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "results.jsonl"
+    with ResultSink(path, buffer_size=2, parquet=True) as sink:
+        # The first buffer holds only failed requests, without usage_source.
+        for i in range(2):
+            sink.write({"request_start": float(i), "ttft": None})
+        for i in range(2, 5):
+            sink.write(
+                {"request_start": float(i), "ttft": 0.1, "usage_source": "server"}
+            )
+
+    assert list(load_results(sink.parquet_path)) == list(load_results(path))
+
+
+def test_parquet_requires_pyarrow(mocker, tmp_path):
+    mocker.patch.dict("sys.modules", {"pyarrow": None, "pyarrow.parquet": None})
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        ResultSink(tmp_path / "results.jsonl", parquet=True)
+    with ResultSink(tmp_path / "results.jsonl") as sink:
+        assert sink.parquet_path is None
+
+
+def test_reopening_replaces_previous_session(tmp_path):
+    path = tmp_path / "results.jsonl"
+    for count in (3, 2):
+        with ResultSink(path) as sink:
+            for i in range(count):
+                sink.write({"request_start": float(i)})
+            sink.write_stats(BatchInferenceStats())
+
+    assert len(load_results(path)) == 2
+    assert json.loads(sink.stats_path.read_text())["rows"] == 2
+
+
+@pytest.mark.asyncio
+async def test_sink_errors_are_not_request_errors(tmp_path, fake_client):
+    class BrokenSink(ResultSink):
+        broken = True
+
+        def flush(self):
+            if self.broken:
+                raise ValueError("schema mismatch")
+            super().flush()
+
+    responses = {}
+    with BrokenSink(tmp_path / "results.jsonl", buffer_size=1) as sink:
+        tracker = InferenceTracker(fake_client(), tokenizer=len, result_sink=sink)
+        with pytest.raises(ValueError, match="schema mismatch"):
+            await tracker.run_batch(
+                ["a", "b"], "gpt-test", on_response=responses.__setitem__
+            )
+        sink.broken = False
+
+    assert not any(isinstance(r, BaseException) for r in responses.values())
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from llm_perf_tools.inference import compute_batch_metrics, percentile
+from llm_perf_tools.sketch import QuantileSketch, SketchBatchStats
+from llm_perf_tools.types import RequestMetrics
+
+
+@pytest.mark.parametrize("accuracy", [0.05, 0.01, 0.001])
+def test_quantiles_within_relative_accuracy(accuracy):
+    rng = random.Random(0)
+    values = [rng.lognormvariate(-3, 1) for _ in range(10_000)]
+    sketch = QuantileSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+
+    for p in (1, 50, 95, 99):
+        exact = percentile(values, p)
+        assert sketch.quantile(p / 100) == pytest.approx(exact, rel=accuracy)
+    assert sketch.min == min(values)
+    assert sketch.max == max(values)
+
+
+def test_merged_sketch_equals_single_sketch():
+    rng = random.Random(1)
+    values = [rng.expovariate(10) for _ in range(2_000)]
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+
+    left.merge(right)
+
+    assert left.bins == whole.bins
+    assert left.quantile(0.99) == whole.quantile(0.99)
+    round_tripped = QuantileSketch.from_dict(left.to_dict())
+    assert round_tripped.quantile(0.5) == whole.quantile(0.5)
+
+
+def test_sketch_batch_stats_tracks_exact_batch_metrics():
+    rng = random.Random(2)
+    metrics = []
+    stats = SketchBatchStats(relative_accuracy=0.01)
+    for _ in range(1_000):
+        start = rng.uniform(0, 100)
+        first_token = start + rng.uniform(0.05, 1)
+        end = first_token + rng.uniform(0.5, 5)
+        tokens = rng.randint(2, 200)
+        metrics.append(
+            RequestMetrics(
+                request_start=start,
+                first_token_time=first_token,
+                request_end=end,
+                output_tokens=tokens,
+            )
+        )
+        stats.add(start, first_token, end, output_tokens=tokens)
+
+    exact = compute_batch_metrics(metrics, 100.0)
+    approx = stats.to_batch_stats(100.0)
+
+    assert approx.total_output_tokens == exact.total_output_tokens
+    assert approx.overall_tps == exact.overall_tps
+    assert approx.max_ttft == exact.max_ttft
+    assert approx.avg_itl == pytest.approx(exact.avg_itl)
+    assert approx.p99_e2e_latency == pytest.approx(exact.p99_e2e_latency, rel=0.01)
+    assert approx.p1_tps == pytest.approx(exact.p1_tps, rel=0.01)
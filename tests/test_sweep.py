@@ -0,0 +1,35 @@
+import pytest
+
+from llm_perf_tools.inference import InferenceTracker
+from llm_perf_tools.sweep import find_knee, sweep_concurrency
+
+SERVER_SLOTS = 4
+
+
+def test_find_knee():
+    assert find_knee([(1, 1), (2, 2)]) is None
+    assert find_knee([(10, 1.0), (20, 1.1), (38, 1.3), (40, 2.5), (41, 6.0)]) == 2
+
+
+@pytest.mark.asyncio
+async def test_sweep_stops_after_saturation(fake_client):
+    # Decodes at full speed up to SERVER_SLOTS streams, then slows down.
+    client = fake_client(tokens=["t"] * 4, delay=0.002, slots=SERVER_SLOTS)
+    tracker = InferenceTracker(client, tokenizer=len)
+
+    result = await sweep_concurrency(
+        tracker,
+        ["hi"],
+        model="gpt-test",
+        max_concurrency=64,
+        requests_per_level=lambda level: 8 * level,
+        throughput_metric="rps",
+        min_gain=0.3,
+    )
+
+    levels = [point.level for point in result.points]
+    assert 64 not in levels
+    assert result.saturation is not None
+    assert SERVER_SLOTS <= result.saturation <= 4 * SERVER_SLOTS
+    assert result.knee in levels
+    assert all(point.stats.total_requests > 0 for point in result.points)